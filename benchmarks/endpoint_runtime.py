@@ -0,0 +1,90 @@
+"""
+Benchmark memory per endpoint checker and cost per check.
+
+Usage:
+    PYTHONPATH=. python benchmarks/endpoint_runtime.py [--endpoints N] [--checks N]
+"""
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+
+from healthchecker.config.models import EndpointConfig
+from healthchecker.monitoring.endpoint import EndpointChecker
+
+
+class FakeResponse:
+    status = 500
+
+    async def text(self):
+        return ""
+
+
+class FakeSession:
+    """Session stand-in that answers instantly, so only our own work is measured."""
+
+    async def get(self, url, **kwargs):
+        return FakeResponse()
+
+
+def make_config(i):
+    return EndpointConfig(
+        url=f"https://service-{i}.example.com/health",
+        name=f"service-{i}",
+        headers={"Accept": "application/json"},
+        expected_status_ranges=["200-299"],
+    )
+
+
+def measure_memory(count):
+    configs = [make_config(i) for i in range(count)]
+    session = FakeSession()
+    gc.collect()
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    checkers = [EndpointChecker(config=c, session=session) for c in configs]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return checkers, size / count
+
+
+async def measure_checks(checker, count):
+    # Warm up so one-off allocations are not counted
+    for _ in range(10):
+        await checker.check()
+
+    gc.collect()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    results = [await checker.check() for _ in range(count)]
+    elapsed = time.perf_counter() - start
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del results
+    return size / count, elapsed / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--endpoints", type=int, default=5000)
+    parser.add_argument("--checks", type=int, default=2000)
+    args = parser.parse_args()
+
+    checkers, per_endpoint = measure_memory(args.endpoints)
+    print(f"memory per endpoint checker: {per_endpoint:.0f} bytes")
+
+    size, seconds = asyncio.run(measure_checks(checkers[0], args.checks))
+    print(f"memory per failed check result: {size:.0f} bytes")
+    print(f"time per failed check: {seconds * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark client CPU time per check for each HTTP transport.
+
+The server runs in a separate process, so only the checking side is measured.
+
+Usage:
+    PYTHONPATH=. python benchmarks/transport_cpu.py [--checks N] [--concurrency N]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import socket
+import time
+
+from healthchecker.config.models import EndpointConfig
+from healthchecker.monitoring.endpoint import EndpointChecker
+from healthchecker.monitoring.transport import TRANSPORTS
+
+BODY = b'{"status": "ok", "checks": {"db": "ok", "cache": "ok"}}'
+
+
+def serve(port):
+    """A minimal keep-alive HTTP server, cheap enough not to be the bottleneck."""
+    response = (
+        b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+        b"Content-Length: %d\r\n\r\n%s" % (len(BODY), BODY)
+    )
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                writer.write(response)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", port)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def measure(kind, url, checks, concurrency):
+    transport = TRANSPORTS[kind]()
+    config = EndpointConfig(
+        url=url, transport=kind, json_path_checks={"$.status": "ok"}
+    )
+    checkers = [EndpointChecker(config, transport) for _ in range(concurrency)]
+    per_checker = checks // concurrency
+
+    async def run(checker, count):
+        for _ in range(count):
+            result = await checker.check()
+            assert result.status.value == "ok", result.message
+
+    try:
+        # Warm up connections and caches
+        await asyncio.gather(*(run(checker, 5) for checker in checkers))
+
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        await asyncio.gather(*(run(checker, per_checker) for checker in checkers))
+        count = per_checker * concurrency
+        return (
+            (time.process_time() - cpu) / count,
+            (time.perf_counter() - wall) / count,
+        )
+    finally:
+        await transport.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--checks", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    port = free_port()
+    server = multiprocessing.Process(target=serve, args=(port,), daemon=True)
+    server.start()
+    try:
+        for _ in range(50):
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        url = f"http://127.0.0.1:{port}/health"
+        for kind in TRANSPORTS:
+            cpu, wall = asyncio.run(measure(kind, url, args.checks, args.concurrency))
+            print(
+                f"{kind:>8}: {cpu * 1e6:.1f} us CPU per check, "
+                f"{wall * 1e6:.1f} us wall time per check"
+            )
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
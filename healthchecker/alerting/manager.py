@@ -1,31 +1,71 @@
 import logging
-from typing import Dict, List
-from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from datetime import datetime, timedelta
 
 from ..config.models import AlertConfig
-from ..monitoring.endpoint import CheckResult
-from .providers.base import AlertProvider
-from .providers.email import EmailProvider
-from .providers.slack import SlackProvider
+from ..utils.clock import SYSTEM_CLOCK, Clock
+from ..utils.registry import LazyRegistry
+from .templates import (
+    AlertTemplate,
+    compile_templates,
+    format_recovery_message,
+    render_message,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..monitoring.endpoint import CheckResult
+    from .providers.base import AlertProvider
+    from .spool import AlertSpool
 
 logger = logging.getLogger(__name__)
 
+# Entry point group through which packages register further alert providers
+PROVIDER_ENTRY_POINTS = "healthchecker.alert_providers"
+
 
 class AlertManager:
     """Manages alert delivery and rate limiting."""
 
-    # Registry of available alert providers
-    PROVIDERS = {"email": EmailProvider, "slack": SlackProvider}
-
-    def __init__(self, config: AlertConfig, mock_mode: bool = False):
+    # Registry of available alert providers, imported when first configured
+    PROVIDERS = LazyRegistry(
+        {
+            "email": "healthchecker.alerting.providers.email:EmailProvider",
+            "slack": "healthchecker.alerting.providers.slack:SlackProvider",
+        },
+        group=PROVIDER_ENTRY_POINTS,
+    )
+
+    def __init__(
+        self, config: AlertConfig, mock_mode: bool = False, clock: Clock = SYSTEM_CLOCK
+    ):
         self.config = config
         self.mock_mode = mock_mode
-        self.providers: Dict[str, AlertProvider] = {}
+        self.clock = clock
+        self.providers: Dict[str, "AlertProvider"] = {}
+        self.templates: Dict[str, AlertTemplate] = compile_templates(
+            config.templates
+        )
         self.alert_history: Dict[str, List[datetime]] = (
             {}
         )  # Endpoint name -> alert times
+        self.spool: Optional["AlertSpool"] = None
         self._initialize_providers()
 
+    async def start(self):
+        """Start background delivery through the alert spool, if configured."""
+        if self.config.spool.path and not self.mock_mode and not self.spool:
+            from .spool import AlertSpool
+
+            self.spool = AlertSpool(self.config.spool, self.providers)
+            await self.spool.start()
+            logger.info(f"Spooling alerts to {self.config.spool.path}")
+
+    async def stop(self):
+        """Stop background delivery; undelivered alerts stay spooled."""
+        if self.spool:
+            await self.spool.stop()
+            self.spool = None
+
     def _initialize_providers(self):
         """Initialize all configured alert providers."""
         for name, provider_config in self.config.providers.items():
@@ -33,12 +73,12 @@ class AlertManager:
                 logger.info(f"Alert provider '{name}' is disabled")
                 continue
 
-            provider_class = self.PROVIDERS.get(provider_config.type)
-            if not provider_class:
+            if provider_config.type not in self.PROVIDERS:
                 logger.error(f"Unknown alert provider type: {provider_config.type}")
                 continue
 
             try:
+                provider_class = self.PROVIDERS[provider_config.type]
                 self.providers[name] = provider_class(provider_config.config)
                 logger.info(
                     f"Initialized alert provider: {name} ({provider_config.type})"
@@ -69,11 +109,11 @@ class AlertManager:
             cooldown_end = last_alert_time + timedelta(
                 seconds=self.config.cooldown_period
             )
-            if datetime.now(timezone.utc) < cooldown_end:
+            if self.clock.now() < cooldown_end:
                 return False
 
         # Check hourly rate limit
-        one_hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+        one_hour_ago = self.clock.now() - timedelta(hours=1)
         recent_alerts = [t for t in history if t > one_hour_ago]
 
         return len(recent_alerts) < self.config.max_alerts_per_hour
@@ -88,15 +128,19 @@ class AlertManager:
         if endpoint_name not in self.alert_history:
             self.alert_history[endpoint_name] = []
 
-        self.alert_history[endpoint_name].append(datetime.now(timezone.utc))
+        self.alert_history[endpoint_name].append(self.clock.now())
 
         # Cleanup old history (older than 24 hours)
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
+        cutoff = self.clock.now() - timedelta(hours=24)
         self.alert_history[endpoint_name] = [
             t for t in self.alert_history[endpoint_name] if t > cutoff
         ]
 
-    async def send_alert(self, result: CheckResult) -> bool:
+    def render_message(self, result: "CheckResult") -> str:
+        """Render the alert message for a result using its status template."""
+        return render_message(result, self.templates.get(result.status.value))
+
+    async def send_alert(self, result: "CheckResult") -> bool:
         """Send an alert for a failed health check."""
         endpoint_name = result.endpoint_name
 
@@ -113,17 +157,56 @@ class AlertManager:
             logger.info(f"MOCK ALERT for {endpoint_name}: {result.message}")
             return True
 
-        # Get the appropriate template if available
-        template = self.config.templates.get(result.status.value)
+        # Render the message once and share it across all providers
+        message = self.render_message(result)
+        delivered = await self._deliver(result, message)
+        if not delivered:
+            # Nobody was told, so don't hold the next alert back
+            self._forget_alert(endpoint_name)
+        return delivered
+
+    async def send_recovery(self, result: "CheckResult") -> bool:
+        """
+        Send a recovery notification for an endpoint that was alerted on.
+
+        Recoveries are not rate limited and don't use up alert slots.
+        """
+        endpoint_name = result.endpoint_name
+
+        if self.mock_mode:
+            logger.info(f"MOCK RECOVERY for {endpoint_name}")
+            return True
+
+        message = render_message(
+            result, self.templates.get("recovery"), format_recovery_message
+        )
+        return await self._deliver(result, message)
+
+    def _forget_alert(self, endpoint_name: str) -> None:
+        """Give back the rate limit slot of an alert that was not delivered."""
+        history = self.alert_history.get(endpoint_name)
+        if history:
+            history.pop()
+
+    async def _deliver(self, result: "CheckResult", message: str) -> bool:
+        """Send a rendered message to all enabled providers."""
+        if self.spool:
+            # Delivered in the background, retried until providers accept it
+            return await self.spool.enqueue(result, message)
 
-        # Send to all enabled providers
         success = False
         for name, provider in self.providers.items():
             if provider.enabled:
                 try:
-                    provider_success = await provider.send_alert(result, template)
+                    provider_success = await provider.send_alert(result, message)
                     success = success or provider_success
                 except Exception as e:
                     logger.error(f"Error sending alert via provider '{name}': {str(e)}")
 
         return success
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "providers": sorted(self.providers),
+            "spool": self.spool.stats() if self.spool else None,
+        }
@@ -3,10 +3,12 @@ import smtplib
 import ssl
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Dict, Any, Optional
+from typing import Dict, Any, TYPE_CHECKING
 
 from .base import AlertProvider
-from ...monitoring.endpoint import CheckResult
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ...monitoring.endpoint import CheckResult
 
 logger = logging.getLogger(__name__)
 
@@ -39,28 +41,28 @@ class EmailProvider(AlertProvider):
             logger.error("Email from_address and to_addresses are required")
             self.enabled = False
 
-    async def send_alert(
-        self, result: CheckResult, template: Optional[str] = None
-    ) -> bool:
+    def format_payload(self, result: "CheckResult", message: str) -> MIMEMultipart:
+        """Build the email message."""
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = (
+            f"Health Check Alert: {result.endpoint_name} - {result.status.value.capitalize()}"
+        )
+        msg["From"] = self.from_address
+        msg["To"] = ", ".join(self.to_addresses)
+
+        # Add text part
+        part = MIMEText(message, "plain")
+        msg.attach(part)
+
+        return msg
+
+    async def send_alert(self, result: "CheckResult", message: str) -> bool:
         """Send an alert via email."""
         if not self.enabled or not self.from_address or not self.to_addresses:
             return False
 
         try:
-            # Format the message
-            message_text = self.format_message(result, template)
-
-            # Create the email
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = (
-                f"Health Check Alert: {result.endpoint_name} - {result.status.value.capitalize()}"
-            )
-            msg["From"] = self.from_address
-            msg["To"] = ", ".join(self.to_addresses)
-
-            # Add text part
-            part = MIMEText(message_text, "plain")
-            msg.attach(part)
+            msg = self.format_payload(result, message)
 
             # Connect to SMTP server
             context = ssl.create_default_context() if self.use_tls else None
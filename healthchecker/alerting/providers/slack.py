@@ -1,9 +1,11 @@
 import logging
 import aiohttp
-from typing import Dict, Any, Optional
+from typing import Dict, Any, TYPE_CHECKING
 
 from .base import AlertProvider
-from ...monitoring.endpoint import CheckResult
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ...monitoring.endpoint import CheckResult
 
 logger = logging.getLogger(__name__)
 
@@ -22,27 +24,27 @@ class SlackProvider(AlertProvider):
             logger.error("Slack webhook URL is required")
             self.enabled = False
 
-    async def send_alert(
-        self, result: CheckResult, template: Optional[str] = None
-    ) -> bool:
+    def format_payload(self, result: "CheckResult", message: str) -> Dict[str, Any]:
+        """Build the Slack webhook payload."""
+        payload = {
+            "text": message,
+            "username": self.username,
+            "icon_emoji": self.icon_emoji,
+        }
+
+        # Add channel if specified
+        if self.channel:
+            payload["channel"] = self.channel
+
+        return payload
+
+    async def send_alert(self, result: "CheckResult", message: str) -> bool:
         """Send an alert to Slack."""
         if not self.enabled or not self.webhook_url:
             return False
 
         try:
-            # Format the message
-            message = self.format_message(result, template)
-
-            # Prepare the payload
-            payload = {
-                "text": message,
-                "username": self.username,
-                "icon_emoji": self.icon_emoji,
-            }
-
-            # Add channel if specified
-            if self.channel:
-                payload["channel"] = self.channel
+            payload = self.format_payload(result, message)
 
             # Send the request
             async with aiohttp.ClientSession() as session:
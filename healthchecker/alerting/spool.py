@@ -0,0 +1,277 @@
+"""Durable alert spool with retrying delivery."""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from ..config.models import SpoolConfig
+from ..monitoring.endpoint import CheckResult
+from .providers.base import AlertProvider
+
+logger = logging.getLogger(__name__)
+
+
+class SpoolEntry:
+    """One alert waiting to be delivered by one provider."""
+
+    __slots__ = ("id", "provider", "result", "message", "created")
+
+    def __init__(
+        self,
+        id: int,
+        provider: str,
+        result: Dict[str, Any],
+        message: str,
+        created: float,
+    ):
+        self.id = id
+        self.provider = provider
+        self.result = result
+        self.message = message
+        self.created = created
+
+    def to_line(self) -> str:
+        record = {
+            "add": self.id,
+            "provider": self.provider,
+            "created": self.created,
+            "message": self.message,
+            "result": self.result,
+        }
+        return json.dumps(record, separators=(",", ":"), default=str) + "\n"
+
+
+class AlertSpool:
+    """
+    Writes alerts to an append-only file before delivering them.
+
+    Every alert is stored once per provider and removed with an acknowledgement
+    record after the provider accepts it. Each provider has its own delivery
+    worker: failures are retried with exponential backoff, and once a provider
+    accepts an alert the rest of its backlog is sent straight away. Undelivered
+    alerts are reloaded after a restart.
+
+    The file is rewritten without acknowledged alerts once it grows past
+    ``max_bytes``. At most ``max_entries`` alerts are kept, and alerts older than
+    ``max_age`` are dropped rather than delivered late.
+    """
+
+    def __init__(self, config: SpoolConfig, providers: Dict[str, AlertProvider]):
+        if not config.path:
+            raise ValueError("Alert spool needs a path")
+        self.config = config
+        self.path = config.path
+        self.providers = providers
+        self.pending: Dict[str, "OrderedDict[int, SpoolEntry]"] = {
+            name: OrderedDict() for name in providers
+        }
+        self.backoff: Dict[str, float] = {name: 0.0 for name in providers}
+        self.delivered = 0
+        self.dropped = 0
+        self._next_id = 1
+        self._size = 0
+        self._file: Optional[Any] = None
+        self._lock = asyncio.Lock()
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        self._workers: List[asyncio.Task] = []
+
+    def _load(self) -> None:
+        """Rebuild the pending alerts from the spool file."""
+        entries: Dict[int, SpoolEntry] = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        if "ack" in record:
+                            entries.pop(record["ack"], None)
+                        else:
+                            entries[record["add"]] = SpoolEntry(
+                                record["add"],
+                                record["provider"],
+                                record["result"],
+                                record["message"],
+                                record["created"],
+                            )
+                    except (ValueError, KeyError, TypeError):
+                        # A write cut short by a crash; everything before it is intact
+                        logger.warning(
+                            f"Skipping corrupt record in alert spool {self.path}"
+                        )
+
+        for entry_id in sorted(entries):
+            entry = entries[entry_id]
+            if entry.provider not in self.pending:
+                logger.warning(
+                    f"Dropping spooled alert for removed provider '{entry.provider}'"
+                )
+                self.dropped += 1
+                continue
+            self.pending[entry.provider][entry_id] = entry
+            self._next_id = max(self._next_id, entry_id + 1)
+
+        self._compact()
+        count = sum(len(queue) for queue in self.pending.values())
+        if count:
+            logger.info(f"Loaded {count} undelivered alerts from {self.path}")
+
+    def _compact(self) -> None:
+        """Rewrite the spool file with only the pending alerts."""
+        entries = sorted(
+            (entry for queue in self.pending.values() for entry in queue.values()),
+            key=lambda entry: entry.id,
+        )
+        lines = [entry.to_line() for entry in entries]
+
+        # Keep the newest alerts that fit in the size limit
+        size = sum(len(line.encode("utf-8")) for line in lines)
+        while lines and size > self.config.max_bytes:
+            size -= len(lines[0].encode("utf-8"))
+            self._drop(entries.pop(0), "spool is full")
+            lines.pop(0)
+
+        if self._file:
+            self._file.close()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = size
+
+    def _append(self, lines: List[str]) -> None:
+        assert self._file is not None
+        data = "".join(lines)
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._size += len(data.encode("utf-8"))
+        if self._size > self.config.max_bytes:
+            self._compact()
+
+    def _drop(self, entry: SpoolEntry, reason: str) -> None:
+        if self.pending[entry.provider].pop(entry.id, None) is not None:
+            self.dropped += 1
+            logger.warning(
+                f"Dropping alert for {entry.result.get('endpoint_name')} "
+                f"via '{entry.provider}': {reason}"
+            )
+
+    async def start(self) -> None:
+        """Load undelivered alerts and start a delivery worker per provider."""
+        async with self._lock:
+            await asyncio.to_thread(self._load)
+        for name in self.providers:
+            self._wakeups[name] = asyncio.Event()
+            self._workers.append(asyncio.create_task(self._deliver(name)))
+
+    async def stop(self) -> None:
+        """Stop delivering; undelivered alerts stay in the spool."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    async def enqueue(self, result: CheckResult, message: str) -> bool:
+        """
+        Store an alert for every enabled provider.
+
+        Returns:
+            True if at least one provider will deliver the alert
+        """
+        now = time.time()
+        entries = []
+        for name, provider in self.providers.items():
+            if provider.enabled:
+                entries.append(
+                    SpoolEntry(self._next_id, name, result.to_dict(), message, now)
+                )
+                self._next_id += 1
+        if not entries:
+            return False
+
+        async with self._lock:
+            lines = [entry.to_line() for entry in entries]
+            for entry in entries:
+                queue = self.pending[entry.provider]
+                queue[entry.id] = entry
+                while len(queue) > self.config.max_entries:
+                    oldest = next(iter(queue.values()))
+                    self._drop(oldest, "spool is full")
+                    lines.append(json.dumps({"ack": oldest.id}) + "\n")
+
+            await asyncio.to_thread(self._append, lines)
+            for entry in entries:
+                if entry.provider in self._wakeups:
+                    self._wakeups[entry.provider].set()
+        return True
+
+    async def _acknowledge(self, entry: SpoolEntry) -> None:
+        async with self._lock:
+            self.pending[entry.provider].pop(entry.id, None)
+            line = json.dumps({"ack": entry.id}) + "\n"
+            await asyncio.to_thread(self._append, [line])
+
+    async def _deliver(self, name: str) -> None:
+        """Deliver a provider's alerts in order, backing off while it fails."""
+        provider = self.providers[name]
+        queue = self.pending[name]
+        wakeup = self._wakeups[name]
+
+        while True:
+            if not queue:
+                wakeup.clear()
+                await wakeup.wait()
+                continue
+
+            entry = next(iter(queue.values()))
+            if time.time() - entry.created > self.config.max_age:
+                self._drop(entry, "too old to deliver")
+                await self._acknowledge(entry)
+                continue
+
+            try:
+                delivered = await provider.send_alert(
+                    CheckResult.from_dict(entry.result), entry.message
+                )
+            except Exception as e:
+                logger.error(f"Error sending alert via provider '{name}': {str(e)}")
+                delivered = False
+
+            if delivered:
+                await self._acknowledge(entry)
+                self.delivered += 1
+                if self.backoff[name]:
+                    logger.info(f"Alert provider '{name}' recovered")
+                self.backoff[name] = 0.0
+                continue
+
+            self.backoff[name] = min(
+                self.config.max_backoff,
+                self.backoff[name] * 2 or self.config.initial_backoff,
+            )
+            logger.warning(
+                f"Alert delivery via '{name}' failed, {len(queue)} pending, "
+                f"retrying in {self.backoff[name]:g}s"
+            )
+            await asyncio.sleep(self.backoff[name])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": {name: len(queue) for name, queue in self.pending.items()},
+            "backoff": dict(self.backoff),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "bytes": self._size,
+        }
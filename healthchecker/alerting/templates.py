@@ -0,0 +1,153 @@
+"""Alert message templates."""
+import logging
+import string
+from typing import Any, Callable, Dict, FrozenSet, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..monitoring.endpoint import CheckResult
+
+logger = logging.getLogger(__name__)
+
+MISSING_VALUE = "n/a"
+
+# Fields that every template may reference, resolved lazily from a result
+RESULT_FIELDS: Dict[str, Callable[["CheckResult"], Any]] = {
+    "endpoint_name": lambda result: result.endpoint_name,
+    "url": lambda result: result.url,
+    "status": lambda result: result.status.value,
+    "message": lambda result: result.message,
+    "status_code": lambda result: result.status_code,
+    "response_time": lambda result: f"{result.response_time:.2f}s",
+    "timestamp": lambda result: result.timestamp.isoformat(),
+}
+
+_FORMATTER = string.Formatter()
+
+
+def parse_template_fields(template: str) -> FrozenSet[str]:
+    """
+    Parse a template and return the set of top-level fields it references.
+
+    Args:
+        template: A ``str.format`` style template
+
+    Returns:
+        The field names referenced by the template
+
+    Raises:
+        ValueError: If the template is malformed or uses positional fields
+    """
+    fields = set()
+    for _, field_name, format_spec, _ in _FORMATTER.parse(template):
+        if field_name is None:
+            continue
+
+        root = field_name.split(".", 1)[0].split("[", 1)[0]
+        if not root or root.isdigit():
+            raise ValueError(
+                f"Template fields must be named, got '{{{field_name}}}'"
+            )
+        fields.add(root)
+
+        # Nested replacement fields in the format spec are fields too
+        if format_spec and "{" in format_spec:
+            fields.update(parse_template_fields(format_spec))
+
+    return frozenset(fields)
+
+
+class _TemplateValues(dict):
+    """Mapping that renders unknown template fields as a placeholder."""
+
+    def __missing__(self, key: str) -> str:
+        return MISSING_VALUE
+
+
+class AlertTemplate:
+    """A validated alert template with its referenced fields precomputed."""
+
+    def __init__(self, template: str):
+        self.template = template
+        self.fields = parse_template_fields(template)
+        self._result_fields = {
+            name: RESULT_FIELDS[name] for name in self.fields if name in RESULT_FIELDS
+        }
+        self._detail_fields = self.fields - self._result_fields.keys()
+
+    def render(self, result: "CheckResult") -> str:
+        """Render the template for a check result."""
+        values = _TemplateValues(
+            (name, getter(result)) for name, getter in self._result_fields.items()
+        )
+        for name in self._detail_fields:
+            if name in result.details:
+                values[name] = result.details[name]
+
+        return self.template.format_map(values)
+
+
+def format_default_message(result: "CheckResult") -> str:
+    """Format an alert message when no template is configured."""
+    timestamp = result.timestamp.strftime("%Y-%m-%d %H:%M:%S UTC")
+
+    lines = [
+        f"❌ Health check failed for {result.endpoint_name}",
+        f"URL: {result.url}",
+        f"Status: {result.status.value}",
+        f"Message: {result.message}",
+    ]
+
+    if result.status_code:
+        lines.append(f"Status code: {result.status_code}")
+
+    lines.append(f"Response time: {result.response_time:.2f}s")
+    lines.append(f"Time: {timestamp}")
+
+    # Add selected details
+    if result.details:
+        lines.append("")
+        lines.append("Details:")
+        for key, value in result.details.items():
+            if isinstance(value, dict) and key in ["json_checks", "regex_checks"]:
+                lines.append(f"- {key}:")
+                for check_name, check_result in value.items():
+                    status = "✓" if check_result else "✗"
+                    lines.append(f"  - {check_name}: {status}")
+            else:
+                lines.append(f"- {key}: {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+def format_recovery_message(result: "CheckResult") -> str:
+    """Format a recovery notification when no template is configured."""
+    timestamp = result.timestamp.strftime("%Y-%m-%d %H:%M:%S UTC")
+    return (
+        f"✅ Health check recovered for {result.endpoint_name}\n"
+        f"URL: {result.url}\n"
+        f"Response time: {result.response_time:.2f}s\n"
+        f"Time: {timestamp}\n"
+    )
+
+
+def compile_templates(templates: Dict[str, str]) -> Dict[str, AlertTemplate]:
+    """Compile all configured templates, keyed by health status value."""
+    return {status: AlertTemplate(template) for status, template in templates.items()}
+
+
+def render_message(
+    result: "CheckResult",
+    template: Optional[AlertTemplate] = None,
+    fallback: Callable[["CheckResult"], str] = format_default_message,
+) -> str:
+    """Render the alert message for a result, falling back to the default format."""
+    if template:
+        try:
+            return template.render(result)
+        except (ValueError, TypeError, KeyError, IndexError, AttributeError) as e:
+            logger.warning(
+                f"Error rendering alert template for {result.endpoint_name}, "
+                f"using default format: {str(e)}"
+            )
+
+    return fallback(result)
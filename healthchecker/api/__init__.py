@@ -0,0 +1 @@
+"""Status API module."""
@@ -0,0 +1,163 @@
+"""Read-only HTTP status API."""
+import json
+import logging
+from typing import Any, Callable, Dict, Optional, TYPE_CHECKING
+
+from aiohttp import web
+
+from ..config.models import StatusAPIConfig
+from ..monitoring.status import StatusStore, encode_result
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..monitoring.profiling import Profiler
+    from ..monitoring.rollup import GroupIndex
+
+logger = logging.getLogger(__name__)
+
+JSON_CONTENT_TYPE = "application/json"
+
+
+class StatusAPI:
+    """Serves the current health state over HTTP."""
+
+    def __init__(
+        self,
+        config: StatusAPIConfig,
+        store: StatusStore,
+        profiler: Optional["Profiler"] = None,
+        metrics: Optional[Callable[[], Dict[str, Any]]] = None,
+        groups: Optional["GroupIndex"] = None,
+    ):
+        self.config = config
+        self.store = store
+        self.profiler = profiler
+        self.metrics = metrics
+        self.groups = groups
+        self.app = web.Application()
+        self.app.add_routes(
+            [
+                web.get("/status", self.handle_snapshot),
+                web.get("/status/{name}", self.handle_endpoint),
+                web.get("/changes", self.handle_changes),
+            ]
+        )
+        if metrics:
+            self.app.add_routes([web.get("/metrics", self.handle_metrics)])
+        if groups:
+            self.app.add_routes(
+                [
+                    web.get("/groups", self.handle_groups),
+                    web.get("/groups/{label}", self.handle_groups),
+                ]
+            )
+        if profiler:
+            self.app.add_routes(
+                [
+                    web.get("/debug/tasks", self.handle_tasks),
+                    web.post("/debug/profile", self.handle_profile),
+                ]
+            )
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self):
+        """Start serving the status API."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.config.host, self.config.port)
+        await site.start()
+        logger.info(
+            f"Status API listening on http://{self.config.host}:{self.config.port}"
+        )
+
+    async def stop(self):
+        """Stop serving the status API."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @staticmethod
+    def _respond(request: web.Request, body: bytes, etag: str) -> web.Response:
+        """Build a response, honouring If-None-Match."""
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=body, content_type=JSON_CONTENT_TYPE, headers=headers)
+
+    async def handle_snapshot(self, request: web.Request) -> web.Response:
+        """Return the latest result for every endpoint."""
+        body, etag = self.store.snapshot()
+        return self._respond(request, body, etag)
+
+    async def handle_endpoint(self, request: web.Request) -> web.Response:
+        """Return the latest result for a single endpoint."""
+        name = request.match_info["name"]
+        entry = self.store.endpoint(name)
+        if entry is None:
+            raise web.HTTPNotFound(
+                text=json.dumps({"error": f"Unknown endpoint: {name}"}),
+                content_type=JSON_CONTENT_TYPE,
+            )
+        body, etag = entry
+        return self._respond(request, body, etag)
+
+    async def handle_changes(self, request: web.Request) -> web.Response:
+        """Return the results that changed state since a cursor."""
+        try:
+            since = int(request.query.get("since", "0"))
+        except ValueError:
+            raise web.HTTPBadRequest(
+                text=json.dumps({"error": "'since' must be an integer cursor"}),
+                content_type=JSON_CONTENT_TYPE,
+            )
+
+        changed, cursor, truncated = self.store.changes(since)
+        body = (
+            b'{"cursor":%d,"truncated":%s,"changes":['
+            % (cursor, b"true" if truncated else b"false")
+            + b",".join(encode_result(result) for result in changed)
+            + b"]}"
+        )
+        return web.Response(body=body, content_type=JSON_CONTENT_TYPE)
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        """Return internal metrics of the monitor."""
+        return web.json_response(self.metrics())
+
+    async def handle_groups(self, request: web.Request) -> web.Response:
+        """Return the health rollup of every group, or of one label's groups."""
+        label = request.match_info.get("label")
+        rollup = self.groups.rollup(label)
+        if label is not None and not rollup:
+            raise web.HTTPNotFound(
+                text=json.dumps({"error": f"Unknown label: {label}"}),
+                content_type=JSON_CONTENT_TYPE,
+            )
+        return web.json_response(rollup)
+
+    async def handle_tasks(self, request: web.Request) -> web.Response:
+        """Return an immediate snapshot of the event loop's tasks."""
+        return web.json_response(self.profiler.snapshot_tasks())
+
+    async def handle_profile(self, request: web.Request) -> web.Response:
+        """Profile the monitor for ``?duration=`` seconds and report where."""
+        from ..monitoring.profiling import ProfilerBusy
+
+        duration = None
+        if "duration" in request.query:
+            try:
+                duration = float(request.query["duration"])
+            except ValueError:
+                duration = 0.0
+            if not duration > 0:
+                raise web.HTTPBadRequest(
+                    text=json.dumps({"error": "'duration' must be a positive number"}),
+                    content_type=JSON_CONTENT_TYPE,
+                )
+
+        try:
+            path = await self.profiler.capture(duration)
+        except ProfilerBusy as e:
+            raise web.HTTPConflict(
+                text=json.dumps({"error": str(e)}), content_type=JSON_CONTENT_TYPE
+            )
+        return web.json_response({"path": path})
@@ -1,17 +1,48 @@
 import asyncio
 import argparse
+import json
 import logging
+import os
+import re
 import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, TYPE_CHECKING
 
 from .config.loader import load_config
-from .monitoring.checker import MonitoringManager
-from .alerting.manager import AlertManager
+from .config.models import AppConfig, ShardingConfig
 from .utils.logging import configure_logging
 
+# The monitoring and alerting modules pull in aiohttp, jsonpath_ng and the alert
+# providers; they are imported by the commands that run checks, so validating a
+# configuration or querying history starts quickly
+if TYPE_CHECKING:  # pragma: no cover
+    from .monitoring.endpoint import CheckResult
+
 logger = logging.getLogger(__name__)
 
+DURATION_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)([smhdw])$")
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_time(value: str, now: float) -> float:
+    """
+    Parse a point in time given as ISO 8601 or as a duration ago (e.g. 24h).
+
+    Returns:
+        The point in time as a unix timestamp
+    """
+    match = DURATION_PATTERN.match(value)
+    if match:
+        return now - float(match.group(1)) * DURATION_UNITS[match.group(2)]
+
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
 
-def parse_args():
+def parse_args(argv=None):
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="Health check monitoring system")
 
@@ -32,6 +63,25 @@ def parse_args():
         action="store_true",
     )
 
+    parser.add_argument(
+        "--once",
+        help="Check every endpoint once, print a summary and exit",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--output",
+        help="Summary format for --once",
+        choices=["table", "json"],
+        default="table",
+    )
+
+    parser.add_argument(
+        "--deadline",
+        help="Seconds to allow for all checks in --once mode",
+        type=float,
+    )
+
     parser.add_argument(
         "--log-level",
         help="Set the log level",
@@ -39,7 +89,220 @@ def parse_args():
         default="INFO",
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--shard-index",
+        help="Index of this instance's shard (0-based), used with --shard-count",
+        type=int,
+    )
+
+    parser.add_argument(
+        "--shard-count",
+        help="Total number of shards the endpoints are split across",
+        type=int,
+    )
+
+    parser.add_argument(
+        "--shard-lease",
+        help="Shared SQLite file for lease-based sharding between instances",
+    )
+
+    parser.add_argument(
+        "--instance-id",
+        help="Unique id of this instance in lease-based sharding",
+    )
+
+    parser.add_argument(
+        "--record",
+        help="Append a trace of every response to this file, for 'simulate'",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+
+    history_parser = subparsers.add_parser(
+        "history", help="Report availability and latency from the check history"
+    )
+    history_parser.add_argument("endpoint", help="Name of the endpoint to report on")
+    history_parser.add_argument(
+        "--start",
+        help="Start of the range, as ISO 8601 or a duration ago (e.g. 30m, 24h, 7d)",
+        default="24h",
+    )
+    history_parser.add_argument(
+        "--end",
+        help="End of the range, as ISO 8601 or a duration ago (default: now)",
+        default=None,
+    )
+    history_parser.add_argument(
+        "--path",
+        help="Path to the history directory (default: history.path from the config)",
+    )
+    history_parser.add_argument(
+        "--percentiles",
+        help="Comma-separated latency percentiles to report",
+        default="50,95,99",
+    )
+
+    simulate_parser = subparsers.add_parser(
+        "simulate", help="Replay a recorded trace and report the alerts it triggers"
+    )
+    simulate_parser.add_argument("trace", help="Path to a trace written with --record")
+    simulate_parser.add_argument(
+        "--output",
+        help="Report format",
+        choices=["table", "json"],
+        default="table",
+    )
+
+    return parser.parse_args(argv)
+
+
+def apply_sharding_args(config: AppConfig, args) -> None:
+    """Override the sharding configuration from command line arguments."""
+    overrides = {
+        key: value
+        for key, value in {
+            "shard_index": args.shard_index,
+            "shard_count": args.shard_count,
+            "lease_path": args.shard_lease,
+            "instance_id": args.instance_id,
+        }.items()
+        if value is not None
+    }
+    if overrides:
+        config.sharding = ShardingConfig.model_validate(
+            {**config.sharding.model_dump(), **overrides}
+        )
+
+
+def format_table(results: List["CheckResult"]) -> str:
+    """Format check results as a plain text table."""
+    rows = [("ENDPOINT", "STATUS", "CODE", "TIME", "MESSAGE")]
+    for result in results:
+        rows.append(
+            (
+                result.endpoint_name,
+                result.status.value.upper(),
+                str(result.status_code or "-"),
+                f"{result.response_time:.2f}s",
+                result.message,
+            )
+        )
+
+    widths = [max(len(row[i]) for row in rows) for i in range(4)]
+    lines = [
+        "  ".join(value.ljust(width) for value, width in zip(row, widths)) + "  " + row[4]
+        for row in rows
+    ]
+    return "\n".join(line.rstrip() for line in lines)
+
+
+def format_summary(results: List["CheckResult"], output: str) -> str:
+    """Format the results of a one-shot sweep."""
+    from .monitoring.endpoint import HealthStatus
+
+    critical = sum(1 for r in results if r.status != HealthStatus.OK)
+    if output == "json":
+        return json.dumps(
+            {
+                "total": len(results),
+                "ok": len(results) - critical,
+                "critical": critical,
+                "results": [result.to_dict() for result in results],
+            },
+            indent=2,
+            default=str,
+        )
+
+    return (
+        format_table(results)
+        + f"\n\n{len(results)} checked, {len(results) - critical} ok, "
+        + f"{critical} critical"
+    )
+
+
+async def run_once(config: AppConfig, args) -> int:
+    """Check every endpoint once and report; non-zero if anything is critical."""
+    from .alerting.manager import AlertManager
+    from .monitoring.checker import MonitoringManager
+    from .monitoring.endpoint import HealthStatus
+
+    alert_manager = AlertManager(config.alerting, mock_mode=True)
+    monitoring_manager = MonitoringManager(config, alert_manager)
+
+    results = await monitoring_manager.run_once(deadline=args.deadline)
+    print(format_summary(results, args.output))
+
+    return 1 if any(r.status != HealthStatus.OK for r in results) else 0
+
+
+def query_history(args) -> int:
+    """Print an availability and latency report for an endpoint."""
+    from .history.store import HistoryStore
+
+    path = args.path or load_config(args.config).history.path
+
+    now = time.time()
+    start = parse_time(args.start, now)
+    end = parse_time(args.end, now) if args.end else now
+    percentiles = [float(p) for p in args.percentiles.split(",") if p.strip()]
+
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"History directory not found: {path}")
+
+    store = HistoryStore(path)
+    report = store.query(args.endpoint, start, end, percentiles)
+    print(json.dumps(report, indent=2))
+
+    return 0 if report["checks"] else 1
+
+
+def format_simulation(report: Dict[str, Any], output: str) -> str:
+    """Format the report of a simulated replay."""
+    if output == "json":
+        return json.dumps(report, indent=2)
+
+    rows = [("ENDPOINT", "CHECKS", "FAILURES", "ALERTS", "RATE LIMITED")]
+    for name, counts in sorted(report["endpoints"].items()):
+        rows.append(
+            (
+                name,
+                str(counts["checks"]),
+                str(counts["failures"]),
+                str(counts["alerts"]),
+                str(counts["rate_limited"]),
+            )
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(5)]
+    lines = [
+        "  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip()
+        for row in rows
+    ]
+
+    if report["alerts"]:
+        lines.append("")
+        for alert in report["alerts"]:
+            lines.append(f"{alert['time']}  {alert['endpoint']}  {alert['message']}")
+
+    lines.append("")
+    lines.append(
+        f"{report['checks']} checks replayed over {report['duration']:.0f}s, "
+        f"{report['failures']} failed, {len(report['alerts'])} alerts, "
+        f"{report['rate_limited']} rate limited"
+    )
+    return "\n".join(lines)
+
+
+async def run_simulation(args) -> int:
+    """Replay a trace against the configuration; non-zero if any alert fired."""
+    from .monitoring.simulation import simulate
+
+    if not os.path.isfile(args.trace):
+        raise FileNotFoundError(f"Trace file not found: {args.trace}")
+
+    report = await simulate(load_config(args.config), args.trace)
+    print(format_simulation(report, args.output))
+
+    return 1 if report["alerts"] else 0
 
 
 async def main_async():
@@ -47,13 +310,26 @@ async def main_async():
     args = parse_args()
 
     try:
+        if args.command == "history":
+            return query_history(args)
+        if args.command == "simulate":
+            return await run_simulation(args)
+
         # Load configuration
         config = load_config(args.config)
 
+        # Apply sharding overrides
+        apply_sharding_args(config, args)
+        if args.record:
+            config.record_path = args.record
+
         # Configure logging
         log_config = config.logging.model_dump()
         if args.log_level:
             log_config["level"] = args.log_level
+        if args.once and log_config["output"] == "stdout":
+            # Keep stdout for the summary
+            log_config["output"] = "stderr"
         configure_logging(log_config)
 
         logger.info("Starting...")
@@ -63,6 +339,13 @@ async def main_async():
             logger.info("Configuration validated successfully")
             return 0
 
+        # Check everything once and exit
+        if args.once:
+            return await run_once(config, args)
+
+        from .alerting.manager import AlertManager
+        from .monitoring.checker import MonitoringManager
+
         # Setup alerting
         alert_manager = AlertManager(config.alerting, mock_mode=args.mock_alerts)
 
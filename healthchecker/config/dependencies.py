@@ -0,0 +1,71 @@
+"""Endpoint dependency graph."""
+from collections import deque
+from typing import Dict, List, Sequence
+
+
+class DependencyGraph:
+    """
+    Directed acyclic graph of endpoint dependencies.
+
+    Args:
+        dependencies: Mapping of endpoint name to the names it depends on
+
+    Raises:
+        ValueError: If an unknown endpoint is referenced or the graph has a cycle
+    """
+
+    def __init__(self, dependencies: Dict[str, Sequence[str]]):
+        self.parents: Dict[str, List[str]] = {
+            name: list(parents) for name, parents in dependencies.items()
+        }
+
+        for name, parents in self.parents.items():
+            for parent in parents:
+                if parent not in self.parents:
+                    raise ValueError(
+                        f"Endpoint '{name}' depends on unknown endpoint '{parent}'"
+                    )
+                if parent == name:
+                    raise ValueError(f"Endpoint '{name}' depends on itself")
+
+        self.order = self._topological_order()
+        self.ancestors = self._ancestors()
+
+    def _topological_order(self) -> List[str]:
+        """Order endpoints so every parent comes before its children (Kahn)."""
+        children: Dict[str, List[str]] = {name: [] for name in self.parents}
+        pending = {name: len(parents) for name, parents in self.parents.items()}
+        for name, parents in self.parents.items():
+            for parent in parents:
+                children[parent].append(name)
+
+        ready = deque(name for name, count in pending.items() if count == 0)
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for child in children[name]:
+                pending[child] -= 1
+                if pending[child] == 0:
+                    ready.append(child)
+
+        if len(order) != len(self.parents):
+            cycle = sorted(name for name, count in pending.items() if count)
+            raise ValueError(
+                f"Dependency cycle between endpoints: {', '.join(cycle)}"
+            )
+
+        return order
+
+    def _ancestors(self) -> Dict[str, List[str]]:
+        """Collect all transitive parents, nearest first."""
+        ancestors: Dict[str, List[str]] = {}
+        for name in self.order:
+            seen: Dict[str, None] = {}
+            for parent in self.parents[name]:
+                seen[parent] = None
+            for parent in self.parents[name]:
+                for ancestor in ancestors[parent]:
+                    seen[ancestor] = None
+            ancestors[name] = list(seen)
+        return ancestors
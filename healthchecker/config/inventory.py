@@ -0,0 +1,173 @@
+"""Streaming ingestion of endpoint inventories from NDJSON and CSV files."""
+import csv
+import json
+import logging
+import os
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+from pydantic import ValidationError
+
+from .loader import process_env_vars_recursive
+from .models import EndpointConfig, InventoryConfig
+
+logger = logging.getLogger(__name__)
+
+# Row errors listed when an inventory is rejected (or logged when skipping rows)
+MAX_REPORTED_ERRORS = 20
+
+FORMATS_BY_EXTENSION = {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv"}
+
+Row = Union[Dict[str, Any], ValueError]
+
+
+class InventoryError(ValueError):
+    """Rows of an inventory file failed validation."""
+
+    def __init__(self, path: str, errors: List[str], invalid: int, unlisted: int):
+        self.path = path
+        self.errors = errors
+        self.invalid = invalid
+        lines = [f"{invalid} invalid rows in inventory {path}:"] + errors
+        if unlisted:
+            lines.append(f"... and {unlisted} more errors")
+        super().__init__("\n".join(lines))
+
+
+def _ndjson_rows(f) -> Iterator[Tuple[int, Row]]:
+    for line, text in enumerate(f, 1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError as e:
+            yield line, ValueError(f"invalid JSON: {e}")
+            continue
+        if not isinstance(row, dict):
+            yield line, ValueError("row must be a JSON object")
+            continue
+        yield line, row
+
+
+def _csv_rows(f) -> Iterator[Tuple[int, Row]]:
+    reader = csv.DictReader(f)
+    for cells in reader:
+        row: Dict[str, Any] = {}
+        error = None
+        for column, cell in cells.items():
+            if column is None:
+                error = ValueError("more cells than columns")
+                break
+            # Empty cells leave the field to the defaults
+            if not cell:
+                continue
+            if cell[0] in "[{":
+                try:
+                    value: Any = json.loads(cell)
+                except ValueError as e:
+                    error = ValueError(f"{column}: invalid JSON: {e}")
+                    break
+            else:
+                value = cell
+
+            # Dotted columns (labels.team, retry.attempts) fill nested objects
+            target = row
+            *parents, field = column.split(".")
+            for parent in parents:
+                target = target.setdefault(parent, {})
+                if not isinstance(target, dict):
+                    error = ValueError(f"{column}: {parent} is not an object")
+                    break
+            else:
+                target[field] = value
+                continue
+            break
+        yield reader.line_num, error or row
+
+
+def _merge(defaults: Dict[str, Any], row: Dict[str, Any]) -> Dict[str, Any]:
+    """Lay a row over the defaults; objects such as headers are merged by key."""
+    if not defaults:
+        return row
+    merged = dict(defaults)
+    for key, value in row.items():
+        default = defaults.get(key)
+        if isinstance(default, dict) and isinstance(value, dict):
+            value = {**default, **value}
+        merged[key] = value
+    return merged
+
+
+def _describe(error: Exception) -> List[str]:
+    if isinstance(error, ValidationError):
+        return [
+            f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: "
+            f"{detail['msg']}"
+            for detail in error.errors()
+        ]
+    return [str(error)]
+
+
+def load_inventory(source: InventoryConfig, base_dir: str) -> List[EndpointConfig]:
+    """
+    Read the endpoints of an inventory file, one row at a time.
+
+    Every row is merged with the source's defaults and validated on its own, so
+    only the resulting endpoint configurations are held in memory.
+
+    Args:
+        source: The inventory to read
+        base_dir: Directory relative paths are resolved against
+
+    Returns:
+        The endpoints of the valid rows, in file order
+
+    Raises:
+        InventoryError: If rows are invalid and ``skip_invalid`` is not set
+    """
+    path = os.path.join(base_dir, source.path)
+    kind = source.format
+    if kind is None:
+        extension = os.path.splitext(path)[1].lower()
+        kind = FORMATS_BY_EXTENSION.get(extension)
+        if kind is None:
+            raise ValueError(
+                f"Cannot tell the format of inventory {source.path}, set format"
+            )
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Inventory file not found: {path}")
+
+    endpoints: List[EndpointConfig] = []
+    errors: List[str] = []
+    invalid = unlisted = 0
+    validate = EndpointConfig.model_validate
+
+    with open(path, "r", newline="" if kind == "csv" else None) as f:
+        rows = _csv_rows(f) if kind == "csv" else _ndjson_rows(f)
+        for line, row in rows:
+            try:
+                if isinstance(row, ValueError):
+                    raise row
+                endpoints.append(
+                    validate(_merge(source.defaults, process_env_vars_recursive(row)))
+                )
+                continue
+            except ValueError as e:
+                # Includes pydantic's ValidationError
+                messages = _describe(e)
+
+            invalid += 1
+            for message in messages:
+                if len(errors) == MAX_REPORTED_ERRORS:
+                    unlisted += 1
+                    continue
+                errors.append(f"{source.path}:{line}: {message}")
+                if source.skip_invalid:
+                    logger.warning(f"Skipping {errors[-1]}")
+
+    if invalid and not source.skip_invalid:
+        raise InventoryError(source.path, errors, invalid, unlisted)
+    if invalid:
+        logger.warning(f"Skipped {invalid} invalid rows of inventory {source.path}")
+
+    logger.info(f"Loaded {len(endpoints)} endpoints from inventory {source.path}")
+    return endpoints
@@ -1,10 +1,12 @@
 import os
 import re
 import yaml
-from typing import Any
+from typing import Any, List
 import logging
 
-from .models import AppConfig
+from pydantic import TypeAdapter
+
+from .models import AppConfig, EndpointConfig, InventoryConfig
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +46,16 @@ def process_env_vars_recursive(config: Any) -> Any:
         return config
 
 
+def load_inventories(sources: Any, base_dir: str) -> List[EndpointConfig]:
+    """Load the endpoints of every inventory source of a configuration."""
+    from .inventory import load_inventory
+
+    endpoints: List[EndpointConfig] = []
+    for source in TypeAdapter(List[InventoryConfig]).validate_python(sources):
+        endpoints.extend(load_inventory(source, base_dir))
+    return endpoints
+
+
 def load_config(config_path: str) -> AppConfig:
     """Load and validate configuration from YAML file."""
     if not os.path.exists(config_path):
@@ -56,6 +68,17 @@ def load_config(config_path: str) -> AppConfig:
         # Resolve environment variables
         config_dict = process_env_vars_recursive(config_dict)
 
+        # Read endpoint inventories row by row; their endpoints are validated
+        # already and are taken as they are below
+        if isinstance(config_dict, dict) and config_dict.get("inventory"):
+            config_dict["endpoints"] = list(config_dict.get("endpoints") or [])
+            config_dict["endpoints"].extend(
+                load_inventories(
+                    config_dict["inventory"],
+                    os.path.dirname(os.path.abspath(config_path)),
+                )
+            )
+
         # Validate using Pydantic
         config = AppConfig.model_validate(config_dict)
 
@@ -2,12 +2,62 @@ from typing import Dict, List, Optional, Union, Any, Literal
 from pydantic import BaseModel, Field, field_validator, model_validator
 import re
 
+from ..alerting.templates import parse_template_fields
+from .dependencies import DependencyGraph
+
 
 class RetryConfig(BaseModel):
     attempts: int = Field(default=3, ge=1)
     backoff_factor: float = Field(default=0.3, ge=0)
 
 
+class BurnRateWindow(BaseModel):
+    long_window: float = Field(gt=0)  # seconds
+    short_window: float = Field(gt=0)  # seconds
+    burn_rate: float = Field(gt=0)  # multiple of the sustainable error rate
+
+    @model_validator(mode="after")
+    def validate_windows(self) -> "BurnRateWindow":
+        if self.short_window > self.long_window:
+            raise ValueError("short_window must not be longer than long_window")
+        return self
+
+
+class SLOConfig(BaseModel):
+    objective: float = Field(gt=0, lt=1)  # e.g. 0.999 for 99.9% availability
+    windows: List[BurnRateWindow] = Field(
+        default_factory=lambda: [
+            BurnRateWindow(long_window=3600.0, short_window=300.0, burn_rate=14.4),
+            BurnRateWindow(long_window=21600.0, short_window=1800.0, burn_rate=6.0),
+        ]
+    )
+
+
+class LatencyConfig(BaseModel):
+    percentile: float = Field(default=95.0, gt=0, lt=100)
+    percentile_threshold: Optional[float] = Field(default=None, gt=0)  # seconds
+    window: float = Field(default=300.0, gt=0)  # seconds the percentile covers
+    baseline_alpha: float = Field(default=0.05, gt=0, le=1)  # EWMA smoothing
+    deviation_threshold: Optional[float] = Field(
+        default=None, gt=0
+    )  # mean deviations above the baseline
+    min_samples: int = Field(default=10, ge=1)  # checks before thresholds apply
+
+    @model_validator(mode="after")
+    def validate_thresholds(self) -> "LatencyConfig":
+        if self.percentile_threshold is None and self.deviation_threshold is None:
+            raise ValueError(
+                "latency needs a percentile_threshold or a deviation_threshold"
+            )
+        return self
+
+
+class ComponentsConfig(BaseModel):
+    selector: str  # JSONPath of the component objects, e.g. $.components[*]
+    name_path: Optional[str] = None  # JSONPath of a component's name; None uses its key
+    json_path_checks: Dict[str, Any] = Field(default_factory=dict)  # per component
+
+
 class EndpointConfig(BaseModel):
     url: str
     name: Optional[str] = None
@@ -24,6 +74,17 @@ class EndpointConfig(BaseModel):
     regex_checks: Dict[str, str] = Field(default_factory=dict)
     failure_threshold: int = 3  # failures
     failure_window: float = 300.0  # seconds (5 minutes)
+    conditional_requests: bool = False  # send If-None-Match / If-Modified-Since
+    priority: int = Field(default=1, ge=0)  # dispatch class, 0 is most important
+    labels: Dict[str, str] = Field(default_factory=dict)  # e.g. service, team, region
+    transport: Literal["aiohttp", "stream"] = "aiohttp"  # HTTP client for requests
+    slo: Optional[SLOConfig] = None
+    latency: Optional[LatencyConfig] = None
+    components: Optional[ComponentsConfig] = None  # virtual endpoints in the body
+    depends_on: List[str] = Field(default_factory=list)  # upstream endpoint names
+    parent_down_interval: Optional[float] = Field(
+        default=None, gt=0
+    )  # seconds between checks while a dependency is down; None skips checks
 
     @model_validator(mode="after")
     def set_default_name(self) -> "EndpointConfig":
@@ -48,17 +109,51 @@ class EndpointConfig(BaseModel):
         return v
 
 
+class InventoryConfig(BaseModel):
+    path: str  # NDJSON or CSV file, relative to the configuration file
+    format: Optional[Literal["ndjson", "csv"]] = None  # None picks by extension
+    defaults: Dict[str, Any] = Field(default_factory=dict)  # fields rows inherit
+    skip_invalid: bool = False  # log and skip invalid rows instead of failing
+
+
 class AlertProviderConfig(BaseModel):
     type: str
     enabled: bool = True
     config: Dict[str, Any] = Field(default_factory=dict)
 
 
+class SpoolConfig(BaseModel):
+    path: Optional[str] = None  # spool file; None delivers alerts directly
+    max_bytes: int = Field(default=10 * 1024 * 1024, ge=1024)  # spool file size
+    max_entries: int = Field(default=10000, ge=1)  # undelivered alerts kept
+    max_age: float = Field(default=86400.0, gt=0)  # seconds before giving up
+    initial_backoff: float = Field(default=5.0, gt=0)  # seconds
+    max_backoff: float = Field(default=300.0, gt=0)  # seconds
+
+
 class AlertConfig(BaseModel):
     providers: Dict[str, AlertProviderConfig]
     cooldown_period: float = 600.0  # seconds
     max_alerts_per_hour: int = 10
     templates: Dict[str, str] = Field(default_factory=dict)
+    spool: SpoolConfig = Field(default_factory=SpoolConfig)
+
+    @field_validator("templates", mode="after")
+    @classmethod
+    def validate_templates(cls, v):
+        for status, template in v.items():
+            try:
+                parse_template_fields(template)
+            except ValueError as e:
+                raise ValueError(f"Invalid alert template '{status}': {e}")
+        return v
+
+
+class GroupAlertConfig(BaseModel):
+    label: str  # alert on each group of endpoints sharing a value of this label
+    state: Literal["down", "degraded", "unhealthy"] = "down"  # unhealthy: either
+    threshold: float = Field(ge=0, lt=1)  # alert above this share of the group
+    min_endpoints: int = Field(default=1, ge=1)  # smaller groups never alert
 
 
 class LoggingConfig(BaseModel):
@@ -67,11 +162,134 @@ class LoggingConfig(BaseModel):
     output: str = "stdout"
 
 
+class SinkConfig(BaseModel):
+    type: str
+    enabled: bool = True
+    batch_size: int = Field(default=500, ge=1)  # records per write
+    flush_interval: float = Field(default=1.0, gt=0)  # seconds
+    buffer_size: int = Field(default=10000, ge=1)  # records buffered in memory
+    config: Dict[str, Any] = Field(default_factory=dict)
+
+
+class HistoryConfig(BaseModel):
+    enabled: bool = False
+    path: str = "history"
+    segment_duration: float = Field(default=3600.0, gt=0)  # seconds per segment
+    retention: Optional[float] = Field(default=30 * 86400.0, gt=0)  # seconds
+    batch_size: int = Field(default=1000, ge=1)  # results per write
+    flush_interval: float = Field(default=10.0, gt=0)  # seconds
+    buffer_size: int = Field(default=100000, ge=1)  # results buffered in memory
+
+
+class ShardingConfig(BaseModel):
+    shard_index: Optional[int] = Field(default=None, ge=0)
+    shard_count: int = Field(default=1, ge=1)
+    lease_path: Optional[str] = None  # shared SQLite file for lease-based mode
+    instance_id: Optional[str] = None  # defaults to <hostname>-<pid>
+    lease_ttl: float = Field(default=30.0, gt=0)  # seconds
+
+    @model_validator(mode="after")
+    def validate_shard(self) -> "ShardingConfig":
+        if self.shard_index is not None and self.shard_index >= self.shard_count:
+            raise ValueError(
+                f"shard_index must be less than shard_count ({self.shard_count})"
+            )
+        if self.shard_index is not None and self.lease_path:
+            raise ValueError("Use either shard_index/shard_count or lease_path")
+        return self
+
+
+class StateConfig(BaseModel):
+    change_only: bool = False  # only log, stream and alert on state transitions
+    confirm_count: int = Field(default=2, ge=1)  # consecutive results to change state
+    flap_window: int = Field(default=20, ge=2)  # results considered for flapping
+    flap_threshold_high: float = Field(default=0.5, gt=0, le=1)  # share of changes
+    flap_threshold_low: float = Field(default=0.25, ge=0, le=1)
+
+    @model_validator(mode="after")
+    def validate_flap_thresholds(self) -> "StateConfig":
+        if self.flap_threshold_low > self.flap_threshold_high:
+            raise ValueError(
+                "flap_threshold_low must not be greater than flap_threshold_high"
+            )
+        return self
+
+
+class ConcurrencyConfig(BaseModel):
+    adaptive: bool = False  # resize the limit from loop lag and latency inflation
+    min_limit: int = Field(default=1, ge=1)  # concurrency_limit is the maximum
+    max_loop_lag: float = Field(default=0.1, gt=0)  # seconds
+    latency_tolerance: float = Field(default=2.0, gt=1)  # latency / baseline
+    sample_interval: float = Field(default=1.0, gt=0)  # seconds
+    decrease_factor: float = Field(default=0.75, gt=0, lt=1)
+    increase: int = Field(default=1, ge=1)
+    # Dispatch share of each priority class while checks queue, class 0 first
+    priority_weights: List[int] = Field(default=[4, 2, 1], min_length=1)
+    shed_after: Optional[float] = Field(default=None, gt=0)  # seconds queued
+
+    @field_validator("priority_weights")
+    @classmethod
+    def validate_priority_weights(cls, v):
+        if any(weight < 1 for weight in v):
+            raise ValueError("Priority weights must be at least 1")
+        return v
+
+
+class CircuitBreakerConfig(BaseModel):
+    enabled: bool = False  # refuse checks of hosts that stopped accepting connections
+    failure_threshold: int = Field(default=5, ge=1)  # consecutive connection failures
+    probe_interval: float = Field(default=30.0, gt=0)  # seconds between probes
+    max_probe_interval: float = Field(default=300.0, gt=0)  # seconds, after doubling
+
+
+class BodyOffloadConfig(BaseModel):
+    threshold: Optional[int] = Field(default=262144, ge=0)  # characters, None disables
+    executor: Literal["thread", "process"] = "thread"
+    workers: int = Field(default=2, ge=1)
+
+
+class StatusAPIConfig(BaseModel):
+    enabled: bool = False
+    host: str = "127.0.0.1"
+    port: int = Field(default=8080, ge=0, le=65535)
+    max_changes: int = Field(default=10000, ge=1)  # change feed entries kept
+
+
+class ProfilingConfig(BaseModel):
+    enabled: bool = False
+    output_dir: str = "profiles"
+    duration: float = Field(default=30.0, gt=0)  # seconds
+    top: int = Field(default=25, ge=1)  # entries per report
+    signal: Optional[str] = "SIGUSR1"  # None disables the signal trigger
+
+    @field_validator("signal")
+    @classmethod
+    def validate_signal(cls, v):
+        import signal
+
+        if v is not None and not isinstance(getattr(signal, v, None), signal.Signals):
+            raise ValueError(f"Unknown signal: {v}")
+        return v
+
+
 class AppConfig(BaseModel):
     endpoints: List[EndpointConfig]
     alerting: AlertConfig
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
     concurrency_limit: int = Field(default=100, ge=1)
+    concurrency: ConcurrencyConfig = Field(default_factory=ConcurrencyConfig)
+    circuit_breaker: CircuitBreakerConfig = Field(default_factory=CircuitBreakerConfig)
+    body_offload: BodyOffloadConfig = Field(default_factory=BodyOffloadConfig)
+    status_api: StatusAPIConfig = Field(default_factory=StatusAPIConfig)
+    sinks: Dict[str, SinkConfig] = Field(default_factory=dict)
+    history: HistoryConfig = Field(default_factory=HistoryConfig)
+    slo_resolution: float = Field(default=60.0, gt=0)  # seconds per SLO bucket
+    sharding: ShardingConfig = Field(default_factory=ShardingConfig)
+    state: StateConfig = Field(default_factory=StateConfig)
+    profiling: ProfilingConfig = Field(default_factory=ProfilingConfig)
+    record_path: Optional[str] = None  # append response traces for simulation
+    group_alerts: List[GroupAlertConfig] = Field(default_factory=list)
+    inventory: List[InventoryConfig] = Field(default_factory=list)  # more endpoints
 
     @field_validator("endpoints")
     @classmethod
@@ -80,3 +298,17 @@ class AppConfig(BaseModel):
         if len(names) != len(set(names)):
             raise ValueError("Endpoint names must be unique")
         return v
+
+    @field_validator("endpoints")
+    @classmethod
+    def validate_dependencies(cls, v):
+        DependencyGraph({endpoint.name: endpoint.depends_on for endpoint in v})
+        return v
+
+    @model_validator(mode="after")
+    def validate_concurrency_bounds(self) -> "AppConfig":
+        if self.concurrency.min_limit > self.concurrency_limit:
+            raise ValueError(
+                "concurrency.min_limit must not be greater than concurrency_limit"
+            )
+        return self
@@ -0,0 +1 @@
+"""Check history module."""
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional
+
+from ..config.models import HistoryConfig
+from ..monitoring.endpoint import CheckResult
+from .store import HistoryStore
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryRecorder:
+    """Buffers check results and appends them to the history store in batches."""
+
+    def __init__(self, config: HistoryConfig):
+        self.config = config
+        self.store = HistoryStore(config.path, config.segment_duration)
+        self.dropped = 0
+        self._buffer: List[CheckResult] = []
+        self._flushing: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_prune = 0.0
+
+    async def start(self) -> None:
+        """Start the periodic flush task."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write any buffered results."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._flushing:
+            await asyncio.gather(self._flushing, return_exceptions=True)
+        await self._flush()
+
+    def record(self, result: CheckResult) -> None:
+        """Buffer a result, flushing in the background once a batch is full."""
+        if len(self._buffer) >= self.config.buffer_size:
+            self.dropped += 1
+            return
+
+        self._buffer.append(result)
+        if len(self._buffer) >= self.config.batch_size:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> asyncio.Task:
+        """Start a flush unless one is already running, so writes never overlap."""
+        if not self._flushing:
+            self._flushing = asyncio.create_task(self._flush())
+        return self._flushing
+
+    async def _flush(self) -> None:
+        batch, self._buffer = self._buffer, []
+        try:
+            if batch:
+                await asyncio.to_thread(self.store.append, batch)
+            await self._prune()
+        except Exception as e:
+            self.dropped += len(batch)
+            logger.error(f"Error writing check history: {str(e)}")
+        finally:
+            self._flushing = None
+
+    async def _prune(self) -> None:
+        """Delete expired segments, at most once per segment duration."""
+        if not self.config.retention:
+            return
+
+        now = time.time()
+        if now - self._last_prune < self.config.segment_duration:
+            return
+
+        self._last_prune = now
+        removed = await asyncio.to_thread(
+            self.store.prune, now - self.config.retention
+        )
+        if removed:
+            logger.info(f"Removed {removed} expired history segments")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.flush_interval)
+            await asyncio.shield(self._schedule_flush())
@@ -0,0 +1,276 @@
+"""Columnar on-disk store for check history."""
+import json
+import logging
+import math
+import mmap
+import os
+import shutil
+import sys
+from array import array
+from contextlib import ExitStack
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..monitoring.endpoint import CheckResult, HealthStatus
+
+logger = logging.getLogger(__name__)
+
+# Column name -> (array typecode, file name). All columns are little-endian.
+COLUMNS = {
+    "timestamp": ("d", "timestamp.f64"),
+    "endpoint": ("I", "endpoint.u32"),
+    "status": ("B", "status.u8"),
+    "status_code": ("H", "status_code.u16"),
+    "latency": ("f", "latency.f32"),
+}
+
+STATUS_CODES = {HealthStatus.OK: 0, HealthStatus.CRITICAL: 1}
+
+ENDPOINTS_FILE = "endpoints.json"
+META_FILE = "meta.json"
+SEGMENTS_DIR = "segments"
+
+
+class HistoryStore:
+    """
+    Append-only history of check results, stored as fixed-width columns.
+
+    Rows are partitioned into time segments of ``segment_duration`` seconds. Each
+    segment is a directory holding one file per column, so a segment can be
+    read back through ``mmap`` without parsing and queries only touch the
+    segments that overlap the requested time range. The segment duration of an
+    existing store is read from its metadata and takes precedence.
+    """
+
+    def __init__(self, path: str, segment_duration: float = 3600.0):
+        self.path = path
+        self.segment_duration = segment_duration
+        self.segments_path = os.path.join(path, SEGMENTS_DIR)
+        self._endpoint_ids: Dict[str, int] = {}
+        self._load_meta()
+        self._load_endpoint_ids()
+
+    def _load_meta(self) -> None:
+        meta_path = os.path.join(self.path, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, "r") as f:
+                self.segment_duration = json.load(f)["segment_duration"]
+        else:
+            os.makedirs(self.path, exist_ok=True)
+            with open(meta_path, "w") as f:
+                json.dump({"segment_duration": self.segment_duration}, f)
+
+    def _load_endpoint_ids(self) -> None:
+        endpoints_path = os.path.join(self.path, ENDPOINTS_FILE)
+        if os.path.exists(endpoints_path):
+            with open(endpoints_path, "r") as f:
+                self._endpoint_ids = json.load(f)
+
+    def _save_endpoint_ids(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        endpoints_path = os.path.join(self.path, ENDPOINTS_FILE)
+        tmp_path = endpoints_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._endpoint_ids, f)
+        os.replace(tmp_path, endpoints_path)
+
+    def endpoint_id(self, name: str) -> Optional[int]:
+        """Return the numeric id of an endpoint, if it has any history."""
+        return self._endpoint_ids.get(name)
+
+    def _segment_start(self, timestamp: float) -> int:
+        return int(timestamp // self.segment_duration * self.segment_duration)
+
+    def _segment_path(self, start: int) -> str:
+        return os.path.join(self.segments_path, str(start))
+
+    def append(self, results: Iterable[CheckResult]) -> int:
+        """
+        Append a batch of results.
+
+        Args:
+            results: The check results to store
+
+        Returns:
+            The number of rows written
+        """
+        segments: Dict[int, Dict[str, array]] = {}
+        new_endpoints = False
+        rows = 0
+
+        for result in results:
+            endpoint_id = self._endpoint_ids.get(result.endpoint_name)
+            if endpoint_id is None:
+                endpoint_id = len(self._endpoint_ids)
+                self._endpoint_ids[result.endpoint_name] = endpoint_id
+                new_endpoints = True
+
+            timestamp = result.timestamp.timestamp()
+            columns = segments.get(self._segment_start(timestamp))
+            if columns is None:
+                columns = {
+                    name: array(typecode) for name, (typecode, _) in COLUMNS.items()
+                }
+                segments[self._segment_start(timestamp)] = columns
+
+            columns["timestamp"].append(timestamp)
+            columns["endpoint"].append(endpoint_id)
+            columns["status"].append(STATUS_CODES.get(result.status, 1))
+            columns["status_code"].append(result.status_code or 0)
+            columns["latency"].append(result.response_time)
+            rows += 1
+
+        # Persist ids before rows so every stored row can be resolved
+        if new_endpoints:
+            self._save_endpoint_ids()
+
+        for start, columns in segments.items():
+            segment_path = self._segment_path(start)
+            os.makedirs(segment_path, exist_ok=True)
+            for name, (_, filename) in COLUMNS.items():
+                column = columns[name]
+                if sys.byteorder != "little":
+                    column.byteswap()
+                with open(os.path.join(segment_path, filename), "ab") as f:
+                    f.write(column.tobytes())
+
+        return rows
+
+    def segments(self, start: float, end: float) -> List[int]:
+        """Return the start times of the segments overlapping [start, end)."""
+        if not os.path.isdir(self.segments_path):
+            return []
+
+        first = self._segment_start(start)
+        return sorted(
+            segment
+            for segment in (int(name) for name in os.listdir(self.segments_path))
+            if first <= segment < end
+        )
+
+    def prune(self, before: float) -> int:
+        """
+        Delete segments that end before a point in time.
+
+        Returns:
+            The number of segments removed
+        """
+        removed = 0
+        for segment in self.segments(0, before):
+            if segment + self.segment_duration <= before:
+                shutil.rmtree(self._segment_path(segment), ignore_errors=True)
+                removed += 1
+        return removed
+
+    def _scan_segment(
+        self, segment: int, endpoint_id: int, start: float, end: float
+    ) -> Iterator[Tuple[float, int, int, float]]:
+        """Yield (timestamp, status, status_code, latency) rows for one endpoint."""
+        segment_path = self._segment_path(segment)
+        with ExitStack() as stack:
+            views: Dict[str, Any] = {}
+            buffers: Dict[str, mmap.mmap] = {}
+            for name, (typecode, filename) in COLUMNS.items():
+                file_path = os.path.join(segment_path, filename)
+                if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+                    return
+                f = stack.enter_context(open(file_path, "rb"))
+                buffers[name] = stack.enter_context(
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                )
+                views[name] = memoryview(buffers[name]).cast(typecode)
+                stack.callback(views[name].release)
+
+            # A crash mid-append can leave columns of different lengths
+            rows = min(len(view) for view in views.values())
+            if sys.byteorder != "little":  # pragma: no cover
+                views = {
+                    name: _swapped(view, COLUMNS[name][0]) for name, view in views.items()
+                }
+
+            # Search the endpoint column in C rather than row by row
+            needle = array("I", [endpoint_id])
+            if sys.byteorder != "little":  # pragma: no cover
+                needle.byteswap()
+            key = needle.tobytes()
+            endpoint_buffer = buffers["endpoint"]
+            width = len(key)
+            limit = rows * width
+
+            timestamps = views["timestamp"]
+            statuses = views["status"]
+            status_codes = views["status_code"]
+            latencies = views["latency"]
+
+            position = endpoint_buffer.find(key, 0, limit)
+            while position != -1:
+                if position % width:
+                    position = endpoint_buffer.find(key, position + 1, limit)
+                    continue
+
+                row = position // width
+                timestamp = timestamps[row]
+                if start <= timestamp < end:
+                    yield timestamp, statuses[row], status_codes[row], latencies[row]
+                position = endpoint_buffer.find(key, position + width, limit)
+
+    def query(
+        self,
+        endpoint_name: str,
+        start: float,
+        end: float,
+        percentiles: Sequence[float] = (50.0, 95.0, 99.0),
+    ) -> Dict[str, Any]:
+        """
+        Compute availability and latency percentiles for an endpoint.
+
+        Args:
+            endpoint_name: The endpoint to report on
+            start: Start of the time range (unix timestamp, inclusive)
+            end: End of the time range (unix timestamp, exclusive)
+            percentiles: Latency percentiles to compute
+
+        Returns:
+            Dictionary with check counts, availability and latency percentiles
+        """
+        summary: Dict[str, Any] = {
+            "endpoint_name": endpoint_name,
+            "start": start,
+            "end": end,
+            "checks": 0,
+            "ok": 0,
+            "availability": None,
+            "latency": {},
+        }
+
+        endpoint_id = self.endpoint_id(endpoint_name)
+        if endpoint_id is None:
+            return summary
+
+        latencies = array("f")
+        ok = 0
+        for segment in self.segments(start, end):
+            for _, status, _, latency in self._scan_segment(
+                segment, endpoint_id, start, end
+            ):
+                latencies.append(latency)
+                if status == 0:
+                    ok += 1
+
+        checks = len(latencies)
+        summary["checks"] = checks
+        summary["ok"] = ok
+        if checks:
+            summary["availability"] = ok / checks
+            ordered = sorted(latencies)
+            summary["latency"] = {
+                f"p{p:g}": ordered[max(0, math.ceil(p / 100 * checks) - 1)]
+                for p in percentiles
+            }
+
+        return summary
+
+
+def _swapped(view: memoryview, typecode: str) -> array:  # pragma: no cover
+    column = array(typecode, view)
+    column.byteswap()
+    return column
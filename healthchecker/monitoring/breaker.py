@@ -0,0 +1,173 @@
+"""Per-host circuit breakers for health check requests."""
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from ..config.models import CircuitBreakerConfig
+from ..utils.clock import SYSTEM_CLOCK, Clock
+from .transport import TransportError
+
+logger = logging.getLogger(__name__)
+
+# Failures that say nothing answered, as opposed to an HTTP error response
+CONNECTION_ERRORS = (
+    aiohttp.ClientConnectionError,
+    TransportError,
+    OSError,
+    asyncio.TimeoutError,
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    """Raised instead of sending a request to a host that is known to be down."""
+
+    def __init__(self, host: str, message: str):
+        super().__init__(message)
+        self.host = host
+
+
+class CircuitBreaker:
+    """
+    Tracks whether one host is reachable.
+
+    The breaker opens after ``failure_threshold`` consecutive connection
+    failures; requests are then refused without touching the network. Once
+    ``probe_interval`` has passed, a single request is let through as a probe
+    (half-open). If it gets any HTTP response the breaker closes; otherwise it
+    opens again and the interval doubles, up to ``max_probe_interval``.
+    """
+
+    __slots__ = (
+        "host",
+        "config",
+        "clock",
+        "state",
+        "failures",
+        "interval",
+        "opened_at",
+        "next_probe",
+        "rejected",
+        "last_error",
+    )
+
+    def __init__(self, host: str, config: CircuitBreakerConfig, clock: Clock):
+        self.host = host
+        self.config = config
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.interval = config.probe_interval
+        self.opened_at = 0.0
+        self.next_probe = 0.0
+        self.rejected = 0
+        self.last_error = ""
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent now."""
+        if self.state == CLOSED:
+            return True
+
+        now = self.clock.monotonic()
+        if now < self.next_probe:
+            self.rejected += 1
+            return False
+
+        # Let one probe through; if it never reports back, another one may go
+        # after the same interval
+        self.state = HALF_OPEN
+        self.next_probe = now + self.interval
+        return True
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            outage = self.clock.monotonic() - self.opened_at
+            logger.info(
+                f"Circuit for {self.host} closed after {outage:.0f}s, "
+                f"{self.rejected} requests refused"
+            )
+            self.state = CLOSED
+            self.interval = self.config.probe_interval
+            self.rejected = 0
+        self.failures = 0
+
+    def record_failure(self, error: BaseException) -> None:
+        self.failures += 1
+        self.last_error = str(error) or error.__class__.__name__
+        now = self.clock.monotonic()
+
+        if self.state == HALF_OPEN:
+            self.interval = min(self.interval * 2, self.config.max_probe_interval)
+            self.state = OPEN
+            self.next_probe = now + self.interval
+        elif self.state == CLOSED and self.failures >= self.config.failure_threshold:
+            logger.warning(
+                f"Circuit for {self.host} opened after {self.failures} consecutive "
+                f"connection failures: {self.last_error}"
+            )
+            self.state = OPEN
+            self.opened_at = now
+            self.next_probe = now + self.interval
+
+    def describe(self) -> str:
+        wait = max(0.0, self.next_probe - self.clock.monotonic())
+        return (
+            f"Circuit open for {self.host} after {self.failures} consecutive "
+            f"connection failures ({self.last_error}), next probe in {wait:.0f}s"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "probe_interval": self.interval,
+            "last_error": self.last_error,
+        }
+
+
+class HostBreakers:
+    """
+    The circuit breakers of every host, shared by all endpoints on a host.
+
+    Args:
+        config: Circuit breaker settings
+        clock: Clock used to schedule probes
+    """
+
+    def __init__(self, config: CircuitBreakerConfig, clock: Clock = SYSTEM_CLOCK):
+        self.config = config
+        self.clock = clock
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def for_url(self, url: str) -> Optional[CircuitBreaker]:
+        """Return the breaker of a URL's host (and port)."""
+        parts = urlsplit(url)
+        if not parts.hostname:
+            return None
+        host = parts.hostname
+        if parts.port:
+            host = f"{host}:{parts.port}"
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = self.breakers[host] = CircuitBreaker(
+                host, self.config, self.clock
+            )
+        return breaker
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the breakers that are not closed."""
+        return {
+            "hosts": len(self.breakers),
+            "open": {
+                host: breaker.stats()
+                for host, breaker in self.breakers.items()
+                if breaker.state != CLOSED
+            },
+        }
@@ -1,12 +1,35 @@
 import asyncio
 import logging
 import time
-from typing import Dict, Optional
-import aiohttp
+from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
 
+from ..config.dependencies import DependencyGraph
 from ..config.models import AppConfig
+from .breaker import CircuitBreaker, HostBreakers
+from .concurrency import AdaptiveLimiter, CheckShed
 from .endpoint import EndpointChecker, CheckResult, HealthStatus
+from .offload import ValidationPool
+from .sharding import (
+    LeaseCoordinator,
+    assign,
+    describe,
+    shard_keys,
+    static_members,
+)
+from .runtime import EndpointRuntime
+from .rollup import GroupIndex
+from .slo import SLOEngine
+from .state import EndpointState, StateTracker
+from .transport import TRANSPORTS, Transport
+from .status import StatusStore
 from ..alerting.manager import AlertManager
+from ..sinks.manager import SinkManager
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..api.server import StatusAPI
+    from ..history.recorder import HistoryRecorder
+    from .profiling import Profiler
+    from .trace import TraceWriter
 
 logger = logging.getLogger(__name__)
 
@@ -18,10 +41,45 @@ class MonitoringManager:
         self.config = config
         self.alert_manager = alert_manager
         self.checkers: Dict[str, EndpointChecker] = {}
-        self.session: Optional[aiohttp.ClientSession] = None
+        # One shared transport per kind of HTTP client the endpoints use
+        self.transports: Dict[str, Transport] = {}
         self.running = False
         self.check_results: Dict[str, CheckResult] = {}
-        self.semaphore = asyncio.Semaphore(config.concurrency_limit)
+        self.status = StatusStore(max_changes=config.status_api.max_changes)
+        self.limiter = AdaptiveLimiter(config.concurrency, config.concurrency_limit)
+        self.breakers: Optional[HostBreakers] = None
+        if config.circuit_breaker.enabled:
+            self.breakers = HostBreakers(config.circuit_breaker)
+        self.validation_pool = ValidationPool(config.body_offload)
+        self.dependencies = DependencyGraph(
+            {e.name or "unknown": e.depends_on for e in config.endpoints}
+        )
+        self.first_results: Dict[str, asyncio.Event] = {}
+        self.tasks: Dict[str, asyncio.Task] = {}
+        # Monotonic start times of the checks currently running
+        self.in_flight: Dict[str, float] = {}
+        self.states: Dict[str, StateTracker] = {}
+        # Endpoint reporting each virtual component endpoint
+        self.component_owners: Dict[str, str] = {}
+        # Endpoint configuration frozen into compact runtime records
+        self.runtimes: Dict[str, EndpointRuntime] = {
+            e.name or "unknown": EndpointRuntime(e) for e in config.endpoints
+        }
+        self.shard_keys = shard_keys(self.dependencies)
+        self.lease: Optional[LeaseCoordinator] = None
+        if config.sharding.lease_path:
+            self.lease = LeaseCoordinator(config.sharding)
+        self.status_api: Optional["StatusAPI"] = None
+        self.profiler: Optional["Profiler"] = None
+        self.trace: Optional["TraceWriter"] = None
+        self.sinks = SinkManager(config.sinks)
+        self.history: Optional["HistoryRecorder"] = None
+        self.slo_engine: Optional[SLOEngine] = None
+        if any(endpoint.slo for endpoint in config.endpoints):
+            self.slo_engine = SLOEngine(config.endpoints, config.slo_resolution)
+        self.groups: Optional[GroupIndex] = None
+        if any(endpoint.labels for endpoint in config.endpoints):
+            self.groups = GroupIndex(config.endpoints, config.group_alerts)
 
     async def start(self):
         """Start the monitoring system."""
@@ -32,15 +90,48 @@ class MonitoringManager:
         logger.info("Starting health check monitoring system")
         self.running = True
 
-        # Create HTTP session
-        timeout = aiohttp.ClientTimeout(total=60)  # Default max timeout
-        self.session = aiohttp.ClientSession(timeout=timeout)
+        # Create the HTTP transports
+        self.transports = self._create_transports()
+
+        # Allow on-demand profiling if enabled
+        if self.config.profiling.enabled:
+            from .profiling import Profiler
+
+            self.profiler = Profiler(self.config.profiling, self)
+            self.profiler.install_signal_handler()
 
-        # Create checkers for all endpoints
-        for endpoint_config in self.config.endpoints:
-            self.checkers[endpoint_config.name] = EndpointChecker(
-                config=endpoint_config, session=self.session
+        # Start the status API if enabled
+        if self.config.status_api.enabled:
+            from ..api.server import StatusAPI
+
+            self.status_api = StatusAPI(
+                self.config.status_api,
+                self.status,
+                profiler=self.profiler,
+                metrics=self.metrics,
+                groups=self.groups,
             )
+            await self.status_api.start()
+
+        # Record response traces for simulation if enabled
+        if self.config.record_path:
+            from .trace import TraceWriter
+
+            self.trace = TraceWriter(self.config.record_path)
+            logger.info(f"Recording response traces to {self.config.record_path}")
+
+        # Start background alert delivery
+        await self.alert_manager.start()
+
+        # Start streaming results to sinks
+        await self.sinks.start()
+
+        # Record check history if enabled
+        if self.config.history.enabled:
+            from ..history.recorder import HistoryRecorder
+
+            self.history = HistoryRecorder(self.config.history)
+            await self.history.start()
 
         # Start the monitoring tasks
         try:
@@ -48,6 +139,77 @@ class MonitoringManager:
         finally:
             await self.stop()
 
+    async def run_once(self, deadline: Optional[float] = None) -> List[CheckResult]:
+        """
+        Check every endpoint exactly once, as concurrently as the limit allows.
+
+        Args:
+            deadline: Seconds after which unfinished checks are reported as failed
+
+        Returns:
+            One result per endpoint, in dependency order, each followed by the
+            results of its components
+        """
+        # Lease-based sharding needs a running monitor; check everything instead
+        owned = set(self.shard_keys) if self.lease else self._owned_endpoints()
+        names = [name for name in self.dependencies.order if name in owned]
+
+        async def run(checker: EndpointChecker) -> List[CheckResult]:
+            # Every endpoint must be checked, so nothing is shed
+            async with self.limiter.slot(checker.config.priority, can_shed=False):
+                result = await checker.check()
+            return [result, *checker.component_results(result)]
+
+        transports = self._create_transports()
+        try:
+            tasks = {
+                name: asyncio.create_task(
+                    run(
+                        EndpointChecker(
+                            config=self.runtimes[name],
+                            session=transports[self.runtimes[name].transport],
+                            pool=self.validation_pool,
+                            breaker=self._breaker(name),
+                        )
+                    )
+                )
+                for name in names
+            }
+            if not tasks:
+                return []
+
+            _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            for transport in transports.values():
+                await transport.close()
+        self.validation_pool.shutdown()
+
+        results = []
+        for name, task in tasks.items():
+            if task in pending or task.exception() is not None:
+                reason = (
+                    f"Check did not finish within the {deadline}s deadline"
+                    if task in pending
+                    else f"Error performing health check: {task.exception()}"
+                )
+                results.append(
+                    CheckResult(
+                        endpoint_name=name,
+                        url=self.runtimes[name].url,
+                        status=HealthStatus.CRITICAL,
+                        response_time=deadline or 0.0,
+                        message=reason,
+                        details={"error": "deadline" if task in pending else "error"},
+                    )
+                )
+            else:
+                results.extend(task.result())
+
+        return results
+
     async def stop(self):
         """Stop the monitoring system."""
         if not self.running:
@@ -56,18 +218,174 @@ class MonitoringManager:
         logger.info("Stopping health check monitoring system")
         self.running = False
 
-        # Close HTTP session
-        if self.session:
-            await self.session.close()
-            self.session = None
+        # Stop endpoint checks and hand our endpoints to other instances
+        for name in list(self.tasks):
+            self._stop_endpoint(name)
+        if self.lease:
+            try:
+                await asyncio.to_thread(self.lease.release)
+            except Exception as e:
+                logger.error(f"Error releasing shard lease: {str(e)}")
+
+        # Stop the status API
+        if self.status_api:
+            await self.status_api.stop()
+            self.status_api = None
+
+        if self.profiler:
+            self.profiler.remove_signal_handler()
+            self.profiler = None
+
+        # Flush result sinks
+        await self.sinks.stop()
+
+        await self.alert_manager.stop()
+
+        # Flush check history
+        if self.history:
+            await self.history.stop()
+            self.history = None
+
+        self.validation_pool.shutdown()
+
+        if self.trace:
+            self.trace.close()
+            self.trace = None
+
+        # Close HTTP transports
+        for transport in self.transports.values():
+            await transport.close()
+        self.transports = {}
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return internal metrics of the running monitor."""
+        return {
+            "endpoints": len(self.tasks),
+            "concurrency": self.limiter.stats(),
+            "body_validation": self.validation_pool.stats(),
+            "validation_memo": {
+                name: checker.memo_stats() for name, checker in self.checkers.items()
+            },
+            "sinks": self.sinks.stats(),
+            "transports": {
+                kind: transport.stats() for kind, transport in self.transports.items()
+            },
+            "circuit_breakers": self.breakers.stats() if self.breakers else None,
+            "alerts": self.alert_manager.stats(),
+        }
+
+    def _create_transports(self) -> Dict[str, Transport]:
+        """Create a transport for every kind the endpoints use."""
+        kinds = {runtime.transport for runtime in self.runtimes.values()}
+        return {kind: TRANSPORTS[kind]() for kind in kinds}
+
+    def _breaker(self, name: str) -> Optional[CircuitBreaker]:
+        """Return the circuit breaker of an endpoint's host, if breakers are on."""
+        if self.breakers is None:
+            return None
+        return self.breakers.for_url(self.runtimes[name].url)
+
+    def _start_endpoint(self, name: str):
+        """Create the checker and monitoring task for an endpoint."""
+        session: Any = self.transports[self.runtimes[name].transport]
+        if self.trace:
+            from .trace import RecordingSession
+
+            session = RecordingSession(session)
+        checker = EndpointChecker(
+            config=self.runtimes[name],
+            session=session,
+            pool=self.validation_pool,
+            breaker=self._breaker(name),
+        )
+        self.checkers[name] = checker
+        self.first_results[name] = asyncio.Event()
+        if self.config.state.change_only:
+            self.states[name] = StateTracker(self.config.state)
+        self.tasks[name] = asyncio.create_task(self._monitor_endpoint(name, checker))
+
+    def _stop_endpoint(self, name: str):
+        """Cancel monitoring of an endpoint that this instance no longer owns."""
+        task = self.tasks.pop(name, None)
+        if task:
+            task.cancel()
+        checker = self.checkers.pop(name, None)
+        if checker is not None and checker.components is not None:
+            for component in checker.components.names.values():
+                self.component_owners.pop(component, None)
+                self.states.pop(component, None)
+                self.check_results.pop(component, None)
+        self.first_results.pop(name, None)
+        self.states.pop(name, None)
+        self.check_results.pop(name, None)
+        if self.groups:
+            self.groups.remove(name)
+
+    def _owned_endpoints(self, members: Optional[List[str]] = None) -> Set[str]:
+        """Return the endpoints this instance is responsible for."""
+        sharding = self.config.sharding
+        if self.lease:
+            return assign(self.shard_keys, members or [], self.lease.instance_id)
+        if sharding.shard_index is not None:
+            return assign(
+                self.shard_keys,
+                static_members(sharding.shard_count),
+                static_members(sharding.shard_count)[sharding.shard_index],
+            )
+        return set(self.shard_keys)
+
+    def _rebalance(self, owned: Set[str]):
+        """Start and stop endpoint tasks to match the owned set."""
+        removed = set(self.tasks) - owned
+        added = owned - set(self.tasks)
+
+        for name in removed:
+            self._stop_endpoint(name)
+
+        # Parents before their dependents
+        for name in self.dependencies.order:
+            if name in added:
+                self._start_endpoint(name)
+
+        if added or removed:
+            logger.info(
+                f"Now monitoring {len(self.tasks)} of {len(self.shard_keys)} endpoints"
+                + (f", added: {describe(added)}" if added else "")
+                + (f", removed: {describe(removed)}" if removed else "")
+            )
+
+    async def _maintain_lease(self, lease: LeaseCoordinator, members: List[str]):
+        """Renew the shard lease and rebalance when membership changes."""
+        while self.running:
+            await asyncio.sleep(lease.ttl / 3)
+            try:
+                current = await asyncio.to_thread(lease.heartbeat)
+                if current != members:
+                    logger.info(f"Shard members changed: {', '.join(current)}")
+                    members = current
+                    self._rebalance(self._owned_endpoints(members))
+            except Exception as e:
+                logger.error(f"Error renewing shard lease: {str(e)}")
 
     async def _monitor_all_endpoints(self):
         """Start monitoring tasks for all endpoints."""
-        tasks = []
+        members: List[str] = []
+        if self.lease:
+            members = await asyncio.to_thread(self.lease.heartbeat)
+        self._rebalance(self._owned_endpoints(members))
+
+        tasks = list(self.tasks.values())
+
+        if self.lease:
+            tasks.append(
+                asyncio.create_task(self._maintain_lease(self.lease, members))
+            )
+
+        if self.slo_engine:
+            tasks.append(asyncio.create_task(self._evaluate_slos(self.slo_engine)))
 
-        for name, checker in self.checkers.items():
-            task = asyncio.create_task(self._monitor_endpoint(name, checker))
-            tasks.append(task)
+        if self.config.concurrency.adaptive:
+            tasks.append(asyncio.create_task(self.limiter.run()))
 
         # Run all monitoring tasks
         await asyncio.gather(*tasks, return_exceptions=True)
@@ -75,38 +393,188 @@ class MonitoringManager:
     async def _monitor_endpoint(self, name: str, checker: EndpointChecker):
         """Continuously monitor a single endpoint."""
         logger.info(f"Starting monitoring for endpoint: {name}")
+        await self._wait_for_parents(name, checker)
 
         while self.running:
             start_time = time.time()
+            interval = checker.config.interval
 
             try:
-                # Use semaphore to limit concurrent requests
-                async with self.semaphore:
-                    result = await checker.check()
+                # Skip or slow down checks while an upstream endpoint is down
+                down_parent = self._down_ancestor(name)
+                if down_parent:
+                    if checker.config.parent_down_interval is None:
+                        logger.debug(
+                            f"Skipping health check for {name}, "
+                            f"dependency {down_parent} is down"
+                        )
+                        await asyncio.sleep(interval)
+                        continue
+                    interval = max(interval, checker.config.parent_down_interval)
 
-                # Store the result
-                self.check_results[name] = result
+                # Limit concurrent requests
+                async with self.limiter.slot(checker.config.priority):
+                    self.in_flight[name] = time.monotonic()
+                    try:
+                        result = await checker.check()
+                    finally:
+                        self.in_flight.pop(name, None)
+                if result.status_code is not None:
+                    # Timeouts and connection failures are not a sign of overload
+                    self.limiter.record(name, result.response_time)
+                if self.trace:
+                    self.trace.record(result, checker.session.take_body(), time.time())
 
-                # Log the result
-                if result.status == HealthStatus.OK:
-                    logger.info(
-                        f"Health check for {name} succeeded: {result.response_time:.2f}s"
-                    )
-                else:
-                    logger.warning(f"Health check for {name} failed: {result.message}")
+                await self._process_result(name, result)
 
-                # Send alert if needed
-                if result.status != HealthStatus.OK and result.details.get(
-                    "alert_required", False
-                ):
-                    await self.alert_manager.send_alert(result)
+                # Virtual endpoints derived from the same response
+                for component in checker.component_results(result):
+                    self.component_owners[component.endpoint_name] = name
+                    await self._process_result(component.endpoint_name, component)
+
+            except CheckShed as e:
+                logger.debug(f"Check for {name} shed, retrying next interval: {e}")
 
             except Exception as e:
                 logger.error(f"Error monitoring endpoint {name}: {str(e)}")
 
             # Calculate time to wait until next check
             elapsed = time.time() - start_time
-            wait_time = max(0.1, checker.config.interval - elapsed)
+            wait_time = max(0.1, interval - elapsed)
 
             # Wait until next check
             await asyncio.sleep(wait_time)
+
+    async def _process_result(self, name: str, result: CheckResult):
+        """Store, record and report the result of a check."""
+        self.check_results[name] = result
+        if name in self.first_results:
+            self.first_results[name].set()
+        self.status.update(result)
+        if self.history:
+            self.history.record(result)
+        if self.slo_engine:
+            self.slo_engine.record(result)
+        if self.groups:
+            for alert in self.groups.update(result):
+                logger.warning(
+                    f"Group alert for {alert.endpoint_name}: {alert.message}"
+                )
+                await self.alert_manager.send_alert(alert)
+
+        tracker = self.states.get(name)
+        if tracker is None and self.config.state.change_only:
+            # Components only become known once they are reported
+            tracker = self.states[name] = StateTracker(self.config.state)
+        if tracker is not None:
+            await self._handle_transitions(name, result, tracker)
+        else:
+            await self._handle_result(name, result)
+
+    async def _handle_result(self, name: str, result: CheckResult):
+        """Log, stream and alert on every check result."""
+        self.sinks.publish(result)
+
+        # Log the result
+        if result.status == HealthStatus.OK:
+            logger.info(
+                f"Health check for {name} succeeded: {result.response_time:.2f}s"
+            )
+        else:
+            logger.warning(f"Health check for {name} failed: {result.message}")
+
+        # Send alert if needed
+        if result.status != HealthStatus.OK and result.details.get(
+            "alert_required", False
+        ):
+            await self._send_alert(name, result)
+
+    async def _handle_transitions(
+        self, name: str, result: CheckResult, tracker: StateTracker
+    ):
+        """Log, stream and alert only when the endpoint's state changes."""
+        transition = tracker.observe(result)
+        if transition:
+            result.details["state"] = transition.current.value
+            if transition.previous:
+                result.details["previous_state"] = transition.previous.value
+            if transition.summary:
+                result.details["state_summary"] = transition.summary
+            self.sinks.publish(result)
+
+            if transition.current == EndpointState.UP:
+                logger.info(transition.describe())
+            else:
+                logger.warning(f"{transition.describe()}: {result.message}")
+
+            # Tell the same people when an alerted outage is over
+            if transition.current == EndpointState.UP and tracker.alerted:
+                tracker.alerted = False
+                await self.alert_manager.send_recovery(result)
+
+        # Alert at most once per outage
+        if (
+            tracker.state == EndpointState.DOWN
+            and not tracker.alerted
+            and result.details.get("alert_required", False)
+        ):
+            tracker.alerted = await self._send_alert(name, result)
+
+    async def _send_alert(self, name: str, result: CheckResult) -> bool:
+        """
+        Send an alert unless an upstream endpoint is down.
+
+        Returns:
+            Whether the alert was sent; False if it was suppressed by a failing
+            dependency, held back by rate limiting or not delivered
+        """
+        down_parent = self._down_ancestor(name)
+        if down_parent:
+            result.details["suppressed_by"] = down_parent
+            logger.info(f"Alert for {name} suppressed, dependency {down_parent} is down")
+            return False
+
+        return await self.alert_manager.send_alert(result)
+
+    def _down_ancestor(self, name: str) -> Optional[str]:
+        """Return the nearest upstream endpoint that is currently failing."""
+        # Components share the dependencies of the endpoint reporting them
+        name = self.component_owners.get(name, name)
+        for ancestor in self.dependencies.ancestors.get(name, []):
+            result = self.check_results.get(ancestor)
+            if result is not None and result.status != HealthStatus.OK:
+                return ancestor
+        return None
+
+    async def _wait_for_parents(self, name: str, checker: EndpointChecker):
+        """Let parents report a first result before checking their dependents."""
+        parents = self.dependencies.parents.get(name, [])
+        events = [self.first_results[p] for p in parents if p in self.first_results]
+        if not events:
+            return
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(event.wait() for event in events)),
+                timeout=checker.config.interval,
+            )
+        except asyncio.TimeoutError:
+            logger.debug(f"Dependencies of {name} have not reported yet")
+
+    async def _evaluate_slos(self, engine: SLOEngine):
+        """Periodically evaluate SLO burn rates for all endpoints."""
+        logger.info(f"Starting SLO evaluation for {len(engine.endpoints)} endpoints")
+
+        while self.running:
+            try:
+                for alert in engine.evaluate():
+                    if self._down_ancestor(alert.endpoint_name):
+                        continue
+                    logger.warning(
+                        f"SLO burn rate alert for {alert.endpoint_name}: {alert.message}"
+                    )
+                    await self.alert_manager.send_alert(alert)
+            except Exception as e:
+                logger.error(f"Error evaluating SLOs: {str(e)}")
+
+            await asyncio.sleep(engine.resolution)
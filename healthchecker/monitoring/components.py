@@ -0,0 +1,118 @@
+"""Virtual endpoints derived from the components of an aggregate status document."""
+from typing import Any, Deque, Dict, List, Optional
+
+from ..utils.clock import Clock
+from .endpoint import CheckResult, HealthStatus, record_failure
+from .runtime import EndpointRuntime
+
+
+class ComponentTracker:
+    """
+    The virtual endpoints of one endpoint's components.
+
+    Each component selected from the endpoint's response becomes an endpoint
+    named ``<endpoint>/<component>``, with a result of its own for every check
+    and its own failure window, using the endpoint's ``failure_threshold`` and
+    ``failure_window``. A component that stops being reported fails until it
+    comes back.
+
+    Args:
+        config: The runtime configuration of the aggregate endpoint
+        clock: Clock used for failure windows
+    """
+
+    __slots__ = ("config", "clock", "names", "failures")
+
+    def __init__(self, config: EndpointRuntime, clock: Clock):
+        self.config = config
+        self.clock = clock
+        # Virtual endpoint names of the components seen so far, by component
+        self.names: Dict[str, str] = {}
+        self.failures: Dict[str, Optional[Deque[float]]] = {}
+
+    def results(
+        self, parent: CheckResult, outcomes: Dict[str, Dict[str, bool]]
+    ) -> List[CheckResult]:
+        """
+        Build the results of the components for one check of the endpoint.
+
+        Args:
+            parent: The endpoint's result, whose timing the components share
+            outcomes: The check results of each reported component
+
+        Returns:
+            One result per component reported now or before
+        """
+        now = self.clock.monotonic()
+        results = []
+
+        for component, checks in outcomes.items():
+            name = self.names.get(component)
+            if name is None:
+                name = self.names[component] = f"{self.config.name}/{component}"
+            details = {
+                "component": component,
+                "endpoint": self.config.name,
+                "json_checks": checks,
+            }
+            failed = [path for path, valid in checks.items() if not valid]
+            if not failed:
+                results.append(
+                    self._result(
+                        parent, name, HealthStatus.OK, "Health check passed", details
+                    )
+                )
+                continue
+
+            result = self._result(
+                parent,
+                name,
+                HealthStatus.CRITICAL,
+                f"Component check failed: {', '.join(failed)}",
+                details,
+            )
+            results.append(self._fail(component, result, now))
+
+        for component, name in self.names.items():
+            if component in outcomes:
+                continue
+            result = self._result(
+                parent,
+                name,
+                HealthStatus.CRITICAL,
+                f"Component no longer reported by {self.config.name}",
+                {
+                    "component": component,
+                    "endpoint": self.config.name,
+                    "error": "component_missing",
+                },
+            )
+            results.append(self._fail(component, result, now))
+
+        return results
+
+    def _result(
+        self,
+        parent: CheckResult,
+        name: str,
+        status: HealthStatus,
+        message: str,
+        details: Dict[str, Any],
+    ) -> CheckResult:
+        result = CheckResult(
+            endpoint_name=name,
+            url=parent.url,
+            status=status,
+            response_time=parent.response_time,
+            status_code=parent.status_code,
+            message=message,
+            details=details,
+        )
+        result.timestamp = parent.timestamp
+        return result
+
+    def _fail(self, component: str, result: CheckResult, now: float) -> CheckResult:
+        self.failures[component] = record_failure(
+            self.failures.get(component), result, now, self.config
+        )
+        return result
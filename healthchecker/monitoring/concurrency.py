@@ -0,0 +1,291 @@
+"""Adaptive limit on the number of concurrent health checks."""
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from ..config.models import ConcurrencyConfig
+from .latency import LatencySketch
+
+logger = logging.getLogger(__name__)
+
+# How quickly an endpoint's latency baseline follows slower responses
+BASELINE_DRIFT = 0.01
+
+# Period over which queue latency percentiles are reported
+QUEUE_LATENCY_WINDOW = 300.0  # seconds
+
+
+def _median(values: List[float]) -> float:
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
+
+
+class CheckShed(Exception):
+    """Raised when a queued check is dropped because the monitor is overloaded."""
+
+
+class _Waiter:
+    __slots__ = ("future", "priority", "enqueued", "timer")
+
+    def __init__(self, future: asyncio.Future, priority: int, enqueued: float):
+        self.future = future
+        self.priority = priority
+        self.enqueued = enqueued
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class _PriorityClass:
+    """Queue and statistics of one priority class."""
+
+    __slots__ = ("weight", "queue", "finish", "dispatched", "shed", "wait")
+
+    def __init__(self, weight: int):
+        self.weight = weight
+        self.queue: Deque[_Waiter] = deque()
+        # Virtual time at which the class is next due (stride scheduling)
+        self.finish = 0.0
+        self.dispatched = 0
+        self.shed = 0
+        self.wait = LatencySketch(QUEUE_LATENCY_WINDOW)
+
+    def stats(self, now: float) -> Dict[str, Any]:
+        self.wait.advance(now)
+        return {
+            "weight": self.weight,
+            "waiting": len(self.queue),
+            "dispatched": self.dispatched,
+            "shed": self.shed,
+            "queue_p50": self.wait.quantile(0.5),
+            "queue_p95": self.wait.quantile(0.95),
+            "queue_max": self.wait.quantile(1.0),
+        }
+
+
+class AdaptiveLimiter:
+    """
+    A resizable semaphore for health checks.
+
+    With ``adaptive`` enabled the limit follows an AIMD policy: every
+    ``sample_interval`` it is cut by ``decrease_factor`` if the event loop lagged
+    by more than ``max_loop_lag`` or check latencies inflated past
+    ``latency_tolerance`` times their baseline, and otherwise grows by
+    ``increase`` if checks had to queue. The limit always stays between
+    ``min_limit`` and ``max_limit``.
+
+    Each endpoint's baseline is the lowest latency it has shown, drifting slowly
+    upwards so that a permanent change in an endpoint is eventually accepted.
+    Inflation is the median ratio of latency to baseline over the interval, so a
+    few timeouts or slow endpoints cannot shrink the limit on their own.
+
+    Checks that have to wait are queued by priority class and dispatched by
+    weighted fair queueing: while several classes are waiting, each receives
+    slots in proportion to its weight in ``priority_weights``, so important
+    checks go first without starving the rest. With ``shed_after`` set, a check
+    below priority 0 that has waited that long is dropped with ``CheckShed``;
+    the lowest classes get the smallest share and so are shed first.
+
+    Args:
+        config: Adaptive concurrency settings
+        max_limit: The configured ``concurrency_limit``
+    """
+
+    def __init__(self, config: ConcurrencyConfig, max_limit: int):
+        self.config = config
+        self.min_limit = min(config.min_limit, max_limit)
+        self.max_limit = max_limit
+        self.limit = max_limit
+        self.in_flight = 0
+        self.loop_lag = 0.0
+        self.latency_inflation = 1.0
+        self.classes: List[_PriorityClass] = [
+            _PriorityClass(weight) for weight in config.priority_weights
+        ]
+        self._waiting = 0
+        self._virtual_time = 0.0
+        self._baselines: Dict[str, float] = {}
+        self._ratios: List[float] = []
+        self._saturated = False
+
+    async def acquire(self, priority: int = 0, can_shed: bool = True) -> None:
+        """
+        Wait for a slot.
+
+        Args:
+            priority: Priority class of the check; classes past the last weight
+                share the last class
+            can_shed: Whether the check may be shed while it waits
+
+        Raises:
+            CheckShed: If the check waited longer than ``shed_after``
+        """
+        priority = min(priority, len(self.classes) - 1)
+        cls = self.classes[priority]
+        now = time.monotonic()
+        if self.in_flight < self.limit and not self._waiting:
+            self.in_flight += 1
+            cls.dispatched += 1
+            cls.wait.record(0.0, now)
+            return
+
+        self._saturated = True
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(loop.create_future(), priority, now)
+        if not cls.queue:
+            # An idle class rejoins at the current virtual time, without credit
+            # for the time it was idle
+            cls.finish = max(cls.finish, self._virtual_time)
+        cls.queue.append(waiter)
+        self._waiting += 1
+        if can_shed and priority > 0 and self.config.shed_after is not None:
+            waiter.timer = loop.call_later(self.config.shed_after, self._shed, waiter)
+
+        try:
+            # The slot is handed over by _wake, already counted as in flight
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release()
+            else:
+                self._remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _remove(self, waiter: _Waiter) -> bool:
+        if waiter.timer:
+            waiter.timer.cancel()
+        try:
+            self.classes[waiter.priority].queue.remove(waiter)
+        except ValueError:
+            return False
+        self._waiting -= 1
+        return True
+
+    def _shed(self, waiter: _Waiter) -> None:
+        if self._remove(waiter) and not waiter.future.done():
+            self.classes[waiter.priority].shed += 1
+            waiter.future.set_exception(
+                CheckShed(f"Check queued for over {self.config.shed_after:g}s")
+            )
+
+    def _wake(self) -> None:
+        now = time.monotonic()
+        while self._waiting and self.in_flight < self.limit:
+            # The waiting class that is due first; ties go to higher priority
+            cls = min(
+                (cls for cls in self.classes if cls.queue),
+                key=lambda cls: cls.finish,
+            )
+            waiter = cls.queue.popleft()
+            self._waiting -= 1
+            self._virtual_time = cls.finish
+            cls.finish += 1 / cls.weight
+            if waiter.timer:
+                waiter.timer.cancel()
+            if not waiter.future.done():
+                self.in_flight += 1
+                cls.dispatched += 1
+                cls.wait.record(now - waiter.enqueued, now)
+                waiter.future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(
+        self, priority: int = 0, can_shed: bool = True
+    ) -> AsyncIterator[None]:
+        """Hold a slot for the duration of a check."""
+        await self.acquire(priority, can_shed)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.release()
+
+    def record(self, name: str, latency: float) -> None:
+        """
+        Record a check's latency against the endpoint's baseline.
+
+        Only checks that got a response should be recorded: the time spent on a
+        timeout or a refused connection says nothing about our own load.
+        """
+        baseline = self._baselines.get(name)
+        if baseline is None or latency < baseline:
+            self._baselines[name] = latency
+            baseline = latency
+        else:
+            self._baselines[name] = baseline + (latency - baseline) * BASELINE_DRIFT
+
+        self._ratios.append(latency / max(baseline, 1e-3))
+
+    def adjust(self, loop_lag: float) -> int:
+        """
+        Resize the limit from the signals gathered since the last adjustment.
+
+        Args:
+            loop_lag: How late the event loop woke up the sampler, in seconds
+
+        Returns:
+            The new limit
+        """
+        self.loop_lag = loop_lag
+        self.latency_inflation = _median(self._ratios) if self._ratios else 1.0
+        saturated = self._saturated
+        self._ratios = []
+        self._saturated = False
+
+        previous = self.limit
+        if (
+            loop_lag > self.config.max_loop_lag
+            or self.latency_inflation > self.config.latency_tolerance
+        ):
+            self.limit = max(
+                self.min_limit, int(self.limit * self.config.decrease_factor)
+            )
+        elif saturated:
+            self.limit = min(self.max_limit, self.limit + self.config.increase)
+
+        if self.limit != previous:
+            logger.debug(
+                f"Concurrency limit {previous} -> {self.limit} "
+                f"(loop lag {loop_lag * 1000:.1f}ms, "
+                f"latency inflation {self.latency_inflation:.2f}x)"
+            )
+            self._wake()
+        return self.limit
+
+    async def run(self) -> None:
+        """Sample event loop lag and adjust the limit until cancelled."""
+        interval = self.config.sample_interval
+        logger.info(
+            f"Adaptive concurrency between {self.min_limit} and {self.max_limit}"
+        )
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(interval)
+            self.adjust(max(0.0, time.monotonic() - start - interval))
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "waiting": self._waiting,
+            "loop_lag": round(self.loop_lag, 6),
+            "latency_inflation": round(self.latency_inflation, 3),
+            "priorities": [cls.stats(now) for cls in self.classes],
+        }
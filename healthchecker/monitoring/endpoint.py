@@ -1,13 +1,22 @@
-from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, Optional, Deque
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Deque, Tuple, Union, TYPE_CHECKING
 import asyncio
 import aiohttp
-import json
 import logging
 from collections import deque
 from enum import Enum
 
 from ..config.models import EndpointConfig
+from ..utils.clock import SYSTEM_CLOCK, Clock
+from .breaker import CONNECTION_ERRORS, CircuitBreaker, CircuitOpen
+from .latency import LatencyTracker
+from .offload import ValidationPool, timed_call
+from .response_parser import body_digest, validate_body
+from .runtime import EndpointRuntime
+from .transport import TransportError
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .components import ComponentTracker
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +27,17 @@ class HealthStatus(Enum):
 
 
 class CheckResult:
+    __slots__ = (
+        "endpoint_name",
+        "url",
+        "status",
+        "response_time",
+        "status_code",
+        "message",
+        "details",
+        "timestamp",
+    )
+
     def __init__(
         self,
         endpoint_name: str,
@@ -41,7 +61,7 @@ class CheckResult:
         return {
             "endpoint_name": self.endpoint_name,
             "url": self.url,
-            "status": self.status,
+            "status": self.status.value,
             "response_time": self.response_time,
             "status_code": self.status_code,
             "message": self.message,
@@ -49,44 +69,172 @@ class CheckResult:
             "timestamp": self.timestamp.isoformat(),
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CheckResult":
+        """Rebuild a result from the output of ``to_dict``."""
+        result = cls(
+            endpoint_name=data["endpoint_name"],
+            url=data["url"],
+            status=HealthStatus(data["status"]),
+            response_time=data["response_time"],
+            status_code=data.get("status_code"),
+            message=data.get("message", ""),
+            details=data.get("details"),
+        )
+        if data.get("timestamp"):
+            result.timestamp = datetime.fromisoformat(data["timestamp"])
+        return result
+
+
+def record_failure(
+    history: Optional[Deque[float]],
+    result: CheckResult,
+    now: float,
+    config: EndpointRuntime,
+) -> Deque[float]:
+    """
+    Add a failure to a failure history, marking the result if it needs an alert.
+
+    Returns:
+        The history, created if there was none yet
+    """
+    if history is None:
+        history = deque(maxlen=100)
+    history.append(now)
+
+    # Drop failures that have left the window
+    relevant_window = now - config.failure_window
+    while history[0] < relevant_window:
+        history.popleft()
+
+    # Check if we need to trigger an alert based on failure threshold
+    if len(history) >= config.failure_threshold:
+        # Mark as needing an alert
+        result.details["alert_required"] = True
+        result.details["failure_count"] = len(history)
+        result.details["failure_window"] = f"{config.failure_window}s"
+    return history
+
 
 class EndpointChecker:
     """Handles health checking for a specific endpoint."""
 
-    def __init__(self, config: EndpointConfig, session: Any):
-        self.config = config
+    __slots__ = (
+        "config",
+        "session",
+        "failure_history",
+        "validation_time",
+        "validation_count",
+        "pool",
+        "latency",
+        "clock",
+        "breaker",
+        "components",
+        "outcomes",
+        "memo",
+        "memo_hits",
+        "memo_misses",
+        "not_modified",
+        "validators",
+        "last_status",
+        "_request_kwargs",
+        "_request_method",
+    )
+
+    def __init__(
+        self,
+        config: Union[EndpointConfig, EndpointRuntime],
+        session: Any,
+        pool: Optional[ValidationPool] = None,
+        clock: Clock = SYSTEM_CLOCK,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        if isinstance(config, EndpointConfig):
+            config = EndpointRuntime(config)
+        self.config: EndpointRuntime = config
         self.session = session
-        self.failure_history: Deque[datetime] = deque(
-            maxlen=100
-        )  # Store recent failures
-        self.last_alert_time: Optional[datetime] = None
+        # Monotonic times of recent failures, created on the first failure
+        self.failure_history: Optional[Deque[float]] = None
+        # CPU seconds spent parsing and validating response bodies
+        self.validation_time = 0.0
+        self.validation_count = 0
+        self.pool = pool
+        self.clock = clock
+        # Circuit breaker of the endpoint's host, shared with its other endpoints
+        self.breaker = breaker
+        # Streaming latency statistics, if the endpoint judges latency by them
+        self.latency: Optional[LatencyTracker] = (
+            LatencyTracker(config.latency) if config.latency else None
+        )
+        # Virtual endpoints derived from the response, and the latest check
+        # results of their components
+        self.components: Optional["ComponentTracker"] = None
+        if config.components:
+            from .components import ComponentTracker
+
+            self.components = ComponentTracker(config, clock)
+        self.outcomes: Optional[Dict[str, Dict[str, bool]]] = None
+        # Digest and outcome of the last validated body, reused while it repeats
+        self.memo: Optional[Tuple[str, bool, Dict[str, Any], Any]] = None
+        self.memo_hits = 0
+        self.memo_misses = 0
+        # Conditional request state: the previous response's ETag and
+        # Last-Modified, and its status code to stand in for a 304
+        self.not_modified = 0
+        self.validators: Optional[Tuple[Optional[str], Optional[str]]] = None
+        self.last_status: Optional[int] = None
+        self._request_kwargs = config.request_kwargs
+        self._request_method = getattr(session, config.method)
 
     async def check(self) -> CheckResult:
         """Perform a health check on the endpoint."""
-        start_time = asyncio.get_event_loop().time()
+        start_time = self.clock.monotonic()
+        self.outcomes = None
 
         try:
             response = await self._make_request()
-            response_time = asyncio.get_event_loop().time() - start_time
+            response_time = self.clock.monotonic() - start_time
 
-            # Check status code
-            status_code_valid = self._validate_status_code(response.status)
+            # A 304 stands for the previous response, which is judged again
+            status_code = response.status
+            not_modified = False
+            if self.config.conditional_requests:
+                not_modified = self._update_validators(response)
+                if not_modified:
+                    status_code = self.last_status
 
-            # Check response time
-            time_valid = response_time <= self.config.response_time_threshold
+            # Check status code
+            status_code_valid = self._validate_status_code(status_code)
+
+            # Check response time, against recent history if configured
+            time_reasons = None
+            latency_details = None
+            if self.latency is not None:
+                time_valid, time_reasons, latency_details = self.latency.observe(
+                    response_time, now=self.clock.monotonic()
+                )
+            else:
+                time_valid = response_time <= self.config.response_time_threshold
 
             # Parse and check response body if needed
-            body_valid, body_details = await self._validate_response_body(response)
+            body_valid, body_details = await self._validate_response_body(
+                response, not_modified
+            )
 
             if status_code_valid and time_valid and body_valid:
+                details = {"body_checks": body_details}
+                if latency_details is not None:
+                    details["latency"] = latency_details
+                if not_modified:
+                    details["not_modified"] = True
                 return CheckResult(
-                    endpoint_name=self.config.name or "unknown",
+                    endpoint_name=self.config.name,
                     url=self.config.url,
                     status=HealthStatus.OK,
                     response_time=response_time,
                     status_code=response.status,
                     message="Health check passed",
-                    details={"body_checks": body_details},
+                    details=details,
                 )
             else:
                 # Construct failure details
@@ -96,15 +244,19 @@ class EndpointChecker:
                     "body_valid": body_valid,
                     "body_details": body_details,
                 }
+                if latency_details is not None:
+                    details["latency"] = latency_details
+                if not_modified:
+                    details["not_modified"] = True
 
                 failure = CheckResult(
-                    endpoint_name=self.config.name or "unknown",
+                    endpoint_name=self.config.name,
                     url=self.config.url,
                     status=HealthStatus.CRITICAL,
                     response_time=response_time,
                     status_code=response.status,
                     message=self._get_failure_message(
-                        status_code_valid, time_valid, body_valid
+                        status_code_valid, time_valid, body_valid, time_reasons
                     ),
                     details=details,
                 )
@@ -112,10 +264,23 @@ class EndpointChecker:
                 self._record_failure(failure)
                 return failure
 
+        except CircuitOpen as e:
+            response_time = self.clock.monotonic() - start_time
+            failure = CheckResult(
+                endpoint_name=self.config.name,
+                url=self.config.url,
+                status=HealthStatus.CRITICAL,
+                response_time=response_time,
+                message=str(e),
+                details={"error": "circuit_open", "host": e.host},
+            )
+            self._record_failure(failure)
+            return failure
+
         except asyncio.TimeoutError:
-            response_time = asyncio.get_event_loop().time() - start_time
+            response_time = self.clock.monotonic() - start_time
             failure = CheckResult(
-                endpoint_name=self.config.name or "unknown",
+                endpoint_name=self.config.name,
                 url=self.config.url,
                 status=HealthStatus.CRITICAL,
                 response_time=response_time,
@@ -126,9 +291,9 @@ class EndpointChecker:
             return failure
 
         except Exception as e:
-            response_time = asyncio.get_event_loop().time() - start_time
+            response_time = self.clock.monotonic() - start_time
             failure = CheckResult(
-                endpoint_name=self.config.name or "unknown",
+                endpoint_name=self.config.name,
                 url=self.config.url,
                 status=HealthStatus.CRITICAL,
                 response_time=response_time,
@@ -140,40 +305,76 @@ class EndpointChecker:
 
     async def _make_request(self):
         """Make an HTTP request to the endpoint."""
-        method = self.config.method.lower()
-        url = self.config.url
-        headers = self.config.headers
-        body = self.config.body
-        timeout = aiohttp.ClientTimeout(total=self.config.timeout)
-
-        request_kwargs = {"headers": headers, "timeout": timeout}
-
-        # Add request body if specified
-        if body:
-            if isinstance(body, dict):
-                request_kwargs["json"] = body
-            else:
-                request_kwargs["data"] = body
-
-        # Get the appropriate request method from the session
-        request_method = getattr(self.session, method)
+        config = self.config
+        breaker = self.breaker
 
         # Execute the request with the retry policy
-        retry_config = self.config.retry
-        for attempt in range(retry_config.attempts):
+        for attempt in range(config.retry_attempts):
+            if breaker is not None and not breaker.allow():
+                raise CircuitOpen(breaker.host, breaker.describe())
             try:
-                return await request_method(url, **request_kwargs)
-            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                response = await self._request_method(
+                    config.url, **self._request_kwargs
+                )
+            except (aiohttp.ClientError, TransportError, asyncio.TimeoutError) as e:
+                if breaker is not None and isinstance(e, CONNECTION_ERRORS):
+                    breaker.record_failure(e)
+
                 # Last attempt, re-raise the exception
-                if attempt == retry_config.attempts - 1:
+                if attempt == config.retry_attempts - 1:
                     raise
 
                 # Calculate backoff delay
-                delay = retry_config.backoff_factor * (2**attempt)
+                delay = config.backoff_factor * (2**attempt)
                 logger.debug(
-                    f"Request to {url} failed, retrying in {delay:.2f}s: {str(e)}"
+                    f"Request to {config.url} failed, retrying in {delay:.2f}s: {str(e)}"
                 )
-                await asyncio.sleep(delay)
+                await self.clock.sleep(delay)
+            else:
+                # Any HTTP response shows the host is reachable
+                if breaker is not None:
+                    breaker.record_success()
+                return response
+
+    def _update_validators(self, response) -> bool:
+        """
+        Remember the validators of a response for the next conditional request.
+
+        Returns:
+            True if the response is a 304 to a conditional request, meaning
+            nothing changed since the previous response
+        """
+        if response.status == 304 and self.validators is not None:
+            self.not_modified += 1
+            return True
+
+        headers = getattr(response, "headers", None) or {}
+        validators = (headers.get("ETag"), headers.get("Last-Modified"))
+        self.last_status = response.status
+        if validators == self.validators:
+            return False
+
+        if validators == (None, None):
+            self.validators = None
+            self._request_kwargs = self.config.request_kwargs
+            return False
+
+        conditional_headers = dict(self.config.request_kwargs["headers"])
+        if validators[0] is not None:
+            conditional_headers["If-None-Match"] = validators[0]
+        if validators[1] is not None:
+            conditional_headers["If-Modified-Since"] = validators[1]
+        self.validators = validators
+        self._request_kwargs = {
+            **self.config.request_kwargs,
+            "headers": conditional_headers,
+        }
+        return False
+
+    def _forget_validators(self) -> None:
+        """Stop sending conditional headers until the next complete response."""
+        self.validators = None
+        self._request_kwargs = self.config.request_kwargs
 
     def _validate_status_code(self, status_code: int) -> bool:
         """Validate the HTTP status code against expected codes and ranges."""
@@ -182,84 +383,106 @@ class EndpointChecker:
             return True
 
         # Check status code ranges
-        for range_str in self.config.expected_status_ranges:
-            start, end = map(int, range_str.split("-"))
+        for start, end in self.config.expected_status_ranges:
             if start <= status_code <= end:
                 return True
 
         return False
 
-    async def _validate_response_body(self, response) -> tuple[bool, Dict[str, Any]]:
-        """Validate the response body against JSON path and regex checks."""
+    async def _validate_response_body(
+        self, response, not_modified: bool = False
+    ) -> tuple[bool, Dict[str, Any]]:
+        """
+        Validate the response body against JSON path and regex checks.
+
+        The outcome for the last body is kept with its digest, so a body that has
+        not changed since the previous check (or a 304 response) is not parsed
+        or checked again.
+        """
         details: Dict[str, Any] = {}
 
         # Skip body validation if no checks configured
-        if not self.config.json_path_checks and not self.config.regex_checks:
+        config = self.config
+        if not (config.json_path_checks or config.regex_checks or config.components):
             return True, details
 
+        memo = self.memo
+        if not_modified and memo is not None:
+            self.memo_hits += 1
+            self.outcomes = memo[3]
+            return memo[1], memo[2]
+
         try:
             # Read response body
             body_text = await response.text()
-
-            # Check JSON path expressions if configured
-            if self.config.json_path_checks:
-                json_check_results = {}
-                try:
-                    body_json = await response.json()
-                    # Import here to avoid circular imports
-                    from .response_parser import validate_json_paths
-
-                    json_check_results = validate_json_paths(
-                        body_json, self.config.json_path_checks
-                    )
-                    details["json_checks"] = json_check_results
-                    if not all(json_check_results.values()):
-                        return False, details
-                except (json.JSONDecodeError, ValueError):
-                    # JSON parsing failed
-                    details["json_parse_error"] = {
-                        "message": "Failed to parse response as JSON"
-                    }
-                    if self.config.json_path_checks:
-                        # If JSON checks are required but parsing failed
-                        return False, details
-
-            # Check regex patterns if configured
-            if self.config.regex_checks:
-                # Import here to avoid circular imports
-                from .response_parser import validate_regex_patterns
-
-                regex_check_results = validate_regex_patterns(
-                    body_text, self.config.regex_checks
-                )
-                details["regex_checks"] = regex_check_results
-                if not all(regex_check_results.values()):
-                    return False, details
-
-            return True, details
-
         except Exception as e:
             logger.error(f"Error validating response body: {str(e)}")
             details["error"] = {"message": f"Body validation error: {str(e)}"}
+            # Without a validated body there is nothing a 304 could stand for
+            self._forget_validators()
             return False, details
 
-    def _record_failure(self, result: CheckResult):
-        """Record a health check failure for alert threshold calculation."""
-        current_time = datetime.now(timezone.utc)
-        self.failure_history.append(current_time)
+        digest = body_digest(body_text)
+        if memo is not None and memo[0] == digest:
+            self.memo_hits += 1
+            self.outcomes = memo[3]
+            return memo[1], memo[2]
+        self.memo_misses += 1
+
+        # Parsing and validation are CPU-bound; large bodies go to the worker pool
+        args = (
+            body_text,
+            config.json_path_checks,
+            config.regex_checks,
+            config.components,
+        )
+        try:
+            if self.pool is not None and self.pool.should_offload(len(body_text)):
+                (valid, details), cpu_time = await self.pool.run(validate_body, *args)
+            else:
+                (valid, details), cpu_time = timed_call(validate_body, *args)
+        except Exception:
+            self._forget_validators()
+            raise
+
+        self.validation_time += cpu_time
+        self.validation_count += 1
+        # Component results become results of their own, not details of this one
+        self.outcomes = details.pop("components", None)
+        self.memo = (digest, valid, details, self.outcomes)
+        return valid, details
+
+    def memo_stats(self) -> Dict[str, int]:
+        """Return how often body validation was skipped for an unchanged body."""
+        return {
+            "hits": self.memo_hits,
+            "misses": self.memo_misses,
+            "not_modified": self.not_modified,
+        }
+
+    def component_results(self, result: CheckResult) -> List[CheckResult]:
+        """
+        Return the results of the endpoint's components for its latest check.
 
-        # Check if we need to trigger an alert based on failure threshold
-        relevant_window = current_time - timedelta(seconds=self.config.failure_window)
-        recent_failures = [t for t in self.failure_history if t >= relevant_window]
+        Nothing is returned if the endpoint has no components, or if the check
+        did not produce a document to derive them from.
+        """
+        if self.components is None or self.outcomes is None:
+            return []
+        return self.components.results(result, self.outcomes)
 
-        if len(recent_failures) >= self.config.failure_threshold:
-            # Mark as needing an alert
-            result.details["alert_required"] = True
-            result.details["failure_count"] = len(recent_failures)
-            result.details["failure_window"] = f"{self.config.failure_window}s"
+    def _record_failure(self, result: CheckResult):
+        """Record a health check failure for alert threshold calculation."""
+        self.failure_history = record_failure(
+            self.failure_history, result, self.clock.monotonic(), self.config
+        )
 
     def _get_failure_message(
-        self, status_code_valid: bool, time_valid: bool, body_valid: bool
+        self,
+        status_code_valid: bool,
+        time_valid: bool,
+        body_valid: bool,
+        time_reasons: Optional[List[str]] = None,
     ) -> str:
         """Generate a failure message based on the type of failure."""
         messages = []
@@ -267,7 +490,9 @@ class EndpointChecker:
         if not status_code_valid:
             messages.append("Unexpected status code")
 
-        if not time_valid:
+        if time_reasons:
+            messages.extend(time_reasons)
+        elif not time_valid:
             messages.append(
                 f"Response time exceeded threshold of {self.config.response_time_threshold}s"
             )
@@ -0,0 +1,255 @@
+"""Single-pass evaluation of common JSONPath expressions."""
+import logging
+import operator
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+import jsonpath_ng.ext as jsonpath
+from jsonpath_ng.ext.filter import Expression, Filter
+from jsonpath_ng.jsonpath import Child, Fields, Index, JSONPath, Root, Slice, This
+
+logger = logging.getLogger(__name__)
+
+# A step is a (kind, argument) pair; both parts are hashable so that paths with
+# a common prefix share nodes in a PathSet
+Step = Tuple[str, Any]
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "!=": operator.ne,
+    "==": operator.eq,
+    "=": operator.eq,
+    "<=": operator.le,
+    "<": operator.lt,
+    ">=": operator.ge,
+    ">": operator.gt,
+    "=~": lambda a, b: isinstance(a, str) and re.search(b, a) is not None,
+}
+
+_NOT_SET = object()
+_FAILED = object()
+
+
+@lru_cache(maxsize=1024)
+def parse(expression: str) -> JSONPath:
+    """Parse a JSONPath expression with jsonpath_ng, caching the result."""
+    return jsonpath.parse(expression)
+
+
+def _flatten(node: JSONPath) -> Optional[List[Any]]:
+    """Turn a jsonpath_ng tree into a list of steps, or None if unsupported."""
+    if isinstance(node, Child):
+        left = _flatten(node.left)
+        right = _flatten(node.right)
+        if left is None or right is None:
+            return None
+        return left + right
+    if isinstance(node, (Root, This)):
+        return [node]
+    if isinstance(node, Fields):
+        return [("fields", tuple(node.fields))]
+    if isinstance(node, Index):
+        return [("index", node.index)]
+    if isinstance(node, Slice):
+        return [("slice", (node.start, node.end, node.step))]
+    if isinstance(node, Filter):
+        expressions = []
+        for expression in node.expressions:
+            if not isinstance(expression, Expression):
+                return None
+            if expression.op is not None and expression.op not in OPERATORS:
+                return None
+            target = _compile(expression.target, This)
+            if target is None:
+                return None
+            expressions.append((target, expression.op, expression.value))
+        return [("filter", tuple(expressions))]
+    return None
+
+
+def _compile(node: JSONPath, start: type) -> Optional[Tuple[Step, ...]]:
+    steps = _flatten(node)
+    if steps and start is This and not isinstance(steps[0], (Root, This)):
+        # Filter targets may leave out the leading "@"
+        steps.insert(0, This())
+    if not steps or type(steps[0]) is not start:
+        return None
+    if any(isinstance(step, (Root, This)) for step in steps[1:]):
+        return None
+    return tuple(steps[1:])
+
+
+def compile_path(expression: str) -> Optional[Tuple[Step, ...]]:
+    """
+    Compile a JSONPath expression into steps the fast evaluator understands.
+
+    Supported are dotted and bracketed keys, wildcards, indices, slices and
+    filters comparing a relative path with a literal. Anything else, such as
+    recursive descent or the extension functions, returns None.
+
+    Raises:
+        Exception: Whatever jsonpath_ng raises for a malformed expression
+    """
+    return _compile(parse(expression), Root)
+
+
+def _expand(step: Step, value: Any) -> List[Any]:
+    """
+    Apply one step to a value.
+
+    Mirrors the jsonpath_ng node of the same kind, including how it treats values
+    of an unexpected type, so both evaluators agree on every document.
+    """
+    kind, argument = step
+
+    if kind == "fields":
+        if "*" in argument:
+            try:
+                argument = tuple(value.keys())
+            except AttributeError:
+                return []
+        matches = []
+        for field in argument:
+            try:
+                field_value = value.get(field, _NOT_SET)
+            except (TypeError, AttributeError):
+                continue
+            if field_value is not _NOT_SET:
+                matches.append(field_value)
+        return matches
+
+    if kind == "index":
+        if value and len(value) > argument:
+            return [value[argument]]
+        return []
+
+    if kind == "slice":
+        if not value:
+            return []
+        if isinstance(value, (dict, int, str)):
+            value = [value]
+        start, end, stride = argument
+        return [value[i] for i in range(len(value))[start:end:stride]]
+
+    if kind == "filter":
+        if isinstance(value, dict):
+            value = list(value.values())
+        if not isinstance(value, list):
+            return []
+        return [item for item in value if _matches_all(argument, item)]
+
+    raise ValueError(f"Unknown JSONPath step: {kind}")
+
+
+def _find_all(steps: Tuple[Step, ...], value: Any) -> List[Any]:
+    matches = [value]
+    for step in steps:
+        matches = [match for item in matches for match in _expand(step, item)]
+    return matches
+
+
+def _matches_all(expressions: Tuple[Any, ...], item: Any) -> bool:
+    for target, op, literal in expressions:
+        found = _find_all(target, item)
+        if not found:
+            return False
+        if op is None:
+            continue
+
+        for value in found:
+            # Same coercion as jsonpath_ng: compare numerically against integers
+            if isinstance(literal, int):
+                try:
+                    value = int(value)
+                except ValueError:
+                    continue
+            if OPERATORS[op](value, literal):
+                break
+        else:
+            return False
+    return True
+
+
+class _Node:
+    __slots__ = ("children", "paths", "subtree")
+
+    def __init__(self):
+        self.children: Dict[Step, "_Node"] = {}
+        self.paths: List[str] = []
+        self.subtree: FrozenSet[str] = frozenset()
+
+
+class PathSet:
+    """
+    A group of JSONPath expressions evaluated together.
+
+    Supported expressions are merged into a tree of steps, so a shared prefix is
+    only walked once, and the document is traversed a single time in
+    jsonpath_ng's match order. Every path stops at its first match, and the
+    traversal stops once all paths have matched. Expressions the fast evaluator
+    does not support are listed in ``fallback``.
+
+    Args:
+        expressions: The JSONPath expressions to evaluate
+    """
+
+    def __init__(self, expressions: Tuple[str, ...]):
+        self.fallback: FrozenSet[str] = frozenset()
+        self._root = _Node()
+
+        fallback = set()
+        for expression in expressions:
+            try:
+                steps = compile_path(expression)
+            except Exception:
+                steps = None
+            if steps is None:
+                fallback.add(expression)
+                continue
+
+            node = self._root
+            node.subtree |= {expression}
+            for step in steps:
+                node = node.children.setdefault(step, _Node())
+                node.subtree |= {expression}
+            node.paths.append(expression)
+        self.fallback = frozenset(fallback)
+
+    def find_first(self, data: Any) -> Dict[str, Any]:
+        """
+        Find the first match of every supported expression.
+
+        Returns:
+            The first matched value per expression; expressions without a match
+            are left out
+        """
+        found: Dict[str, Any] = {}
+        if self._root.subtree:
+            self._visit(self._root, data, found)
+        return {path: value for path, value in found.items() if value is not _FAILED}
+
+    def _visit(self, node: _Node, value: Any, found: Dict[str, Any]) -> None:
+        for path in node.paths:
+            found.setdefault(path, value)
+
+        for step, child in node.children.items():
+            if child.subtree.issubset(found):
+                continue
+            try:
+                matches = _expand(step, value)
+            except Exception as e:
+                for path in child.subtree - found.keys():
+                    logger.error(f"Error evaluating JSONPath {path}: {str(e)}")
+                    found[path] = _FAILED
+                continue
+
+            for match in matches:
+                self._visit(child, match, found)
+                if child.subtree.issubset(found):
+                    break
+
+
+@lru_cache(maxsize=1024)
+def path_set(expressions: Tuple[str, ...]) -> PathSet:
+    """Return the (cached) PathSet for an endpoint's expressions."""
+    return PathSet(expressions)
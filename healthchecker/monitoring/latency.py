@@ -0,0 +1,186 @@
+"""Streaming latency statistics with fixed memory per endpoint."""
+import math
+import operator
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config.models import LatencyConfig
+
+# Log-scaled buckets: every latency between MIN_LATENCY and MAX_LATENCY is
+# stored within RELATIVE_ACCURACY of its true value
+RELATIVE_ACCURACY = 0.05
+MIN_LATENCY = 1e-4  # seconds
+MAX_LATENCY = 1e3  # seconds
+
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+_OFFSET = math.ceil(math.log(MIN_LATENCY) / _LOG_GAMMA)
+BUCKETS = math.ceil(math.log(MAX_LATENCY) / _LOG_GAMMA) - _OFFSET + 1
+
+# Floor for the baseline's mean deviation, so that a perfectly steady endpoint
+# does not flag microsecond jitter
+DEVIATION_FLOOR = 0.001  # seconds
+
+
+def bucket_index(latency: float) -> int:
+    if latency <= MIN_LATENCY:
+        return 0
+    index = math.ceil(math.log(latency) / _LOG_GAMMA) - _OFFSET
+    return min(index, BUCKETS - 1)
+
+
+def bucket_value(index: int) -> float:
+    """Representative latency of a bucket (within the relative accuracy)."""
+    return 2 * _GAMMA ** (index + _OFFSET) / (_GAMMA + 1)
+
+
+class LatencySketch:
+    """
+    Sliding-window latency histogram.
+
+    The window is split into ``slices`` sub-windows, each a fixed array of
+    log-scaled bucket counts, plus a running total over all of them. When a
+    sub-window is reused its counts are subtracted from the total, so memory is
+    the same no matter how many latencies have been recorded.
+
+    Args:
+        window: Seconds the sketch covers
+        slices: Number of sub-windows the window expires in
+    """
+
+    __slots__ = ("slice_duration", "slices", "counts", "total", "count", "current")
+
+    def __init__(self, window: float, slices: int = 4):
+        self.slice_duration = window / slices
+        self.slices = slices
+        self.counts = array("I", bytes(4 * BUCKETS * slices))
+        self.total = array("I", bytes(4 * BUCKETS))
+        self.count = 0
+        self.current: Optional[int] = None
+
+    def _slot(self, slice_number: int) -> slice:
+        start = (slice_number % self.slices) * BUCKETS
+        return slice(start, start + BUCKETS)
+
+    def advance(self, now: float) -> None:
+        """Expire the sub-windows that are older than the window."""
+        target = int(now // self.slice_duration)
+        if self.current is None or target - self.current >= self.slices:
+            self.counts = array("I", bytes(4 * BUCKETS * self.slices))
+            self.total = array("I", bytes(4 * BUCKETS))
+            self.count = 0
+            self.current = target
+            return
+
+        while self.current < target:
+            self.current += 1
+            leaving = self._slot(self.current)
+            self.count -= sum(self.counts[leaving])
+            self.total = array("I", map(operator.sub, self.total, self.counts[leaving]))
+            self.counts[leaving] = array("I", bytes(4 * BUCKETS))
+
+    def record(self, latency: float, now: float) -> None:
+        self.advance(now)
+        index = bucket_index(latency)
+        self.counts[self._slot(self.current or 0).start + index] += 1
+        self.total[index] += 1
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile of the latencies in the window.
+
+        Args:
+            q: The quantile, between 0 and 1
+
+        Returns:
+            The latency in seconds, or None if the window is empty
+        """
+        if not self.count:
+            return None
+
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, count in enumerate(self.total):
+            seen += count
+            if seen >= rank:
+                return bucket_value(index)
+        return bucket_value(BUCKETS - 1)
+
+
+class LatencyTracker:
+    """
+    Judges an endpoint's response times against its recent history.
+
+    A check is too slow when the configured percentile over the window exceeds
+    ``percentile_threshold``, or when its response time is more than
+    ``deviation_threshold`` mean deviations above an exponentially weighted
+    baseline. Neither applies before ``min_samples`` checks have been seen.
+    """
+
+    __slots__ = ("config", "sketch", "mean", "deviation", "samples")
+
+    def __init__(self, config: LatencyConfig):
+        self.config = config
+        self.sketch = LatencySketch(config.window)
+        self.mean = 0.0
+        self.deviation = 0.0
+        self.samples = 0
+
+    def observe(
+        self, latency: float, now: Optional[float] = None
+    ) -> Tuple[bool, List[str], Dict[str, Any]]:
+        """
+        Record a response time and check it.
+
+        Returns:
+            Whether the latency is acceptable, the reasons if it is not, and
+            the statistics it was judged by
+        """
+        config = self.config
+        now = time.monotonic() if now is None else now
+        warmed_up = self.samples >= config.min_samples
+        reasons: List[str] = []
+        details: Dict[str, Any] = {}
+
+        if config.deviation_threshold is not None:
+            details["baseline"] = self.mean
+            details["deviation"] = self.deviation
+            limit = self.mean + config.deviation_threshold * max(
+                self.deviation, DEVIATION_FLOOR
+            )
+            if warmed_up and latency > limit:
+                reasons.append(
+                    f"Response time {latency:.2f}s is more than "
+                    f"{config.deviation_threshold:g} deviations above the "
+                    f"{self.mean:.2f}s baseline"
+                )
+
+        # Update the baseline after judging against it
+        if self.samples:
+            difference = latency - self.mean
+            self.mean += config.baseline_alpha * difference
+            self.deviation += config.baseline_alpha * (
+                abs(difference) - self.deviation
+            )
+        else:
+            self.mean = latency
+        self.samples += 1
+
+        self.sketch.record(latency, now)
+        if config.percentile_threshold is not None:
+            value = self.sketch.quantile(config.percentile / 100)
+            label = f"p{config.percentile:g}"
+            details[label] = value
+            if (
+                self.sketch.count >= config.min_samples
+                and value is not None
+                and value > config.percentile_threshold
+            ):
+                reasons.append(
+                    f"{label} response time {value:.2f}s over {config.window:g}s "
+                    f"exceeded threshold of {config.percentile_threshold}s"
+                )
+
+        return not reasons, reasons, details
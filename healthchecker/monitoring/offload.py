@@ -0,0 +1,90 @@
+"""Worker pool for CPU-heavy response body validation."""
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..config.models import BodyOffloadConfig
+
+logger = logging.getLogger(__name__)
+
+
+def timed_call(func: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    """Call a function and return its result with the CPU time it used."""
+    start = time.thread_time()
+    result = func(*args)
+    return result, time.thread_time() - start
+
+
+class ValidationPool:
+    """
+    Runs body validation off the event loop for large responses.
+
+    Bodies of at least ``threshold`` characters are parsed and validated in a
+    thread or process pool, so one huge document does not stall every other
+    check. The executor is only created once it is first needed.
+    """
+
+    def __init__(self, config: BodyOffloadConfig):
+        self.config = config
+        self.pending = 0
+        self.max_pending = 0
+        self.offloaded = 0
+        self._executor: Optional[Executor] = None
+
+    def should_offload(self, size: int) -> bool:
+        return self.config.threshold is not None and size >= self.config.threshold
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.config.executor == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.config.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.config.workers,
+                    thread_name_prefix="body-validation",
+                )
+            logger.info(
+                f"Started {self.config.workers} body validation "
+                f"{self.config.executor} workers"
+            )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+        """
+        Run a function in the pool.
+
+        Args:
+            func: A module-level function (it may be sent to another process)
+            *args: Arguments for the function
+
+        Returns:
+            The function's result and the CPU time it used in the worker
+        """
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        self.max_pending = max(self.max_pending, self.pending)
+        self.offloaded += 1
+        try:
+            return await loop.run_in_executor(
+                self._get_executor(), timed_call, func, *args
+            )
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "executor": self.config.executor,
+            "workers": self.config.workers,
+            "threshold": self.config.threshold,
+            "offloaded": self.offloaded,
+            "pending": self.pending,
+            "queue_depth": max(0, self.pending - self.config.workers),
+            "max_queue_depth": max(0, self.max_pending - self.config.workers),
+        }
@@ -0,0 +1,207 @@
+"""On-demand profiling of a running monitor."""
+import asyncio
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import signal
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+from ..config.models import ProfilingConfig
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .checker import MonitoringManager
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilerBusy(RuntimeError):
+    """Raised when a capture is requested while another one is running."""
+
+
+def _task_name(task: asyncio.Task) -> str:
+    coro = task.get_coro()
+    return getattr(coro, "__qualname__", None) or type(coro).__name__
+
+
+class Profiler:
+    """
+    Captures diagnostics from a live monitor without restarting it.
+
+    A capture runs for a fixed duration and writes a report directory with:
+
+    - ``cpu.prof``: cProfile stats (load with ``pstats`` or snakeviz)
+    - ``cpu.txt``: the top functions by cumulative time
+    - ``memory.txt``: the top allocation sites from tracemalloc
+    - ``tasks.json``: asyncio task counts, the longest-running checks and the
+      CPU time each endpoint spent validating response bodies
+
+    Captures are triggered by a signal or through the status API.
+    """
+
+    def __init__(self, config: ProfilingConfig, manager: "MonitoringManager"):
+        self.config = config
+        self.manager = manager
+        self._lock = asyncio.Lock()
+        self._signal: Optional[signal.Signals] = None
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    def install_signal_handler(self) -> None:
+        """Start a capture whenever the configured signal is received."""
+        if not self.config.signal:
+            return
+
+        sig = getattr(signal, self.config.signal)
+        try:
+            asyncio.get_running_loop().add_signal_handler(sig, self._on_signal)
+        except (NotImplementedError, RuntimeError) as e:
+            logger.warning(f"Cannot install {self.config.signal} handler: {str(e)}")
+            return
+
+        self._signal = sig
+        logger.info(f"Send {self.config.signal} to pid {os.getpid()} to profile")
+
+    def remove_signal_handler(self) -> None:
+        if self._signal is not None:
+            asyncio.get_running_loop().remove_signal_handler(self._signal)
+            self._signal = None
+
+    def _on_signal(self) -> None:
+        if self.busy:
+            logger.warning("Profiling already in progress, ignoring signal")
+            return
+        asyncio.create_task(self._capture_logged())
+
+    async def _capture_logged(self) -> None:
+        try:
+            await self.capture()
+        except Exception as e:
+            logger.error(f"Error capturing profile: {str(e)}")
+
+    def snapshot_tasks(self) -> Dict[str, Any]:
+        """Describe what the event loop is currently doing."""
+        tasks = asyncio.all_tasks()
+        counts = Counter(_task_name(task) for task in tasks)
+        now = time.monotonic()
+        top = self.config.top
+
+        in_flight = sorted(
+            (
+                (name, now - started)
+                for name, started in self.manager.in_flight.items()
+            ),
+            key=lambda item: item[1],
+            reverse=True,
+        )[:top]
+        slowest = sorted(
+            self.manager.check_results.values(),
+            key=lambda result: result.response_time,
+            reverse=True,
+        )[:top]
+        validation = sorted(
+            (
+                (name, checker.validation_time, checker.validation_count)
+                for name, checker in self.manager.checkers.items()
+                if checker.validation_count
+            ),
+            key=lambda item: item[1],
+            reverse=True,
+        )[:top]
+
+        return {
+            "tasks": len(tasks),
+            "tasks_by_coroutine": dict(counts.most_common()),
+            "checks_in_flight": [
+                {"endpoint": name, "elapsed": round(elapsed, 6)}
+                for name, elapsed in in_flight
+            ],
+            "slowest_checks": [
+                {"endpoint": result.endpoint_name, "response_time": result.response_time}
+                for result in slowest
+            ],
+            "body_validation_cpu": [
+                {
+                    "endpoint": name,
+                    "cpu_seconds": round(cpu, 6),
+                    "validations": count,
+                    "cpu_per_validation": round(cpu / count, 9),
+                }
+                for name, cpu, count in validation
+            ],
+        }
+
+    async def capture(self, duration: Optional[float] = None) -> str:
+        """
+        Profile the monitor for a while and write a report.
+
+        Args:
+            duration: Seconds to profile for, defaults to the configured duration
+
+        Returns:
+            The directory the report was written to
+
+        Raises:
+            ProfilerBusy: If another capture is already running
+        """
+        if self.busy:
+            raise ProfilerBusy("Profiling already in progress")
+
+        async with self._lock:
+            duration = duration or self.config.duration
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+            path = os.path.join(self.config.output_dir, f"profile-{stamp}")
+            logger.info(f"Profiling for {duration}s into {path}")
+
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                await asyncio.sleep(duration)
+            finally:
+                profile.disable()
+                memory = tracemalloc.take_snapshot()
+                if started_tracing:
+                    tracemalloc.stop()
+
+            tasks = self.snapshot_tasks()
+            await asyncio.to_thread(self._write_report, path, profile, memory, tasks)
+            logger.info(f"Profile written to {path}")
+            return path
+
+    def _write_report(
+        self,
+        path: str,
+        profile: cProfile.Profile,
+        memory: tracemalloc.Snapshot,
+        tasks: Dict[str, Any],
+    ) -> None:
+        os.makedirs(path, exist_ok=True)
+
+        profile.dump_stats(os.path.join(path, "cpu.prof"))
+        text = io.StringIO()
+        pstats.Stats(profile, stream=text).sort_stats("cumulative").print_stats(
+            self.config.top
+        )
+        with open(os.path.join(path, "cpu.txt"), "w") as f:
+            f.write(text.getvalue())
+
+        memory = memory.filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        with open(os.path.join(path, "memory.txt"), "w") as f:
+            for stat in memory.statistics("lineno")[: self.config.top]:
+                f.write(f"{stat}\n")
+
+        with open(os.path.join(path, "tasks.json"), "w") as f:
+            json.dump(tasks, f, indent=2)
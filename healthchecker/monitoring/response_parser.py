@@ -1,7 +1,10 @@
+import hashlib
+import json
 import re
 import logging
-from typing import Dict, Any
-import jsonpath_ng.ext as jsonpath
+from typing import Dict, Any, Optional, Tuple
+
+from .fast_jsonpath import parse, path_set
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +15,9 @@ def validate_json_paths(
     """
     Validate a JSON response against JSONPath checks.
 
+    Common expressions are evaluated together in a single pass over the data;
+    anything the fast evaluator does not support goes through jsonpath_ng.
+
     Args:
         data: The JSON data to validate
         checks: Dictionary mapping JSONPath expressions to expected values
@@ -19,12 +25,21 @@ def validate_json_paths(
     Returns:
         Dictionary mapping check names to boolean results
     """
+    paths = path_set(tuple(checks))
+    first_matches = paths.find_first(data)
     results = {}
 
     for path_expr, expected_value in checks.items():
+        if path_expr not in paths.fallback:
+            results[path_expr] = (
+                path_expr in first_matches
+                and first_matches[path_expr] == expected_value
+            )
+            continue
+
         try:
             # Parse the JSONPath expression
-            jsonpath_expr = jsonpath.parse(path_expr)
+            jsonpath_expr = parse(path_expr)
 
             # Find all matches
             matches = [match.value for match in jsonpath_expr.find(data)]
@@ -47,6 +62,51 @@ def validate_json_paths(
     return results
 
 
+def _first_value(expression: str, data: Any) -> Any:
+    """Return the first value a JSONPath expression matches, or None."""
+    paths = path_set((expression,))
+    if expression not in paths.fallback:
+        return paths.find_first(data).get(expression)
+    matches = parse(expression).find(data)
+    return matches[0].value if matches else None
+
+
+def validate_components(
+    data: Any, selector: str, name_path: Optional[str], checks: Dict[str, Any]
+) -> Dict[str, Dict[str, bool]]:
+    """
+    Select the components of an aggregate status document and check each one.
+
+    Args:
+        data: The parsed JSON document
+        selector: JSONPath matching one value per component
+        name_path: JSONPath of a component's name, relative to the component;
+            None names components by their key (or index) in the document
+        checks: Dictionary mapping JSONPath expressions, relative to a
+            component, to expected values
+
+    Returns:
+        The check results of each component by name, in document order
+    """
+    results: Dict[str, Dict[str, bool]] = {}
+    for match in parse(selector).find(data):
+        if name_path is not None:
+            name = _first_value(name_path, match.value)
+        else:
+            fields = getattr(match.path, "fields", None)
+            name = fields[0] if fields else getattr(match.path, "index", None)
+        if name is None:
+            continue
+
+        # A name reported twice keeps its first entry
+        name = str(name)
+        if name not in results:
+            results[name] = (
+                validate_json_paths(match.value, checks) if checks else {}
+            )
+    return results
+
+
 def validate_regex_patterns(text: str, patterns: Dict[str, str]) -> Dict[str, bool]:
     """
     Validate text against regex patterns.
@@ -74,3 +134,68 @@ def validate_regex_patterns(text: str, patterns: Dict[str, str]) -> Dict[str, bo
             results[pattern_name] = False
 
     return results
+
+
+def body_digest(body: str) -> str:
+    """Return a short digest identifying a response body."""
+    return hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def validate_body(
+    body_text: str,
+    json_path_checks: Dict[str, Any],
+    regex_checks: Dict[str, str],
+    components: Optional[Tuple[str, Optional[str], Dict[str, Any]]] = None,
+) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Parse a response body and run the configured checks against it.
+
+    This is a plain function of its arguments so that it can run in a worker
+    thread or process.
+
+    Args:
+        body_text: The decoded response body
+        json_path_checks: Dictionary mapping JSONPath expressions to expected values
+        regex_checks: Dictionary mapping pattern names to regex patterns
+        components: Selector, name path and checks of the components to derive
+            from the same document, see ``validate_components``
+
+    Returns:
+        Whether the body is valid, and the details of each check. The component
+        results, if any, are under ``"components"`` and do not affect validity.
+    """
+    details: Dict[str, Any] = {}
+    try:
+        # Parse JSON once for the JSONPath checks and the components
+        if json_path_checks or components:
+            try:
+                body_json = json.loads(body_text)
+            except ValueError:
+                details["json_parse_error"] = {
+                    "message": "Failed to parse response as JSON"
+                }
+                return False, details
+
+            # Components are judged on their own, whatever the endpoint's checks say
+            if components:
+                details["components"] = validate_components(body_json, *components)
+
+        if json_path_checks:
+            json_check_results = validate_json_paths(body_json, json_path_checks)
+            details["json_checks"] = json_check_results
+            if not all(json_check_results.values()):
+                return False, details
+
+        # Check regex patterns if configured
+        if regex_checks:
+            regex_check_results = validate_regex_patterns(body_text, regex_checks)
+            details["regex_checks"] = regex_check_results
+            if not all(regex_check_results.values()):
+                return False, details
+
+        return True, details
+
+    except Exception as e:
+        logger.error(f"Error validating response body: {str(e)}")
+        details["error"] = {"message": f"Body validation error: {str(e)}"}
+        return False, details
@@ -0,0 +1,217 @@
+"""Health rollups of labelled endpoint groups, maintained per result."""
+import time
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from ..config.models import EndpointConfig, GroupAlertConfig
+from .endpoint import CheckResult, HealthStatus
+from .latency import LatencySketch
+from .state import EndpointState, classify
+
+# Period over which group latency percentiles are reported
+GROUP_LATENCY_WINDOW = 300.0  # seconds
+
+
+class GroupStats:
+    """Counts and latency aggregates of the endpoints sharing one label value."""
+
+    __slots__ = (
+        "label",
+        "value",
+        "endpoints",
+        "up",
+        "degraded",
+        "down",
+        "latency_sum",
+        "latency",
+    )
+
+    def __init__(self, label: str, value: str):
+        self.label = label
+        self.value = value
+        self.endpoints = 0
+        self.up = 0
+        self.degraded = 0
+        self.down = 0
+        # Sum of each reporting endpoint's latest response time
+        self.latency_sum = 0.0
+        self.latency = LatencySketch(GROUP_LATENCY_WINDOW)
+
+    @property
+    def reported(self) -> int:
+        return self.up + self.degraded + self.down
+
+    def count(self, state: str) -> int:
+        if state == "unhealthy":
+            return self.degraded + self.down
+        return getattr(self, state)
+
+    def add(self, state: EndpointState, latency: float) -> None:
+        self._shift(state, 1)
+        self.latency_sum += latency
+
+    def remove(self, state: EndpointState, latency: float) -> None:
+        self._shift(state, -1)
+        self.latency_sum -= latency
+
+    def _shift(self, state: EndpointState, delta: int) -> None:
+        if state == EndpointState.UP:
+            self.up += delta
+        elif state == EndpointState.DEGRADED:
+            self.degraded += delta
+        else:
+            self.down += delta
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        self.latency.advance(now)
+        reported = self.reported
+        return {
+            "label": self.label,
+            "value": self.value,
+            "endpoints": self.endpoints,
+            "reported": reported,
+            "up": self.up,
+            "degraded": self.degraded,
+            "down": self.down,
+            "latency_mean": self.latency_sum / reported if reported else None,
+            "latency_p50": self.latency.quantile(0.5),
+            "latency_p95": self.latency.quantile(0.95),
+        }
+
+
+class GroupIndex:
+    """
+    Health of endpoint groups, kept up to date one result at a time.
+
+    An endpoint belongs to one group per label it carries, such as
+    ``region=eu-west``. The index remembers the state and response time each
+    endpoint last contributed, so a new result only moves that endpoint between
+    the counters of its own groups. Updates cost the same however many endpoints
+    a group has, and reading a rollup never looks at individual endpoints.
+
+    Group alert rules are evaluated for the groups a result touched, and an
+    alert is raised when a rule starts firing.
+
+    Args:
+        endpoints: The monitored endpoints
+        rules: Group alert rules
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[EndpointConfig],
+        rules: Sequence[GroupAlertConfig] = (),
+    ):
+        self.groups: Dict[Tuple[str, str], GroupStats] = {}
+        self.members: Dict[str, Tuple[GroupStats, ...]] = {}
+        self.last: Dict[str, Tuple[EndpointState, float]] = {}
+        self.rules: Dict[str, List[Tuple[int, GroupAlertConfig]]] = {}
+        self.firing: Set[Tuple[str, str, int]] = set()
+
+        for i, rule in enumerate(rules):
+            self.rules.setdefault(rule.label, []).append((i, rule))
+
+        for endpoint in endpoints:
+            groups = []
+            for label, value in endpoint.labels.items():
+                group = self.groups.get((label, value))
+                if group is None:
+                    group = self.groups[(label, value)] = GroupStats(label, value)
+                group.endpoints += 1
+                groups.append(group)
+            if groups:
+                self.members[endpoint.name or "unknown"] = tuple(groups)
+
+    def update(
+        self, result: CheckResult, now: Optional[float] = None
+    ) -> List[CheckResult]:
+        """
+        Account for an endpoint's latest result.
+
+        Returns:
+            Alerts for group rules that started firing
+        """
+        name = result.endpoint_name
+        groups = self.members.get(name)
+        if not groups:
+            return []
+
+        now = time.monotonic() if now is None else now
+        state = classify(result)
+        latency = result.response_time
+        previous = self.last.get(name)
+        self.last[name] = (state, latency)
+
+        for group in groups:
+            if previous is not None:
+                group.remove(*previous)
+            group.add(state, latency)
+            group.latency.record(latency, now)
+
+        return self._evaluate(groups, now)
+
+    def remove(self, name: str) -> None:
+        """Stop counting an endpoint, e.g. when another instance takes it over."""
+        previous = self.last.pop(name, None)
+        if previous is not None:
+            for group in self.members[name]:
+                group.remove(*previous)
+
+    def _evaluate(
+        self, groups: Sequence[GroupStats], now: float
+    ) -> List[CheckResult]:
+        alerts = []
+        for group in groups:
+            for i, rule in self.rules.get(group.label, ()):
+                key = (group.label, group.value, i)
+                reported = group.reported
+                count = group.count(rule.state)
+                firing = (
+                    reported >= rule.min_endpoints
+                    and count / reported > rule.threshold
+                )
+                if firing and key not in self.firing:
+                    alerts.append(self._alert(group, rule, count, now))
+                    self.firing.add(key)
+                elif not firing:
+                    self.firing.discard(key)
+        return alerts
+
+    def _alert(
+        self, group: GroupStats, rule: GroupAlertConfig, count: int, now: float
+    ) -> CheckResult:
+        stats = group.to_dict(now)
+        name = f"{group.label}={group.value}"
+        return CheckResult(
+            endpoint_name=name,
+            url="",
+            status=HealthStatus.CRITICAL,
+            response_time=stats["latency_mean"] or 0.0,
+            message=(
+                f"{count} of {group.reported} endpoints with {name} are "
+                f"{rule.state} ({count / group.reported:.0%}, "
+                f"threshold {rule.threshold:.0%})"
+            ),
+            details={
+                "alert_type": "group",
+                "group": stats,
+                "rule_state": rule.state,
+                "threshold": rule.threshold,
+                "alert_required": True,
+            },
+        )
+
+    def rollup(
+        self, label: Optional[str] = None, now: Optional[float] = None
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Return the health of every group, by label and value.
+
+        Args:
+            label: Only report the groups of this label
+        """
+        now = time.monotonic() if now is None else now
+        rollup: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (group_label, value), group in self.groups.items():
+            if label is None or group_label == label:
+                rollup.setdefault(group_label, {})[value] = group.to_dict(now)
+        return rollup
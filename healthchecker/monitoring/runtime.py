@@ -0,0 +1,135 @@
+"""Compact runtime representation of endpoint configuration."""
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+import aiohttp
+
+from ..config.models import EndpointConfig, LatencyConfig
+
+
+@lru_cache(maxsize=None)
+def client_timeout(total: float) -> aiohttp.ClientTimeout:
+    """Return a shared (immutable) timeout object for a total timeout."""
+    return aiohttp.ClientTimeout(total=total)
+
+
+@lru_cache(maxsize=None)
+def status_codes(codes: Tuple[int, ...]) -> FrozenSet[int]:
+    """Return a shared set of expected status codes."""
+    return frozenset(codes)
+
+
+class EndpointRuntime:
+    """
+    Immutable, slotted snapshot of an endpoint's configuration.
+
+    Everything a check needs is resolved once at startup: status ranges are
+    parsed, and the request timeout and keyword arguments are built a single time
+    and reused by every request. Values that many endpoints have in common
+    (timeouts, status code sets) are shared between records, and the
+    configuration's own containers are referenced rather than copied.
+    """
+
+    __slots__ = (
+        "name",
+        "url",
+        "method",
+        "request_kwargs",
+        "timeout",
+        "retry_attempts",
+        "backoff_factor",
+        "expected_status_codes",
+        "expected_status_ranges",
+        "response_time_threshold",
+        "interval",
+        "json_path_checks",
+        "regex_checks",
+        "failure_threshold",
+        "failure_window",
+        "parent_down_interval",
+        "latency",
+        "conditional_requests",
+        "priority",
+        "transport",
+        "components",
+    )
+
+    name: str
+    url: str
+    method: str
+    request_kwargs: Dict[str, Any]
+    timeout: float
+    retry_attempts: int
+    backoff_factor: float
+    expected_status_codes: FrozenSet[int]
+    expected_status_ranges: Tuple[Tuple[int, int], ...]
+    response_time_threshold: float
+    interval: float
+    json_path_checks: Dict[str, Any]
+    regex_checks: Dict[str, str]
+    failure_threshold: int
+    failure_window: float
+    parent_down_interval: Optional[float]
+    latency: Optional[LatencyConfig]
+    conditional_requests: bool
+    priority: int
+    transport: str
+    components: Optional[Tuple[str, Optional[str], Dict[str, Any]]]
+
+    def __init__(self, config: EndpointConfig):
+        request_kwargs: Dict[str, Any] = {
+            "headers": config.headers,
+            "timeout": client_timeout(config.timeout),
+        }
+
+        # Add request body if specified
+        if config.body:
+            if isinstance(config.body, dict):
+                request_kwargs["json"] = config.body
+            else:
+                request_kwargs["data"] = config.body
+
+        values = {
+            "name": config.name or "unknown",
+            "url": config.url,
+            "method": config.method.lower(),
+            "request_kwargs": request_kwargs,
+            "timeout": config.timeout,
+            "retry_attempts": config.retry.attempts,
+            "backoff_factor": config.retry.backoff_factor,
+            "expected_status_codes": status_codes(
+                tuple(config.expected_status_codes)
+            ),
+            "expected_status_ranges": tuple(
+                (int(start), int(end))
+                for start, end in (r.split("-") for r in config.expected_status_ranges)
+            ),
+            "response_time_threshold": config.response_time_threshold,
+            "interval": config.interval,
+            "json_path_checks": config.json_path_checks,
+            "regex_checks": config.regex_checks,
+            "failure_threshold": config.failure_threshold,
+            "failure_window": config.failure_window,
+            "parent_down_interval": config.parent_down_interval,
+            "latency": config.latency,
+            "conditional_requests": config.conditional_requests,
+            "priority": config.priority,
+            "transport": config.transport,
+            "components": (
+                (
+                    config.components.selector,
+                    config.components.name_path,
+                    config.components.json_path_checks,
+                )
+                if config.components
+                else None
+            ),
+        }
+        for key, value in values.items():
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is read-only")
+
+    def __repr__(self) -> str:
+        return f"EndpointRuntime(name={self.name!r}, url={self.url!r})"
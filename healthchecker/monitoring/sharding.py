@@ -0,0 +1,113 @@
+"""Distribution of endpoints across monitor instances."""
+import hashlib
+import logging
+import os
+import socket
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Sequence, Set
+
+from ..config.dependencies import DependencyGraph
+from ..config.models import ShardingConfig
+
+logger = logging.getLogger(__name__)
+
+
+def _score(member: str, key: str) -> int:
+    digest = hashlib.blake2b(f"{member}\0{key}".encode("utf-8"), digest_size=8)
+    return int.from_bytes(digest.digest(), "big")
+
+
+def owner(key: str, members: Sequence[str]) -> str:
+    """
+    Pick the member that owns a key using rendezvous (highest random weight) hashing.
+
+    Adding or removing a member only moves the keys that member wins or held,
+    so rebalancing touches the minimum number of endpoints.
+    """
+    return max(members, key=lambda member: _score(member, key))
+
+
+def shard_keys(graph: DependencyGraph) -> Dict[str, str]:
+    """
+    Map every endpoint to the key it is sharded by.
+
+    Endpoints are keyed by their first root ancestor, so an upstream endpoint and
+    its dependents are always checked by the same instance.
+    """
+    keys = {}
+    for name in graph.order:
+        roots = sorted(a for a in graph.ancestors[name] if not graph.parents[a])
+        keys[name] = roots[0] if roots else name
+    return keys
+
+
+def assign(keys: Dict[str, str], members: Sequence[str], member: str) -> Set[str]:
+    """Return the endpoints owned by a member."""
+    if not members:
+        return set()
+    return {name for name, key in keys.items() if owner(key, members) == member}
+
+
+def static_members(count: int) -> List[str]:
+    """Member ids for a fixed number of shards."""
+    return [f"shard-{i}" for i in range(count)]
+
+
+class LeaseCoordinator:
+    """
+    Membership tracking through a shared SQLite file.
+
+    Each instance keeps a lease row alive with periodic heartbeats; instances whose
+    lease has expired are dropped from the membership.
+    """
+
+    def __init__(self, config: ShardingConfig):
+        self.path = config.lease_path
+        self.ttl = config.lease_ttl
+        self.instance_id = (
+            config.instance_id or f"{socket.gethostname()}-{os.getpid()}"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=self.ttl)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS members "
+            "(instance_id TEXT PRIMARY KEY, expires REAL NOT NULL)"
+        )
+        return connection
+
+    def heartbeat(self) -> List[str]:
+        """
+        Renew this instance's lease and return the live members.
+
+        Returns:
+            Sorted ids of all instances holding a valid lease
+        """
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO members (instance_id, expires) VALUES (?, ?)",
+                (self.instance_id, now + self.ttl),
+            )
+            connection.execute("DELETE FROM members WHERE expires <= ?", (now,))
+            rows = connection.execute(
+                "SELECT instance_id FROM members ORDER BY instance_id"
+            ).fetchall()
+        connection.close()
+        return [row[0] for row in rows]
+
+    def release(self) -> None:
+        """Give up this instance's lease so others take over immediately."""
+        with self._connect() as connection:
+            connection.execute(
+                "DELETE FROM members WHERE instance_id = ?", (self.instance_id,)
+            )
+        connection.close()
+
+
+def describe(names: Iterable[str]) -> str:
+    names = sorted(names)
+    if len(names) > 5:
+        return ", ".join(names[:5]) + f" and {len(names) - 5} more"
+    return ", ".join(names)
@@ -0,0 +1,110 @@
+"""Replay of recorded traces against a configuration."""
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from ..alerting.manager import AlertManager
+from ..config.models import AppConfig
+from ..utils.clock import VirtualClock
+from .endpoint import EndpointChecker, HealthStatus
+from .runtime import EndpointRuntime
+from .trace import ReplaySession, read_trace
+
+logger = logging.getLogger(__name__)
+
+
+async def simulate(config: AppConfig, path: str) -> Dict[str, Any]:
+    """
+    Replay a trace through the checks and alerting of a configuration.
+
+    Every recorded outcome is fed to a real EndpointChecker and AlertManager
+    running on a virtual clock, so failure thresholds, windows and rate limits
+    behave exactly as they would have live, without any waiting. Alerts are
+    collected instead of sent.
+
+    Args:
+        config: The configuration to evaluate
+        path: Path to a trace written in record mode
+
+    Returns:
+        A report of the checks replayed and the alerts that would have fired
+    """
+    clock = VirtualClock()
+    alert_manager = AlertManager(config.alerting, mock_mode=True, clock=clock)
+    runtimes = {e.name or "unknown": EndpointRuntime(e) for e in config.endpoints}
+    checkers: Dict[str, EndpointChecker] = {}
+    sessions: Dict[str, ReplaySession] = {}
+
+    endpoints: Dict[str, Dict[str, int]] = {}
+    alerts: List[Dict[str, Any]] = []
+    unknown = set()
+    start = end = None
+
+    for record in read_trace(path):
+        runtime = runtimes.get(record.endpoint)
+        if runtime is None:
+            unknown.add(record.endpoint)
+            continue
+
+        checker = checkers.get(record.endpoint)
+        if checker is None:
+            sessions[record.endpoint] = ReplaySession(clock)
+            checker = checkers[record.endpoint] = EndpointChecker(
+                runtime, sessions[record.endpoint], clock=clock
+            )
+            endpoints[record.endpoint] = {
+                "checks": 0,
+                "failures": 0,
+                "alerts": 0,
+                "rate_limited": 0,
+            }
+
+        # The trace holds completion times; start the check so it ends on time
+        clock.set(record.timestamp - record.elapsed)
+        start = clock.time if start is None else start
+        sessions[record.endpoint].start(record)
+        result = await checker.check()
+        result.timestamp = clock.now()
+        end = clock.time
+
+        counts = endpoints[record.endpoint]
+        counts["checks"] += 1
+        if result.status == HealthStatus.OK:
+            continue
+        counts["failures"] += 1
+
+        if result.details.get("alert_required", False):
+            if await alert_manager.send_alert(result):
+                counts["alerts"] += 1
+                alerts.append(
+                    {
+                        "time": result.timestamp.isoformat(),
+                        "endpoint": result.endpoint_name,
+                        "message": result.message,
+                        "failure_count": result.details.get("failure_count"),
+                    }
+                )
+            else:
+                counts["rate_limited"] += 1
+
+    if unknown:
+        logger.warning(
+            f"Skipped trace records for endpoints not in the configuration: "
+            f"{', '.join(sorted(unknown))}"
+        )
+
+    def isoformat(timestamp):
+        if timestamp is None:
+            return None
+        return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+    return {
+        "start": isoformat(start),
+        "end": isoformat(end),
+        "duration": (end - start) if start is not None and end is not None else 0.0,
+        "checks": sum(c["checks"] for c in endpoints.values()),
+        "failures": sum(c["failures"] for c in endpoints.values()),
+        "alerts": alerts,
+        "rate_limited": sum(c["rate_limited"] for c in endpoints.values()),
+        "endpoints": endpoints,
+    }
@@ -0,0 +1,186 @@
+"""SLO burn-rate evaluation."""
+import logging
+import math
+import operator
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..config.models import EndpointConfig
+from .endpoint import CheckResult, HealthStatus
+
+logger = logging.getLogger(__name__)
+
+
+class SLOEngine:
+    """
+    Multi-window burn-rate evaluation for endpoints with an SLO.
+
+    Check outcomes are counted into fixed-size time buckets held in a ring. The
+    ring is laid out bucket-major, so one bucket for every endpoint is a
+    contiguous slice, and a running total per window length is kept for each
+    endpoint. Advancing the clock subtracts the buckets that fall out of each
+    window in one pass over those slices, so the work per tick depends on the
+    number of endpoints and window lengths, never on how much history is kept.
+    """
+
+    def __init__(self, endpoints: Sequence[EndpointConfig], resolution: float = 60.0):
+        self.resolution = resolution
+        self.endpoints = [e for e in endpoints if e.slo]
+        self.index: Dict[str, int] = {
+            endpoint.name or "unknown": i for i, endpoint in enumerate(self.endpoints)
+        }
+
+        # Per endpoint: (long window, short window, burn rate threshold) rules
+        self.rules: List[List[Tuple[int, int, float]]] = []
+        lengths = set()
+        for endpoint in self.endpoints:
+            rules = []
+            for window in endpoint.slo.windows if endpoint.slo else []:
+                long_buckets = self._buckets(window.long_window)
+                short_buckets = self._buckets(window.short_window)
+                lengths.update((long_buckets, short_buckets))
+                rules.append((long_buckets, short_buckets, window.burn_rate))
+            self.rules.append(rules)
+
+        self.budgets = array(
+            "d", [1.0 - e.slo.objective for e in self.endpoints if e.slo]
+        )
+        self.lengths = sorted(lengths)
+
+        count = len(self.endpoints)
+        self.ring_size = (max(self.lengths) if self.lengths else 0) + 1
+        self._zeros = array("L", [0]) * count
+        self.ring_total = array("L", [0]) * (count * self.ring_size)
+        self.ring_bad = array("L", [0]) * (count * self.ring_size)
+        self.total: Dict[int, array] = {n: array("L", self._zeros) for n in self.lengths}
+        self.bad: Dict[int, array] = {n: array("L", self._zeros) for n in self.lengths}
+
+        self.bucket: Optional[int] = None
+        self.firing: List[List[bool]] = [[False] * len(r) for r in self.rules]
+
+    def _buckets(self, seconds: float) -> int:
+        return max(1, math.ceil(seconds / self.resolution))
+
+    def _slot(self, bucket: int) -> slice:
+        start = (bucket % self.ring_size) * len(self.endpoints)
+        return slice(start, start + len(self.endpoints))
+
+    def record(self, result: CheckResult, now: Optional[float] = None) -> None:
+        """Count a check result towards its endpoint's SLO windows."""
+        i = self.index.get(result.endpoint_name)
+        if i is None:
+            return
+
+        if self.bucket is None:
+            self.advance(now)
+
+        offset = self._slot(self.bucket or 0).start + i
+        bad = result.status != HealthStatus.OK
+        self.ring_total[offset] += 1
+        if bad:
+            self.ring_bad[offset] += 1
+
+        for length in self.lengths:
+            self.total[length][i] += 1
+            if bad:
+                self.bad[length][i] += 1
+
+    def advance(self, now: Optional[float] = None) -> None:
+        """Move the current bucket forward, expiring buckets that left a window."""
+        target = int((time.time() if now is None else now) // self.resolution)
+        if self.bucket is None or target - self.bucket >= self.ring_size:
+            # First tick, or idle long enough that every window is empty
+            self._reset()
+            self.bucket = target
+            return
+
+        while self.bucket < target:
+            self.bucket += 1
+            for length in self.lengths:
+                leaving = self._slot(self.bucket - length)
+                self.total[length] = array(
+                    "L", map(operator.sub, self.total[length], self.ring_total[leaving])
+                )
+                self.bad[length] = array(
+                    "L", map(operator.sub, self.bad[length], self.ring_bad[leaving])
+                )
+
+            current = self._slot(self.bucket)
+            self.ring_total[current] = self._zeros
+            self.ring_bad[current] = self._zeros
+
+    def _reset(self) -> None:
+        for ring in (self.ring_total, self.ring_bad):
+            ring[:] = array("L", [0]) * len(ring)
+        for length in self.lengths:
+            self.total[length] = array("L", self._zeros)
+            self.bad[length] = array("L", self._zeros)
+
+    def burn_rates(self, length: int) -> List[float]:
+        """Return the burn rate of every endpoint over a window of buckets."""
+        return [
+            (bad / total / budget) if total else 0.0
+            for bad, total, budget in zip(
+                self.bad[length], self.total[length], self.budgets
+            )
+        ]
+
+    def evaluate(self, now: Optional[float] = None) -> List[CheckResult]:
+        """
+        Advance the clock and evaluate every burn-rate rule.
+
+        Returns:
+            Alert results for rules that started firing on this tick
+        """
+        self.advance(now)
+        rates = {length: self.burn_rates(length) for length in self.lengths}
+
+        alerts = []
+        for i, rules in enumerate(self.rules):
+            for j, (long_buckets, short_buckets, threshold) in enumerate(rules):
+                long_rate = rates[long_buckets][i]
+                short_rate = rates[short_buckets][i]
+                firing = long_rate >= threshold and short_rate >= threshold
+
+                if firing and not self.firing[i][j]:
+                    alerts.append(
+                        self._alert(i, long_buckets, short_buckets, long_rate, short_rate)
+                    )
+                self.firing[i][j] = firing
+
+        return alerts
+
+    def _alert(
+        self,
+        i: int,
+        long_buckets: int,
+        short_buckets: int,
+        long_rate: float,
+        short_rate: float,
+    ) -> CheckResult:
+        endpoint = self.endpoints[i]
+        objective = endpoint.slo.objective if endpoint.slo else 0.0
+        long_window = long_buckets * self.resolution
+        short_window = short_buckets * self.resolution
+
+        return CheckResult(
+            endpoint_name=endpoint.name or "unknown",
+            url=endpoint.url,
+            status=HealthStatus.CRITICAL,
+            response_time=0.0,
+            message=(
+                f"Error budget burning at {long_rate:.1f}x over {long_window:g}s "
+                f"and {short_rate:.1f}x over {short_window:g}s "
+                f"(objective {objective:.4%})"
+            ),
+            details={
+                "alert_type": "slo_burn_rate",
+                "slo_objective": objective,
+                "long_window": f"{long_window:g}s",
+                "short_window": f"{short_window:g}s",
+                "long_burn_rate": round(long_rate, 2),
+                "short_burn_rate": round(short_rate, 2),
+                "alert_required": True,
+            },
+        )
@@ -0,0 +1,156 @@
+"""Per-endpoint state machine with hysteresis and flap detection."""
+from collections import deque
+from enum import Enum
+from typing import Deque, Optional
+
+from ..config.models import StateConfig
+from .endpoint import CheckResult, HealthStatus
+
+
+class EndpointState(Enum):
+    UP = "up"
+    DEGRADED = "degraded"
+    DOWN = "down"
+    FLAPPING = "flapping"
+
+
+def classify(result: CheckResult) -> EndpointState:
+    """Map a single check result to the state it indicates."""
+    if result.status == HealthStatus.OK:
+        return EndpointState.UP
+
+    details = result.details
+    if (
+        details.get("status_code_valid")
+        and details.get("body_valid")
+        and not details.get("response_time_valid", True)
+    ):
+        # Correct answer, just too slow
+        return EndpointState.DEGRADED
+
+    return EndpointState.DOWN
+
+
+class Transition:
+    """A change of an endpoint's state."""
+
+    __slots__ = ("previous", "current", "result", "summary")
+
+    def __init__(
+        self,
+        previous: Optional[EndpointState],
+        current: EndpointState,
+        result: CheckResult,
+        summary: str = "",
+    ):
+        self.previous = previous
+        self.current = current
+        self.result = result
+        self.summary = summary
+
+    def describe(self) -> str:
+        previous = self.previous.value if self.previous else "unknown"
+        text = f"{self.result.endpoint_name} changed state: {previous} -> {self.current.value}"
+        return f"{text} ({self.summary})" if self.summary else text
+
+
+class StateTracker:
+    """
+    Tracks the state of one endpoint from its stream of check results.
+
+    A new state is only adopted after ``confirm_count`` consecutive results
+    agree. Flapping is detected from the share of raw results that differ from
+    the one before, over the last ``flap_window`` results: above
+    ``flap_threshold_high`` the endpoint is flapping, and it settles again once
+    the share falls to ``flap_threshold_low``.
+    """
+
+    __slots__ = (
+        "config",
+        "state",
+        "alerted",
+        "_candidate",
+        "_candidate_count",
+        "_last_raw",
+        "_changes",
+        "_change_count",
+        "_flapping_checks",
+    )
+
+    def __init__(self, config: StateConfig):
+        self.config = config
+        self.state: Optional[EndpointState] = None
+        self.alerted = False
+        self._candidate: Optional[EndpointState] = None
+        self._candidate_count = 0
+        self._last_raw: Optional[EndpointState] = None
+        self._changes: Deque[bool] = deque(maxlen=config.flap_window)
+        self._change_count = 0
+        self._flapping_checks = 0
+
+    def _record_raw(self, raw: EndpointState) -> float:
+        """Track raw state changes and return the current change ratio."""
+        changed = self._last_raw is not None and raw != self._last_raw
+        self._last_raw = raw
+
+        if len(self._changes) == self._changes.maxlen and self._changes[0]:
+            self._change_count -= 1
+        self._changes.append(changed)
+        if changed:
+            self._change_count += 1
+
+        if len(self._changes) < self.config.flap_window:
+            return 0.0
+        return self._change_count / len(self._changes)
+
+    def _move(self, state: EndpointState, result: CheckResult, summary: str = ""):
+        transition = Transition(self.state, state, result, summary)
+        self.state = state
+        self._candidate = None
+        self._candidate_count = 0
+        return transition
+
+    def observe(self, result: CheckResult) -> Optional[Transition]:
+        """
+        Feed a check result into the state machine.
+
+        Returns:
+            The transition caused by this result, or None if the state is unchanged
+        """
+        raw = classify(result)
+        ratio = self._record_raw(raw)
+
+        if self.state == EndpointState.FLAPPING:
+            self._flapping_checks += 1
+            if ratio > self.config.flap_threshold_low:
+                return None
+            summary = f"stopped flapping after {self._flapping_checks} checks"
+            self._flapping_checks = 0
+            return self._move(raw, result, summary)
+
+        if ratio >= self.config.flap_threshold_high:
+            self._flapping_checks = 0
+            return self._move(
+                EndpointState.FLAPPING,
+                result,
+                f"{self._change_count} state changes in the last "
+                f"{len(self._changes)} checks",
+            )
+
+        if self.state is None:
+            return self._move(raw, result)
+
+        if raw == self.state:
+            self._candidate = None
+            self._candidate_count = 0
+            return None
+
+        if raw == self._candidate:
+            self._candidate_count += 1
+        else:
+            self._candidate = raw
+            self._candidate_count = 1
+
+        if self._candidate_count >= self.config.confirm_count:
+            return self._move(raw, result)
+        return None
@@ -0,0 +1,105 @@
+"""Health state tracking for the status API."""
+import json
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from .endpoint import CheckResult
+
+
+def encode_result(result: CheckResult) -> bytes:
+    """Serialize a check result to JSON bytes."""
+    return json.dumps(result.to_dict(), default=str).encode("utf-8")
+
+
+class StatusStore:
+    """
+    Latest check result per endpoint, with cached serialization.
+
+    Every update bumps a global version. Results are only encoded when a reader
+    asks for them, and each endpoint is re-encoded at most once per update, so
+    repeated snapshot requests between checks reuse the same bytes.
+    """
+
+    def __init__(self, max_changes: int = 10000):
+        self.version = 0
+        self._results: Dict[str, CheckResult] = {}
+        self._versions: Dict[str, int] = {}
+        self._encoded: Dict[str, bytes] = {}
+        self._dirty: Set[str] = set()
+        self._changes: Deque[Tuple[int, CheckResult]] = deque(maxlen=max_changes)
+        self._evicted_version = 0
+        self._snapshot: Optional[bytes] = None
+        self._snapshot_version = -1
+
+    def update(self, result: CheckResult) -> None:
+        """Record the latest result for an endpoint."""
+        name = result.endpoint_name
+        previous = self._results.get(name)
+
+        self.version += 1
+        self._results[name] = result
+        self._versions[name] = self.version
+        self._dirty.add(name)
+
+        # Only state changes are added to the change feed
+        if previous is None or previous.status != result.status:
+            if len(self._changes) == self._changes.maxlen:
+                self._evicted_version = self._changes[0][0]
+            self._changes.append((self.version, result))
+
+    def _encode(self, name: str) -> bytes:
+        if name in self._dirty:
+            self._encoded[name] = encode_result(self._results[name])
+            self._dirty.discard(name)
+        return self._encoded[name]
+
+    def snapshot(self) -> Tuple[bytes, str]:
+        """
+        Return the serialized snapshot of all endpoints and its ETag.
+
+        Returns:
+            Tuple of the JSON body and the ETag for the current version
+        """
+        if self._snapshot is None or self._snapshot_version != self.version:
+            entries = [
+                json.dumps(name).encode("utf-8") + b":" + self._encode(name)
+                for name in self._results
+            ]
+            self._snapshot = (
+                b'{"version":%d,"endpoints":{' % self.version
+                + b",".join(entries)
+                + b"}}"
+            )
+            self._snapshot_version = self.version
+
+        return self._snapshot, self.etag()
+
+    def endpoint(self, name: str) -> Optional[Tuple[bytes, str]]:
+        """Return the serialized result and ETag for one endpoint, if known."""
+        if name not in self._results:
+            return None
+        return self._encode(name), f'"{self._versions[name]}"'
+
+    def changes(self, since: int) -> Tuple[List[CheckResult], int, bool]:
+        """
+        Return the results that changed state after a cursor.
+
+        Args:
+            since: The cursor (store version) returned by a previous call
+
+        Returns:
+            Tuple of the changed results (oldest first), the next cursor, and
+            whether changes were dropped because the cursor is too old
+        """
+        changed: List[CheckResult] = []
+        for version, result in reversed(self._changes):
+            if version <= since:
+                break
+            changed.append(result)
+        changed.reverse()
+
+        return changed, self.version, since < self._evicted_version
+
+    def etag(self) -> str:
+        """Return the ETag for the current store version."""
+        return f'"{self.version}"'
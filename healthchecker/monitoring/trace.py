@@ -0,0 +1,211 @@
+"""Recording and replay of response traces."""
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Iterator, Optional, Set
+
+import aiohttp
+
+from ..utils.clock import VirtualClock
+from .endpoint import CheckResult
+from .response_parser import body_digest
+
+logger = logging.getLogger(__name__)
+
+# Longest body kept in a trace; longer bodies are only recorded by digest
+MAX_TRACE_BODY = 1_000_000  # characters
+
+
+class TraceRecord:
+    """The outcome of one recorded check."""
+
+    __slots__ = (
+        "timestamp",
+        "endpoint",
+        "status_code",
+        "elapsed",
+        "error",
+        "message",
+        "digest",
+        "body",
+    )
+
+    def __init__(
+        self,
+        timestamp: float,
+        endpoint: str,
+        status_code: Optional[int],
+        elapsed: float,
+        error: Optional[str] = None,
+        message: str = "",
+        digest: Optional[str] = None,
+        body: Optional[str] = None,
+    ):
+        self.timestamp = timestamp
+        self.endpoint = endpoint
+        self.status_code = status_code
+        self.elapsed = elapsed
+        self.error = error
+        self.message = message
+        self.digest = digest
+        self.body = body
+
+
+class RecordingResponse:
+    """A response whose body was read up front so it can be recorded."""
+
+    def __init__(self, response: Any, body: Optional[str]):
+        self._response = response
+        self._body = body
+        self.status = response.status
+
+    async def text(self) -> str:
+        if self._body is None:
+            return await self._response.text()
+        return self._body
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+
+class RecordingSession:
+    """
+    Wraps a client session for one checker and keeps the last body it received.
+
+    Args:
+        session: The session that performs the requests
+    """
+
+    def __init__(self, session: Any):
+        self.session = session
+        self.body: Optional[str] = None
+
+    def __getattr__(self, method: str) -> Any:
+        request = getattr(self.session, method)
+
+        async def call(url: str, **kwargs: Any) -> RecordingResponse:
+            self.body = None
+            response = await request(url, **kwargs)
+            try:
+                self.body = await response.text()
+            except Exception:
+                # Undecodable bodies are recorded without one
+                self.body = None
+            return RecordingResponse(response, self.body)
+
+        return call
+
+    def take_body(self) -> Optional[str]:
+        body, self.body = self.body, None
+        return body
+
+
+class TraceWriter:
+    """
+    Appends check outcomes to a trace file as JSON lines.
+
+    Bodies are stored once per distinct digest, the first time they are seen,
+    so a trace of an endpoint that keeps returning the same document stays small.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._digests: Set[str] = set()
+
+    def record(
+        self, result: CheckResult, body: Optional[str], timestamp: float
+    ) -> None:
+        record: Dict[str, Any] = {
+            "t": round(timestamp, 3),
+            "e": result.endpoint_name,
+            "s": result.status_code,
+            "d": round(result.response_time, 6),
+        }
+        if result.status_code is None:
+            error = result.details.get("error")
+            record["x"] = "timeout" if error == "timeout" else "error"
+            record["m"] = str(result.details.get("error", result.message))
+
+        if body is not None:
+            digest = body_digest(body)
+            record["b"] = digest
+            if digest not in self._digests and len(body) <= MAX_TRACE_BODY:
+                self._digests.add(digest)
+                self._file.write(json.dumps({"body": digest, "text": body}) + "\n")
+
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def read_trace(path: str) -> Iterator[TraceRecord]:
+    """Read the check outcomes of a trace file, with their bodies resolved."""
+    bodies: Dict[str, str] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            try:
+                record = json.loads(line)
+                if "body" in record:
+                    bodies[record["body"]] = record["text"]
+                    continue
+                digest = record.get("b")
+                yield TraceRecord(
+                    timestamp=record["t"],
+                    endpoint=record["e"],
+                    status_code=record.get("s"),
+                    elapsed=record["d"],
+                    error=record.get("x"),
+                    message=record.get("m", ""),
+                    digest=digest,
+                    body=bodies.get(digest) if digest else None,
+                )
+            except (ValueError, KeyError, TypeError):
+                logger.warning(f"Skipping malformed trace record on line {number}")
+
+
+class ReplayResponse:
+    def __init__(self, status: int, body: Optional[str]):
+        self.status = status
+        self._body = body
+
+    async def text(self) -> str:
+        return self._body or ""
+
+
+class ReplaySession:
+    """
+    Stands in for a client session, answering with a recorded outcome.
+
+    The virtual clock is advanced by the recorded response time, so the checker
+    measures the same latency it did when the trace was recorded.
+    """
+
+    def __init__(self, clock: VirtualClock):
+        self.clock = clock
+        self.record: Optional[TraceRecord] = None
+        self._served = False
+
+    def start(self, record: TraceRecord) -> None:
+        """Serve a record to the next check."""
+        self.record = record
+        self._served = False
+
+    def __getattr__(self, method: str) -> Any:
+        return self._request
+
+    async def _request(self, url: str, **kwargs: Any) -> ReplayResponse:
+        record = self.record
+        assert record is not None
+        if not self._served:
+            # Only the first attempt takes the recorded time; retries of a
+            # failed request add just their backoff delay
+            self.clock.advance(record.elapsed)
+            self._served = True
+
+        if record.error == "timeout":
+            raise asyncio.TimeoutError()
+        if record.error:
+            raise aiohttp.ClientError(record.message)
+        return ReplayResponse(record.status_code or 0, record.body)
@@ -0,0 +1,354 @@
+"""HTTP transports used to perform health check requests."""
+import asyncio
+import json
+import logging
+import ssl
+from abc import ABC, abstractmethod
+from collections import deque
+from functools import lru_cache
+from typing import Any, Deque, Dict, Optional, Tuple
+from urllib.parse import SplitResult, urlsplit
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Idle keep-alive connections kept per host by the stream transport
+MAX_IDLE_CONNECTIONS = 32
+
+
+# asyncio.timeout (3.11+) avoids the task asyncio.wait_for wraps every call in
+_timeout = getattr(asyncio, "timeout", None)
+
+
+class TransportError(Exception):
+    """A request failed below HTTP: the connection broke or the reply was invalid."""
+
+
+class _NoReply(ConnectionError):
+    """The connection closed before the response started."""
+
+
+class Transport(ABC):
+    """
+    Performs the HTTP requests of endpoint checks.
+
+    A transport is used like a client session: ``get``, ``post`` and the other
+    method-named coroutines take the URL and the request keyword arguments of
+    an ``EndpointRuntime`` (``headers``, ``timeout`` and optionally ``json`` or
+    ``data``), and return a response with ``status``, ``headers`` and an async
+    ``text()``.
+    """
+
+    @abstractmethod
+    async def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        """Perform a request."""
+
+    async def close(self) -> None:
+        """Release the transport's connections."""
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+    async def get(self, url: str, **kwargs: Any) -> Any:
+        return await self.request("GET", url, **kwargs)
+
+    async def head(self, url: str, **kwargs: Any) -> Any:
+        return await self.request("HEAD", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> Any:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> Any:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs: Any) -> Any:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> Any:
+        return await self.request("DELETE", url, **kwargs)
+
+    async def options(self, url: str, **kwargs: Any) -> Any:
+        return await self.request("OPTIONS", url, **kwargs)
+
+
+class AiohttpTransport(Transport):
+    """
+    Requests through an ``aiohttp.ClientSession``.
+
+    The full-featured default: redirects, cookies, proxies from the environment
+    and every body encoding aiohttp supports.
+    """
+
+    def __init__(self, timeout: float = 60.0):
+        self.session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=timeout)
+        )
+        # Hand out the session's own methods, so no extra frame is added
+        for method in ("get", "head", "post", "put", "patch", "delete", "options"):
+            setattr(self, method, getattr(self.session, method))
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        return await self.session.request(method, url, **kwargs)
+
+    async def close(self) -> None:
+        await self.session.close()
+
+
+class Headers(Dict[str, str]):
+    """Response headers by lower-case name, looked up case-insensitively."""
+
+    def get(self, key: str, default: Any = None) -> Any:  # type: ignore[override]
+        return super().get(key.lower(), default)
+
+    def __getitem__(self, key: str) -> str:
+        return super().__getitem__(key.lower())
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and super().__contains__(key.lower())
+
+
+class StreamResponse:
+    """A fully read response of the stream transport."""
+
+    __slots__ = ("status", "reason", "headers", "body")
+
+    def __init__(self, status: int, reason: str, headers: Headers, body: bytes):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    async def read(self) -> bytes:
+        return self.body
+
+    async def text(self) -> str:
+        charset = "utf-8"
+        content_type = self.headers.get("content-type", "")
+        for parameter in content_type.split(";")[1:]:
+            name, _, value = parameter.strip().partition("=")
+            if name.lower() == "charset" and value:
+                charset = value.strip('"')
+        return self.body.decode(charset)
+
+    def release(self) -> None:
+        pass
+
+
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+@lru_cache(maxsize=4096)
+def _split(url: str) -> Tuple[SplitResult, Tuple[str, str, int]]:
+    """Split a URL, returning it with its connection pool key."""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.hostname:
+        raise TransportError(f"Unsupported URL: {url}")
+    port = parts.port or (443 if scheme == "https" else 80)
+    return parts, (scheme, parts.hostname, port)
+
+
+class StreamTransport(Transport):
+    """
+    A small HTTP/1.1 client on asyncio streams.
+
+    Meant for plain health probes: it sends a request, reads the status line,
+    headers and a ``Content-Length``, chunked or close-delimited body, and keeps
+    the connection open for the next check of the same host. It does not follow
+    redirects, decompress bodies or use proxies; endpoints that need those should
+    use the aiohttp transport.
+
+    Args:
+        max_idle: Idle keep-alive connections kept per host
+    """
+
+    def __init__(self, max_idle: int = MAX_IDLE_CONNECTIONS):
+        self.max_idle = max_idle
+        self._idle: Dict[Tuple[str, str, int], Deque[Connection]] = {}
+        self._ssl: Optional[ssl.SSLContext] = None
+        self.opened = 0
+        self.reused = 0
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> StreamResponse:
+        timeout = kwargs.get("timeout")
+        total = getattr(timeout, "total", timeout)
+        if total is None:
+            return await self._request(method, url, kwargs)
+        if _timeout is not None:
+            async with _timeout(total):
+                return await self._request(method, url, kwargs)
+        return await asyncio.wait_for(self._request(method, url, kwargs), total)
+
+    async def _request(
+        self, method: str, url: str, kwargs: Dict[str, Any]
+    ) -> StreamResponse:
+        parts, key = _split(url)
+        scheme, host, port = key
+        request = self._encode(method, parts, kwargs)
+
+        idle = self._idle.get(key)
+        while idle:
+            # A pooled connection may have been closed by the server meanwhile;
+            # only a failure before any reply is safe to retry on a new one
+            connection = idle.pop()
+            if connection[1].is_closing():
+                continue
+            self.reused += 1
+            try:
+                return await self._exchange(key, connection, method, request)
+            except _NoReply as e:
+                logger.debug(f"Kept-alive connection to {host} lost: {e}")
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                raise TransportError(f"Connection to {host} lost: {e}") from e
+
+        try:
+            reader, writer = await asyncio.open_connection(
+                host,
+                port,
+                ssl=self._ssl_context() if scheme == "https" else None,
+            )
+        except OSError as e:
+            raise TransportError(f"Cannot connect to {host}:{port}: {e}") from e
+        self.opened += 1
+        try:
+            return await self._exchange(key, (reader, writer), method, request)
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            raise TransportError(f"Connection to {host} lost: {e}") from e
+
+    def _ssl_context(self) -> ssl.SSLContext:
+        if self._ssl is None:
+            self._ssl = ssl.create_default_context()
+        return self._ssl
+
+    @staticmethod
+    def _encode(method: str, parts: Any, kwargs: Dict[str, Any]) -> bytes:
+        body = b""
+        headers = {"Host": parts.netloc, "Accept": "*/*", "Connection": "keep-alive"}
+        if kwargs.get("json") is not None:
+            body = json.dumps(kwargs["json"]).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        elif kwargs.get("data") is not None:
+            data = kwargs["data"]
+            body = data.encode("utf-8") if isinstance(data, str) else bytes(data)
+        if body or method in ("POST", "PUT", "PATCH"):
+            headers["Content-Length"] = str(len(body))
+        headers.update(kwargs.get("headers") or {})
+
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        lines = [f"{method} {target} HTTP/1.1"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+    async def _exchange(
+        self,
+        key: Tuple[str, str, int],
+        connection: Connection,
+        method: str,
+        request: bytes,
+    ) -> StreamResponse:
+        writer = connection[1]
+        try:
+            return await self._read_response(key, connection, method, request)
+        except asyncio.LimitOverrunError as e:
+            writer.close()
+            raise TransportError("Response line too long") from e
+        except BaseException:
+            # Including cancellation by the timeout: the connection is unusable
+            writer.close()
+            raise
+
+    async def _read_response(
+        self,
+        key: Tuple[str, str, int],
+        connection: Connection,
+        method: str,
+        request: bytes,
+    ) -> StreamResponse:
+        reader, writer = connection
+        try:
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readuntil(b"\r\n")
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            raise _NoReply(str(e) or e.__class__.__name__) from e
+
+        try:
+            version, status, reason = (
+                status_line.decode("latin-1").rstrip("\r\n").split(" ", 2) + [""]
+            )[:3]
+            status_code = int(status)
+        except ValueError as e:
+            raise TransportError(f"Invalid status line: {status_line!r}") from e
+
+        headers = Headers()
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == "HTTP/1.1" and (
+            headers.get("connection", "").lower() != "close"
+        )
+        if method == "HEAD" or status_code in (204, 304) or 100 <= status_code < 200:
+            body = b""
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await self._read_chunked(reader)
+        elif "content-length" in headers:
+            try:
+                length = int(headers["content-length"])
+            except ValueError as e:
+                raise TransportError("Invalid Content-Length") from e
+            body = await reader.readexactly(length)
+        else:
+            body = await reader.read()
+            keep_alive = False
+
+        if keep_alive:
+            idle = self._idle.setdefault(key, deque())
+            if len(idle) < self.max_idle:
+                idle.append(connection)
+            else:
+                writer.close()
+        else:
+            writer.close()
+
+        return StreamResponse(status_code, reason, headers, body)
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+        chunks = []
+        while True:
+            size_line = await reader.readuntil(b"\r\n")
+            try:
+                size = int(size_line.split(b";", 1)[0], 16)
+            except ValueError as e:
+                raise TransportError("Invalid chunk size") from e
+            if size == 0:
+                # Skip any trailers
+                while await reader.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+
+    async def close(self) -> None:
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+        self._idle.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "opened": self.opened,
+            "reused": self.reused,
+            "idle": sum(len(idle) for idle in self._idle.values()),
+        }
+
+
+# Registry of available transports, by the name endpoints select them with
+TRANSPORTS = {"aiohttp": AiohttpTransport, "stream": StreamTransport}
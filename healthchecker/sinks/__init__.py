@@ -0,0 +1 @@
+"""Result sink module."""
@@ -0,0 +1,30 @@
+"""Result sinks."""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ResultSink(ABC):
+    """Base class for all result sinks."""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+
+    @abstractmethod
+    async def write_batch(self, records: List[bytes]) -> None:
+        """
+        Write a batch of newline-terminated JSON records.
+
+        Args:
+            records: Encoded check results, one NDJSON line each
+
+        Raises:
+            Exception: If the batch could not be written
+        """
+        pass
+
+    async def close(self) -> None:
+        """Release any resources held by the sink."""
+        pass
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional, BinaryIO
+
+from .base import ResultSink
+
+logger = logging.getLogger(__name__)
+
+
+class FileSink(ResultSink):
+    """Result sink that appends NDJSON to a file with size-based rotation."""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.path = config.get("path")
+        self.max_bytes = int(config.get("max_bytes", 100 * 1024 * 1024))
+        self.backup_count = int(config.get("backup_count", 5))
+        self._file: Optional[BinaryIO] = None
+
+        if not self.path:
+            raise ValueError("File sink path is required")
+
+    def _open(self) -> BinaryIO:
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        return self._file
+
+    def _rotate(self) -> None:
+        """Rotate files the same way logging.handlers.RotatingFileHandler does."""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{i}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def _write(self, records: List[bytes]) -> None:
+        data = b"".join(records)
+        f = self._open()
+        if self.max_bytes > 0 and f.tell() > 0 and f.tell() + len(data) > self.max_bytes:
+            self._rotate()
+            f = self._open()
+        f.write(data)
+        f.flush()
+
+    async def write_batch(self, records: List[bytes]) -> None:
+        """Append a batch to the file without blocking the event loop."""
+        await asyncio.to_thread(self._write, records)
+
+    async def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,41 @@
+import logging
+import aiohttp
+from typing import Any, Dict, List, Optional
+
+from .base import ResultSink
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPSink(ResultSink):
+    """Result sink that posts NDJSON batches to an HTTP collector."""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.url = config.get("url")
+        self.headers = config.get("headers", {})
+        self.timeout = aiohttp.ClientTimeout(total=float(config.get("timeout", 10.0)))
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        if not self.url:
+            raise ValueError("HTTP sink url is required")
+
+    async def write_batch(self, records: List[bytes]) -> None:
+        """Post a batch to the collector."""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=self.timeout)
+
+        headers = {"Content-Type": "application/x-ndjson", **self.headers}
+        async with self._session.post(
+            self.url, data=b"".join(records), headers=headers
+        ) as response:
+            if response.status >= 300:
+                content = await response.text()
+                raise RuntimeError(
+                    f"Collector returned status {response.status}: {content}"
+                )
+
+    async def close(self) -> None:
+        if self._session:
+            await self._session.close()
+            self._session = None
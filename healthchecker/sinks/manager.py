@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from ..config.models import SinkConfig
+from ..monitoring.endpoint import CheckResult
+from ..monitoring.status import encode_result
+from .base import ResultSink
+from .file import FileSink
+from .http import HTTPSink
+from .unix_socket import UnixSocketSink
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between "records dropped" warnings for a sink
+DROP_LOG_INTERVAL = 60.0
+
+
+class SinkPipeline:
+    """Bounded buffer and background writer for a single sink."""
+
+    def __init__(self, name: str, sink: ResultSink, config: SinkConfig):
+        self.name = name
+        self.sink = sink
+        self.config = config
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=config.buffer_size)
+        self.written = 0
+        self.dropped = 0
+        self._last_drop_log = 0.0
+        self._pending: List[bytes] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def publish(self, record: bytes) -> None:
+        """Buffer a record, dropping it if the buffer is full."""
+        try:
+            self.queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self._drop(1)
+
+    def _drop(self, count: int) -> None:
+        self.dropped += count
+        now = time.monotonic()
+        if now - self._last_drop_log >= DROP_LOG_INTERVAL:
+            self._last_drop_log = now
+            logger.warning(
+                f"Result sink '{self.name}' is falling behind, "
+                f"{self.dropped} records dropped so far"
+            )
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def _next_batch(self) -> List[bytes]:
+        """Wait for a record, then collect more until the batch is full or due."""
+        # Collect into _pending so a batch in progress survives cancellation
+        batch = self._pending
+        batch.append(await self.queue.get())
+        deadline = time.monotonic() + self.config.flush_interval
+
+        while len(batch) < self.config.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _write(self, batch: List[bytes]) -> None:
+        try:
+            await self.sink.write_batch(batch)
+            self.written += len(batch)
+        except Exception as e:
+            logger.error(f"Error writing to result sink '{self.name}': {str(e)}")
+            self._drop(len(batch))
+
+    async def _run(self) -> None:
+        while True:
+            await self._write(await self._next_batch())
+            self._pending = []
+
+    async def stop(self) -> None:
+        """Stop the writer, flushing whatever is still buffered."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        batch, self._pending = self._pending, []
+        if batch and self.queue.empty():
+            await self._write(batch)
+            batch = []
+        while not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+            if len(batch) >= self.config.batch_size or self.queue.empty():
+                await self._write(batch)
+                batch = []
+
+        await self.sink.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "buffered": self.queue.qsize(),
+        }
+
+
+class SinkManager:
+    """Streams check results to the configured sinks."""
+
+    # Registry of available result sinks
+    SINKS = {"file": FileSink, "unix_socket": UnixSocketSink, "http": HTTPSink}
+
+    def __init__(self, config: Dict[str, SinkConfig]):
+        self.config = config
+        self.pipelines: Dict[str, SinkPipeline] = {}
+
+    def _initialize_sinks(self):
+        """Initialize all configured result sinks."""
+        for name, sink_config in self.config.items():
+            if not sink_config.enabled:
+                logger.info(f"Result sink '{name}' is disabled")
+                continue
+
+            sink_class = self.SINKS.get(sink_config.type)
+            if not sink_class:
+                logger.error(f"Unknown result sink type: {sink_config.type}")
+                continue
+
+            try:
+                sink = sink_class(sink_config.config)
+                self.pipelines[name] = SinkPipeline(name, sink, sink_config)
+                logger.info(f"Initialized result sink: {name} ({sink_config.type})")
+            except Exception as e:
+                logger.error(f"Error initializing result sink '{name}': {str(e)}")
+
+    async def start(self) -> None:
+        """Create the sinks and start their background writers."""
+        self._initialize_sinks()
+        for pipeline in self.pipelines.values():
+            pipeline.start()
+
+    async def stop(self) -> None:
+        """Flush and close all sinks."""
+        for name, pipeline in self.pipelines.items():
+            await pipeline.stop()
+            logger.info(f"Result sink '{name}' stopped: {pipeline.stats()}")
+        self.pipelines = {}
+
+    def publish(self, result: CheckResult) -> None:
+        """Hand a result to every sink without waiting for it to be written."""
+        if not self.pipelines:
+            return
+
+        record = encode_result(result) + b"\n"
+        for pipeline in self.pipelines.values():
+            pipeline.publish(record)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return written, dropped and buffered record counts per sink."""
+        return {name: pipeline.stats() for name, pipeline in self.pipelines.items()}
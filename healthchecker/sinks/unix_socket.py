@@ -0,0 +1,46 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from .base import ResultSink
+
+logger = logging.getLogger(__name__)
+
+
+class UnixSocketSink(ResultSink):
+    """Result sink that streams NDJSON to a Unix domain socket."""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.path = config.get("path")
+        self.timeout = float(config.get("timeout", 5.0))
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+        if not self.path:
+            raise ValueError("Unix socket sink path is required")
+
+    async def _connect(self) -> asyncio.StreamWriter:
+        if self._writer is None or self._writer.is_closing():
+            _, self._writer = await asyncio.wait_for(
+                asyncio.open_unix_connection(self.path), self.timeout
+            )
+        return self._writer
+
+    async def write_batch(self, records: List[bytes]) -> None:
+        """Write a batch to the socket, reconnecting on the next batch on error."""
+        writer = await self._connect()
+        try:
+            writer.write(b"".join(records))
+            await asyncio.wait_for(writer.drain(), self.timeout)
+        except Exception:
+            await self.close()
+            raise
+
+    async def close(self) -> None:
+        if self._writer:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except Exception:
+                pass
+            self._writer = None
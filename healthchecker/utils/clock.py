@@ -0,0 +1,51 @@
+"""Clocks, so time can be simulated."""
+import asyncio
+import time
+from datetime import datetime, timezone
+
+
+class Clock:
+    """The system clock."""
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+
+SYSTEM_CLOCK = Clock()
+
+
+class VirtualClock(Clock):
+    """
+    A clock that only moves when told to.
+
+    Sleeping advances the clock instead of waiting, so code written against a
+    Clock runs as fast as it can compute.
+
+    Args:
+        start: Initial time as a unix timestamp
+    """
+
+    def __init__(self, start: float = 0.0):
+        self.time = start
+
+    def monotonic(self) -> float:
+        return self.time
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self.time, timezone.utc)
+
+    async def sleep(self, seconds: float) -> None:
+        self.advance(seconds)
+
+    def advance(self, seconds: float) -> None:
+        self.time += max(0.0, seconds)
+
+    def set(self, timestamp: float) -> None:
+        """Move the clock forward to a point in time (never backwards)."""
+        self.time = max(self.time, timestamp)
@@ -0,0 +1,89 @@
+"""Registries of pluggable classes that are imported on first use."""
+import importlib
+import logging
+from typing import Any, Dict, Iterator, MutableMapping, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _entry_points(group: str) -> Any:
+    from importlib.metadata import entry_points
+
+    found = entry_points()
+    if hasattr(found, "select"):
+        return found.select(group=group)
+    # Python 3.9 returns a dict of groups
+    return found.get(group, ())
+
+
+class LazyRegistry(MutableMapping[str, Any]):
+    """
+    Classes by name, imported only when looked up.
+
+    Built-in entries are given as ``"package.module:Class"`` strings, so a
+    registry costs nothing until one of its classes is used. Packages add their
+    own entries through the entry point group, which is only scanned when a
+    name is not found among the known entries, or when the registry is listed.
+    Classes may also be assigned directly, as with a dict.
+
+    Args:
+        builtins: Import specs of the built-in classes by name
+        group: Entry point group to discover further classes in
+    """
+
+    def __init__(self, builtins: Dict[str, str], group: Optional[str] = None):
+        self._specs: Dict[str, Any] = dict(builtins)
+        self._loaded: Dict[str, Any] = {}
+        self._group = group
+        self._discovered = group is None
+
+    def _discover(self) -> None:
+        if self._discovered:
+            return
+        self._discovered = True
+        try:
+            for entry_point in _entry_points(self._group):
+                # Built-in and assigned entries take precedence
+                if entry_point.name not in self._specs:
+                    self._specs[entry_point.name] = entry_point
+        except Exception as e:
+            logger.error(f"Error discovering '{self._group}' entry points: {str(e)}")
+
+    def __getitem__(self, name: str) -> Any:
+        loaded = self._loaded.get(name)
+        if loaded is not None:
+            return loaded
+        if name not in self._specs:
+            self._discover()
+        spec = self._specs[name]
+        if isinstance(spec, str):
+            module, _, attribute = spec.partition(":")
+            loaded = getattr(importlib.import_module(module), attribute)
+        else:
+            loaded = spec.load()
+        self._loaded[name] = loaded
+        return loaded
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        self._specs[name] = value
+        self._loaded[name] = value
+
+    def __delitem__(self, name: str) -> None:
+        del self._specs[name]
+        self._loaded.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        if name not in self._specs:
+            self._discover()
+        return name in self._specs
+
+    def __iter__(self) -> Iterator[str]:
+        self._discover()
+        return iter(list(self._specs))
+
+    def __len__(self) -> int:
+        self._discover()
+        return len(self._specs)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({sorted(self._specs)})"
@@ -0,0 +1,241 @@
+import asyncio
+import sys
+from importlib.metadata import EntryPoint
+
+import pytest
+
+from healthchecker.alerting.manager import AlertManager
+from healthchecker.alerting.providers.base import AlertProvider
+from healthchecker.alerting.spool import AlertSpool
+from healthchecker.alerting.templates import AlertTemplate, render_message
+from healthchecker.config.models import AlertConfig, SpoolConfig
+from healthchecker.monitoring.endpoint import CheckResult, HealthStatus
+from healthchecker.utils import registry
+from healthchecker.utils.registry import LazyRegistry
+
+
+def make_result(**details):
+    return CheckResult(
+        endpoint_name="api",
+        url="https://example.com/health",
+        status=HealthStatus.CRITICAL,
+        response_time=1.5,
+        status_code=500,
+        message="Unexpected status code",
+        details=details,
+    )
+
+
+class RecordingProvider(AlertProvider):
+    def __init__(self, config):
+        super().__init__(config)
+        self.messages = []
+
+    async def send_alert(self, result, message):
+        self.messages.append(message)
+        return True
+
+
+class FlakyProvider(AlertProvider):
+    def __init__(self, config, failures=0):
+        super().__init__(config)
+        self.failures = failures
+        self.messages = []
+
+    async def send_alert(self, result, message):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("provider down")
+        self.messages.append((result.endpoint_name, message))
+        return True
+
+
+class TestAlertTemplates:
+    """Test alert template compilation and rendering."""
+
+    def test_template_fields_precomputed(self):
+        """Test that only referenced fields are collected."""
+        template = AlertTemplate("{endpoint_name} returned {status_code} ({region})")
+        assert template.fields == {"endpoint_name", "status_code", "region"}
+
+    def test_render_with_details_and_missing_keys(self):
+        """Test that missing fields render as a placeholder instead of raising."""
+        template = AlertTemplate("{endpoint_name}: {failure_count} / {unknown}")
+        message = template.render(make_result(failure_count=3))
+        assert message == "api: 3 / n/a"
+
+    def test_render_falls_back_to_default(self):
+        """Test that a template that fails to render uses the default format."""
+        template = AlertTemplate("{response_time:d}")
+        message = render_message(make_result(), template)
+        assert message.startswith("❌ Health check failed for api")
+
+    def test_invalid_template_rejected(self):
+        """Test that malformed templates fail config validation."""
+        with pytest.raises(ValueError):
+            AlertConfig(providers={}, templates={"critical": "{endpoint_name"})
+
+        with pytest.raises(ValueError):
+            AlertConfig(providers={}, templates={"critical": "{} failed"})
+
+
+class TestAlertManager:
+    """Test alert delivery."""
+
+    def test_message_rendered_once_for_all_providers(self):
+        """Test that every provider receives the same rendered message."""
+        config = AlertConfig(
+            providers={}, templates={"critical": "{endpoint_name} is {status}"}
+        )
+        manager = AlertManager(config)
+        manager.providers = {
+            "a": RecordingProvider({}),
+            "b": RecordingProvider({}),
+        }
+
+        assert asyncio.run(manager.send_alert(make_result()))
+
+        messages = [p.messages for p in manager.providers.values()]
+        assert messages == [["api is critical"], ["api is critical"]]
+        assert messages[0][0] is messages[1][0]
+
+    def test_failed_delivery_keeps_cooldown_slot(self):
+        """Test that an undelivered alert does not suppress the next one."""
+        manager = AlertManager(AlertConfig(providers={}))
+        manager.providers = {"a": FlakyProvider({}, failures=1)}
+
+        assert not asyncio.run(manager.send_alert(make_result()))
+        assert asyncio.run(manager.send_alert(make_result()))
+        assert not asyncio.run(manager.send_alert(make_result()))
+
+
+class TestProviderRegistry:
+    """Test lazily imported and discovered alert providers."""
+
+    def write_provider(self, module):
+        with open(f"{module}.py", "w") as f:
+            f.write(
+                "from healthchecker.alerting.providers.base import AlertProvider\n"
+                "class Provider(AlertProvider):\n"
+                "    async def send_alert(self, result, message):\n"
+                "        return True\n"
+            )
+
+    def test_builtins_imported_on_lookup(self):
+        """Test that a provider module is only imported when looked up."""
+        self.write_provider("lazy_provider")
+        providers = LazyRegistry({"lazy": "lazy_provider:Provider"})
+
+        assert "lazy" in providers
+        assert "lazy_provider" not in sys.modules
+        assert providers["lazy"].__name__ == "Provider"
+        assert "lazy_provider" in sys.modules
+        assert providers.get("missing") is None
+        assert list(providers) == ["lazy"]
+
+    def test_entry_point_discovery(self, monkeypatch):
+        """Test that providers registered by other packages can be configured."""
+        self.write_provider("plugin_provider")
+        discovered = [
+            EntryPoint("plugin", "plugin_provider:Provider", "test.providers"),
+            EntryPoint("email", "plugin_provider:Provider", "test.providers"),
+        ]
+        monkeypatch.setattr(registry, "_entry_points", lambda group: discovered)
+        providers = LazyRegistry(
+            {"email": "healthchecker.alerting.providers.email:EmailProvider"},
+            group="test.providers",
+        )
+        monkeypatch.setattr(AlertManager, "PROVIDERS", providers)
+
+        config = AlertConfig(
+            providers={
+                "pager": {"type": "plugin"},
+                "other": {"type": "unknown"},
+            }
+        )
+        manager = AlertManager(config)
+
+        assert sorted(manager.providers) == ["pager"]
+        assert type(manager.providers["pager"]).__name__ == "Provider"
+        # Built-in providers are not replaced by discovered ones
+        assert providers["email"].__name__ == "EmailProvider"
+        assert sorted(providers) == ["email", "plugin"]
+
+
+class TestAlertSpool:
+    """Test durable alert delivery."""
+
+    def test_retries_with_backoff_until_delivered(self, tmp_path):
+        """Test that a failing provider gets the alert once it recovers."""
+        config = SpoolConfig(
+            path=str(tmp_path / "alerts.spool"), initial_backoff=0.01
+        )
+        provider = FlakyProvider({}, failures=3)
+        spool = AlertSpool(config, {"slack": provider})
+
+        async def run():
+            await spool.start()
+            await spool.enqueue(make_result(), "first")
+            await spool.enqueue(make_result(), "second")
+            for _ in range(100):
+                if spool.delivered == 2:
+                    break
+                await asyncio.sleep(0.01)
+            await spool.stop()
+
+        asyncio.run(run())
+        assert [message for _, message in provider.messages] == ["first", "second"]
+        assert spool.stats()["pending"] == {"slack": 0}
+        assert spool.backoff["slack"] == 0.0
+
+    def test_survives_restart(self, tmp_path):
+        """Test that undelivered alerts are delivered by the next instance."""
+        config = SpoolConfig(path=str(tmp_path / "alerts.spool"), max_entries=2)
+
+        async def first_run():
+            spool = AlertSpool(config, {"slack": FlakyProvider({}, failures=100)})
+            await spool.start()
+            for message in ["a", "b", "c"]:
+                await spool.enqueue(make_result(), message)
+            await spool.stop()
+            return spool
+
+        spool = asyncio.run(first_run())
+        assert spool.dropped == 1
+
+        # Simulate a crash in the middle of writing a record
+        with open(config.path, "a") as f:
+            f.write('{"add": 9, "prov')
+
+        provider = FlakyProvider({})
+
+        async def second_run():
+            spool = AlertSpool(config, {"slack": provider})
+            await spool.start()
+            for _ in range(100):
+                if spool.delivered == 2:
+                    break
+                await asyncio.sleep(0.01)
+            await spool.stop()
+
+        asyncio.run(second_run())
+        assert provider.messages == [("api", "b"), ("api", "c")]
+
+    def test_compacts_when_full(self, tmp_path):
+        """Test that acknowledged alerts are removed from the spool file."""
+        config = SpoolConfig(path=str(tmp_path / "alerts.spool"), max_bytes=2048)
+        provider = FlakyProvider({})
+        spool = AlertSpool(config, {"slack": provider})
+
+        async def run():
+            await spool.start()
+            for i in range(50):
+                await spool.enqueue(make_result(), f"alert {i}")
+                await asyncio.sleep(0)
+            while spool.delivered < 50:
+                await asyncio.sleep(0.01)
+            await spool.stop()
+
+        asyncio.run(run())
+        assert len(provider.messages) == 50
+        assert (tmp_path / "alerts.spool").stat().st_size <= 2048
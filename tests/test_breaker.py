@@ -0,0 +1,139 @@
+import asyncio
+
+import aiohttp
+
+from healthchecker.config.models import CircuitBreakerConfig, EndpointConfig
+from healthchecker.monitoring.breaker import CLOSED, HALF_OPEN, OPEN, HostBreakers
+from healthchecker.monitoring.endpoint import EndpointChecker, HealthStatus
+from healthchecker.utils.clock import VirtualClock
+
+
+class FakeResponse:
+    status = 200
+
+    async def text(self):
+        return "ok"
+
+
+class FlakySession:
+    """Fails to connect while ``down`` is set, counting the requests sent."""
+
+    def __init__(self):
+        self.down = True
+        self.requests = 0
+
+    async def get(self, url, **kwargs):
+        self.requests += 1
+        if self.down:
+            raise aiohttp.ClientConnectionError("Connection refused")
+        return FakeResponse()
+
+
+def make_breakers(clock, **kwargs):
+    config = CircuitBreakerConfig(enabled=True, **kwargs)
+    return HostBreakers(config, clock)
+
+
+class TestCircuitBreaker:
+    """Test the per-host circuit breaker state machine."""
+
+    def test_opens_probes_and_closes(self):
+        """Test opening, probing at a doubling interval, and recovery."""
+        clock = VirtualClock()
+        breakers = make_breakers(
+            clock, failure_threshold=3, probe_interval=10, max_probe_interval=25
+        )
+        breaker = breakers.for_url("https://api.example.com/health")
+        assert breakers.for_url("https://API.example.com/other") is breaker
+        assert breakers.for_url("https://api.example.com:8443/") is not breaker
+
+        error = ConnectionError("refused")
+        for _ in range(2):
+            assert breaker.allow()
+            breaker.record_failure(error)
+        assert breaker.state == CLOSED
+        breaker.record_failure(error)
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+
+        # One probe once the interval has passed, the rest still refused
+        clock.advance(10)
+        assert breaker.allow()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow()
+        breaker.record_failure(error)
+        assert (breaker.state, breaker.interval) == (OPEN, 20)
+
+        clock.advance(10)
+        assert not breaker.allow()
+        clock.advance(10)
+        assert breaker.allow()
+        breaker.record_failure(error)
+        assert breaker.interval == 25
+
+        # A probe that never reports back does not block later probes
+        clock.advance(25)
+        assert breaker.allow()
+        clock.advance(25)
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.interval == 10
+        assert breakers.stats() == {"hosts": 2, "open": {}}
+
+    def test_success_resets_failure_count(self):
+        """Test that only consecutive failures open the breaker."""
+        breaker = make_breakers(VirtualClock(), failure_threshold=2).for_url(
+            "http://db:5984/"
+        )
+        breaker.record_failure(ConnectionError())
+        breaker.record_success()
+        breaker.record_failure(ConnectionError())
+        assert breaker.state == CLOSED
+
+
+class TestCheckerCircuitBreaker:
+    """Test checks against a host whose breaker is open."""
+
+    def test_checks_fail_fast_until_recovery(self):
+        """Test that an open circuit fails checks without sending requests."""
+        clock = VirtualClock()
+        breakers = make_breakers(clock, failure_threshold=3, probe_interval=30)
+        session = FlakySession()
+        checkers = [
+            EndpointChecker(
+                EndpointConfig(url=f"http://api.internal/{path}", name=path),
+                session,
+                clock=clock,
+                breaker=breakers.for_url(f"http://api.internal/{path}"),
+            )
+            for path in ("a", "b")
+        ]
+
+        async def run():
+            # The first check's three attempts open the breaker
+            first = await checkers[0].check()
+            second = await checkers[1].check()
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert session.requests == 3
+        assert first.details["error_type"] == "ClientConnectionError"
+        assert second.status == HealthStatus.CRITICAL
+        assert second.details == {"error": "circuit_open", "host": "api.internal"}
+        assert second.message.startswith("Circuit open for api.internal after 3")
+        assert "Connection refused" in second.message
+
+        # The probe fails: open again, with no retries sent
+        clock.advance(30)
+        result = asyncio.run(checkers[1].check())
+        assert session.requests == 4
+        assert result.details["error"] == "circuit_open"
+        assert breakers.stats()["open"]["api.internal"]["probe_interval"] == 60
+
+        session.down = False
+        clock.advance(60)
+        result = asyncio.run(checkers[0].check())
+        assert result.status == HealthStatus.OK
+        assert asyncio.run(checkers[1].check()).status == HealthStatus.OK
+        assert breakers.stats()["open"] == {}
@@ -0,0 +1,200 @@
+import asyncio
+import json
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from healthchecker.alerting.manager import AlertManager
+from healthchecker.config.models import AppConfig, EndpointConfig
+from healthchecker.monitoring.checker import MonitoringManager
+from healthchecker.monitoring.endpoint import EndpointChecker, HealthStatus
+from healthchecker.monitoring.response_parser import validate_components
+from healthchecker.utils.clock import VirtualClock
+
+DOCUMENT = {
+    "status": "degraded",
+    "components": [
+        {"name": "db", "status": "ok", "replicas": 3},
+        {"name": "cache", "status": "down", "replicas": 1},
+        {"name": "db", "status": "down"},
+        {"status": "ok"},
+    ],
+    "checks": {"db": {"up": True}, "queue": {"up": False}},
+}
+
+
+class FakeResponse:
+    def __init__(self, body, status=200):
+        self.status = status
+        self.body = body
+
+    async def text(self):
+        return self.body
+
+
+class DocumentSession:
+    """Answers every request with the current document, counting requests."""
+
+    def __init__(self, document):
+        self.document = document
+        self.requests = 0
+
+    async def get(self, url, **kwargs):
+        self.requests += 1
+        if isinstance(self.document, str):
+            return FakeResponse(self.document)
+        return FakeResponse(json.dumps(self.document), status=503)
+
+
+class TestValidateComponents:
+    """Test selecting and checking components of a document."""
+
+    def test_named_by_path(self):
+        """Test components named by a path within each, first entry winning."""
+        outcomes = validate_components(
+            DOCUMENT, "$.components[*]", "$.name", {"$.status": "ok"}
+        )
+        assert outcomes == {"db": {"$.status": True}, "cache": {"$.status": False}}
+
+    def test_named_by_key(self):
+        """Test components named by their key, and without checks."""
+        outcomes = validate_components(DOCUMENT, "$.checks.*", None, {"$.up": True})
+        assert outcomes == {"db": {"$.up": True}, "queue": {"$.up": False}}
+        assert list(validate_components(DOCUMENT, "$.components[*]", None, {})) == [
+            "0",
+            "1",
+            "2",
+            "3",
+        ]
+
+
+class TestComponentChecks:
+    """Test virtual endpoints derived from an aggregate endpoint."""
+
+    def make_checker(self, session, clock):
+        config = EndpointConfig(
+            url="https://status.internal/health",
+            name="status",
+            expected_status_codes=[200, 503],
+            failure_threshold=2,
+            components={
+                "selector": "$.components[*]",
+                "name_path": "$.name",
+                "json_path_checks": {"$.status": "ok"},
+            },
+        )
+        return EndpointChecker(config, session, clock=clock)
+
+    def test_component_results(self):
+        """Test one result per component, each with its own failure window."""
+        clock = VirtualClock()
+        session = DocumentSession(DOCUMENT)
+        checker = self.make_checker(session, clock)
+
+        async def run():
+            result = await checker.check()
+            return result, checker.component_results(result)
+
+        result, components = asyncio.run(run())
+        assert result.status == HealthStatus.OK
+        assert "components" not in result.details["body_checks"]
+        assert [c.endpoint_name for c in components] == ["status/db", "status/cache"]
+        db, cache = components
+        assert db.status == HealthStatus.OK
+        assert db.status_code == 503 and db.timestamp == result.timestamp
+        assert cache.status == HealthStatus.CRITICAL
+        assert cache.message == "Component check failed: $.status"
+        assert cache.details["component"] == "cache"
+        assert "alert_required" not in cache.details
+
+        # The same body again is not parsed again, but still counts per component
+        clock.advance(10)
+        result, components = asyncio.run(run())
+        assert checker.memo_hits == 1
+        assert components[1].details["alert_required"]
+        assert components[1].details["failure_count"] == 2
+        assert "alert_required" not in components[0].details
+        assert session.requests == 2
+
+    def test_missing_component_and_unreadable_document(self):
+        """Test that a vanished component fails and a bad body yields nothing."""
+        clock = VirtualClock()
+        session = DocumentSession(DOCUMENT)
+        checker = self.make_checker(session, clock)
+
+        async def run():
+            result = await checker.check()
+            return result, checker.component_results(result)
+
+        asyncio.run(run())
+        session.document = {"components": [{"name": "cache", "status": "ok"}]}
+        _, components = asyncio.run(run())
+        assert [(c.endpoint_name, c.status) for c in components] == [
+            ("status/cache", HealthStatus.OK),
+            ("status/db", HealthStatus.CRITICAL),
+        ]
+        assert components[1].details["error"] == "component_missing"
+
+        session.document = "<html>maintenance</html>"
+        result, components = asyncio.run(run())
+        assert result.status == HealthStatus.CRITICAL
+        assert components == []
+
+    def test_run_once_includes_components(self):
+        """Test that a one-shot sweep reports components after their endpoint."""
+
+        async def status(request):
+            return web.json_response(DOCUMENT)
+
+        app = web.Application()
+        app.router.add_get("/status", status)
+
+        async def run():
+            async with TestServer(app) as server:
+                config = AppConfig(
+                    endpoints=[
+                        {
+                            "url": str(server.make_url("/status")),
+                            "name": "api",
+                            "components": {
+                                "selector": "$.checks.*",
+                                "json_path_checks": {"$.up": True},
+                            },
+                        }
+                    ],
+                    alerting={"providers": {}},
+                )
+                manager = MonitoringManager(config, AlertManager(config.alerting))
+                return await manager.run_once()
+
+        results = asyncio.run(run())
+        assert [(r.endpoint_name, r.status) for r in results] == [
+            ("api", HealthStatus.OK),
+            ("api/db", HealthStatus.OK),
+            ("api/queue", HealthStatus.CRITICAL),
+        ]
+
+    def test_components_share_dependencies(self):
+        """Test that component alerts are held back by their endpoint's parents."""
+        config = AppConfig(
+            endpoints=[
+                {"url": "https://lb", "name": "lb"},
+                {"url": "https://api", "name": "api", "depends_on": ["lb"]},
+            ],
+            alerting={"providers": {}},
+            state={"change_only": True},
+        )
+        manager = MonitoringManager(config, AlertManager(config.alerting))
+        checker = self.make_checker(DocumentSession(DOCUMENT), VirtualClock())
+        result = asyncio.run(checker.check())
+        cache = checker.component_results(result)[1]
+
+        manager.component_owners["status/cache"] = "api"
+        asyncio.run(manager._process_result("status/cache", cache))
+        assert manager.check_results["status/cache"] is cache
+        assert "status/cache" in manager.states
+        assert manager._down_ancestor("status/cache") is None
+
+        manager.check_results["lb"] = result
+        result.status = HealthStatus.CRITICAL
+        assert manager._down_ancestor("status/cache") == "lb"
@@ -3,11 +3,14 @@ import pytest
 import tempfile
 import yaml
 
+from healthchecker.config.dependencies import DependencyGraph
 from healthchecker.config.models import (
+    AppConfig,
     EndpointConfig,
     RetryConfig,
     AlertConfig,
 )
+from healthchecker.config.inventory import InventoryError
 from healthchecker.config.loader import load_config, resolve_env_vars
 
 
@@ -98,3 +101,125 @@ class TestConfigLoader:
 
         finally:
             os.unlink(temp.name)
+
+
+class TestInventory:
+    """Test endpoints loaded from NDJSON and CSV inventories."""
+
+    def write_config(self, inventory, endpoints=None):
+        config = {"alerting": {"providers": {}}, "inventory": inventory}
+        if endpoints is not None:
+            config["endpoints"] = endpoints
+        os.makedirs("conf", exist_ok=True)
+        with open("conf/config.yaml", "w") as f:
+            yaml.dump(config, f)
+        return "conf/config.yaml"
+
+    def test_ndjson_and_csv_with_defaults(self):
+        """Test rows merged over defaults, from both formats."""
+        os.environ["INVENTORY_TOKEN"] = "s3cret"
+        os.makedirs("conf", exist_ok=True)
+        with open("conf/services.ndjson", "w") as f:
+            f.write('{"url": "https://a.example.com/health", "name": "a"}\n\n')
+            f.write(
+                '{"url": "https://b.example.com/health", "name": "b", '
+                '"interval": 10, "headers": {"Authorization": "${INVENTORY_TOKEN}"}}\n'
+            )
+        with open("conf/hosts.csv", "w") as f:
+            f.write("url,name,labels.team,retry.attempts,expected_status_codes\n")
+            f.write("https://c.example.com/,c,web,5,\n")
+            f.write('https://d.example.com/,d,,,"[200, 204]"\n')
+
+        path = self.write_config(
+            [
+                {
+                    "path": "services.ndjson",
+                    "defaults": {
+                        "interval": 30,
+                        "headers": {"Accept": "application/json"},
+                        "labels": {"source": "cmdb"},
+                    },
+                },
+                {"path": "hosts.csv", "defaults": {"labels": {"source": "dns"}}},
+            ],
+            endpoints=[{"url": "https://lb.example.com", "name": "lb"}],
+        )
+        config = load_config(path)
+
+        endpoints = {e.name: e for e in config.endpoints}
+        assert list(endpoints) == ["lb", "a", "b", "c", "d"]
+        assert endpoints["a"].interval == 30
+        assert endpoints["a"].labels == {"source": "cmdb"}
+        assert endpoints["b"].interval == 10
+        assert endpoints["b"].headers == {
+            "Accept": "application/json",
+            "Authorization": "s3cret",
+        }
+        assert endpoints["c"].labels == {"source": "dns", "team": "web"}
+        assert endpoints["c"].retry.attempts == 5
+        assert endpoints["d"].expected_status_codes == [200, 204]
+        assert endpoints["d"].labels == {"source": "dns"}
+
+    def test_row_errors(self):
+        """Test that invalid rows are reported by line, or skipped if allowed."""
+        with open("bad.ndjson", "w") as f:
+            f.write('{"url": "https://ok.example.com"}\n')
+            f.write('{"name": "no-url"}\n')
+            f.write("not json\n")
+            f.write('{"url": "https://x.example.com", "interval": "often"}\n')
+
+        config = {"alerting": {"providers": {}}, "inventory": [{"path": "bad.ndjson"}]}
+        with open("config.yaml", "w") as f:
+            yaml.dump(config, f)
+        with pytest.raises(InventoryError) as error:
+            load_config("config.yaml")
+        assert error.value.invalid == 3
+        assert error.value.errors[0] == "bad.ndjson:2: url: Field required"
+        assert error.value.errors[1].startswith("bad.ndjson:3: invalid JSON")
+        assert error.value.errors[2].startswith("bad.ndjson:4: interval: ")
+
+        config["inventory"][0]["skip_invalid"] = True
+        with open("config.yaml", "w") as f:
+            yaml.dump(config, f)
+        assert [e.name for e in load_config("config.yaml").endpoints] == [
+            "ok.example.com"
+        ]
+
+    def test_duplicate_names_across_sources(self):
+        """Test that inventory endpoints are validated with the rest."""
+        with open("dup.csv", "w") as f:
+            f.write("url,name\nhttps://a.example.com,api\n")
+        config = {
+            "alerting": {"providers": {}},
+            "endpoints": [{"url": "https://b.example.com", "name": "api"}],
+            "inventory": [{"path": "dup.csv"}],
+        }
+        with open("config.yaml", "w") as f:
+            yaml.dump(config, f)
+        with pytest.raises(ValueError, match="Endpoint names must be unique"):
+            load_config("config.yaml")
+
+
+class TestDependencies:
+    """Test endpoint dependency validation."""
+
+    def test_dependency_order_and_ancestors(self):
+        """Test that parents are ordered before children."""
+        graph = DependencyGraph({"app": ["db", "lb"], "db": ["lb"], "lb": []})
+        assert graph.order == ["lb", "db", "app"]
+        assert graph.ancestors["app"] == ["db", "lb"]
+
+    def test_dependency_cycle_rejected(self):
+        """Test that cycles and unknown dependencies fail validation."""
+        endpoints = [
+            {"url": "https://a.example.com", "depends_on": ["b.example.com"]},
+            {"url": "https://b.example.com", "depends_on": ["a.example.com"]},
+        ]
+        with pytest.raises(ValueError, match="cycle"):
+            AppConfig(endpoints=endpoints, alerting={"providers": {}})
+
+        with pytest.raises(ValueError, match="unknown"):
+            AppConfig(
+                endpoints=[{"url": "https://a.example.com", "depends_on": ["x"]}],
+                alerting={"providers": {}},
+            )
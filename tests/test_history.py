@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+
+from healthchecker.cli import parse_time
+from healthchecker.history.store import HistoryStore
+from healthchecker.monitoring.endpoint import CheckResult, HealthStatus
+
+
+def make_result(name, timestamp, status=HealthStatus.OK, response_time=0.1):
+    result = CheckResult(
+        endpoint_name=name,
+        url="https://example.com/health",
+        status=status,
+        response_time=response_time,
+        status_code=200 if status == HealthStatus.OK else 500,
+    )
+    result.timestamp = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    return result
+
+
+class TestHistoryStore:
+    """Test the columnar history store."""
+
+    def test_query_availability_and_percentiles(self):
+        """Test availability and latency percentiles over a time range."""
+        store = HistoryStore("history", segment_duration=100)
+        results = [
+            make_result("api", 1000 + i * 10, response_time=(i + 1) / 10)
+            for i in range(20)
+        ]
+        results[3] = make_result("api", 1030, HealthStatus.CRITICAL, 0.4)
+        results.append(make_result("other", 1050, HealthStatus.CRITICAL))
+        assert store.append(results) == 21
+
+        # Segments are partitioned by time
+        assert store.segments(0, 2000) == [1000, 1100]
+
+        report = HistoryStore("history").query("api", 1000, 1100, [50, 100])
+        assert report["checks"] == 10
+        assert report["ok"] == 9
+        assert report["availability"] == 0.9
+        assert round(report["latency"]["p50"], 2) == 0.5
+        assert round(report["latency"]["p100"], 2) == 1.0
+
+    def test_unknown_endpoint_and_prune(self):
+        """Test that unknown endpoints are empty and old segments are pruned."""
+        store = HistoryStore("history", segment_duration=100)
+        store.append([make_result("api", 1000), make_result("api", 1200)])
+
+        assert store.query("missing", 0, 2000)["checks"] == 0
+        assert store.prune(1150) == 1
+        assert store.query("api", 0, 2000)["checks"] == 1
+
+
+def test_parse_time():
+    """Test relative and absolute time parsing for history queries."""
+    assert parse_time("24h", 100000.0) == 100000.0 - 86400
+    assert parse_time("1970-01-01T00:01:00", 0) == 60.0
@@ -0,0 +1,100 @@
+import os
+import subprocess
+import sys
+
+import healthchecker
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(healthchecker.__file__)))
+
+# Modules only needed to perform checks or deliver alerts
+HEAVY_MODULES = (
+    "aiohttp",
+    "jsonpath_ng",
+    "smtplib",
+    "email.mime",
+    "healthchecker.monitoring.checker",
+    "healthchecker.alerting.providers.email",
+    "healthchecker.alerting.providers.slack",
+)
+
+CONFIG = """
+endpoints:
+  - url: https://example.com/health
+    json_path_checks:
+      $.status: ok
+alerting:
+  providers:
+    mail:
+      type: email
+      config: {}
+"""
+
+
+def imported_modules(code):
+    """Run code in a fresh interpreter and return what it imported, with times."""
+    code += "\nimport sys\nprint('\\n'.join(sys.modules))\n"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": ROOT},
+        check=True,
+    )
+    # Modules imported through importlib are missing from the timings
+    modules = dict.fromkeys(result.stdout.split(), 0.0)
+    # Lines read "import time: <self us> | <cumulative us> | <indented name>"
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                modules[name.strip()] = int(cumulative) / 1e6
+    return modules
+
+
+def heavy(modules):
+    return sorted(
+        name
+        for name in modules
+        if any(name == m or name.startswith(m + ".") for m in HEAVY_MODULES)
+    )
+
+
+class TestImportTime:
+    """Test that commands only import what they need."""
+
+    def test_cli_import_is_light(self):
+        """Test that importing the CLI leaves checks and alerting unloaded."""
+        modules = imported_modules("import healthchecker.cli")
+        assert heavy(modules) == []
+
+    def test_validate_only_is_light(self):
+        """Test that validating a configuration loads no check or alert code."""
+        with open("config.yaml", "w") as f:
+            f.write(CONFIG)
+        code = (
+            "import sys\n"
+            "from healthchecker import cli\n"
+            "sys.argv = ['healthchecker', '-c', 'config.yaml', '--validate-only']\n"
+            "cli.main()\n"
+        )
+        try:
+            imported_modules(code)
+        except subprocess.CalledProcessError as e:
+            raise AssertionError(e.stderr[-2000:]) from e
+        # main() exits; import the same path again to inspect what it loaded
+        modules = imported_modules(
+            "from healthchecker import cli\n"
+            "config = cli.load_config('config.yaml')\n"
+        )
+        assert heavy(modules) == []
+
+    def test_alert_manager_loads_only_configured_providers(self):
+        """Test that providers are imported when configured, not before."""
+        modules = imported_modules(
+            "from healthchecker.alerting.manager import AlertManager\n"
+            "from healthchecker.config.models import AlertConfig\n"
+            "AlertManager(AlertConfig(providers={'m': {'type': 'email'}}))\n"
+        )
+        assert "healthchecker.alerting.providers.email" in modules
+        assert "healthchecker.alerting.providers.slack" not in modules
+        assert "aiohttp" not in modules
@@ -0,0 +1,125 @@
+import jsonpath_ng.ext as jsonpath
+import pytest
+
+from healthchecker.monitoring.fast_jsonpath import PathSet, compile_path
+from healthchecker.monitoring.response_parser import validate_json_paths
+
+DOCUMENTS = [
+    {
+        "status": "ok",
+        "version": "1.2.3",
+        "checks": [
+            {"name": "db", "status": "ok", "latency": 3, "tags": ["primary"]},
+            {"name": "cache", "status": "degraded", "latency": "12"},
+            {"name": "queue", "status": "ok", "latency": 7.5},
+        ],
+        "components": {"db": {"up": True}, "cache": {"up": False}},
+        "empty": [],
+        "nothing": None,
+        "e-f": 0,
+    },
+    [{"status": "ok"}, {"status": "down"}],
+    {"checks": {"a": {"status": "ok"}, "b": {"status": "down"}}},
+    "plain",
+    None,
+]
+
+EXPRESSIONS = [
+    "$",
+    "$.status",
+    "$['status']",
+    "$.e-f",
+    "$.missing",
+    "$.checks[0].name",
+    "$.checks[2].status",
+    "$.checks[5].name",
+    "$.checks[-1].name",
+    "$.checks[*].status",
+    "$.checks[1:].name",
+    "$.checks.name",
+    "$.components.*.up",
+    "$.components.db.up",
+    "$.*",
+    "$[*].status",
+    "$[0].status",
+    "$.empty[*]",
+    "$.nothing[*]",
+    "$.nothing.status",
+    "$.status[*]",
+    "$.checks[?(@.status == 'ok')].name",
+    "$.checks[?(@.status != 'ok')].name",
+    "$.checks[?(@.latency > 5)].name",
+    "$.checks[?(@.latency >= 7.5)].name",
+    "$.checks[?(@.tags)].name",
+    "$.checks[?(@.tags[0] == 'primary')].name",
+    "$.checks[?(@.name =~ '^c')].status",
+    "$.checks[?(@.status == 'ok' & @.latency < 5)].name",
+    "$.checks[?status = 'degraded'].name",
+    "$.components[?(@.up == true)]",
+    "$[?(@.status == 'down')].status",
+]
+
+
+def reference(expression, data):
+    """First match according to jsonpath_ng, or None if it raises."""
+    try:
+        matches = [match.value for match in jsonpath.parse(expression).find(data)]
+    except Exception:
+        return None
+    return ("match", matches[0]) if matches else ("none",)
+
+
+class TestFastJSONPath:
+    """Test the single-pass JSONPath evaluator against jsonpath_ng."""
+
+    @pytest.mark.parametrize("expression", EXPRESSIONS)
+    def test_supported(self, expression):
+        """Test that the common subset compiles to fast steps."""
+        assert compile_path(expression) is not None
+
+    @pytest.mark.parametrize("expression", ["$..status", "$.checks[*].`len`"])
+    def test_unsupported_falls_back(self, expression):
+        """Test that other expressions are left to jsonpath_ng."""
+        assert PathSet((expression,)).fallback == {expression}
+
+    @pytest.mark.parametrize("document", DOCUMENTS)
+    def test_equivalent_first_match(self, document):
+        """Test that every path finds the same first match as jsonpath_ng."""
+        found = PathSet(tuple(EXPRESSIONS)).find_first(document)
+        for expression in EXPRESSIONS:
+            expected = reference(expression, document)
+            if expected is None:
+                # jsonpath_ng raised; the fast path must not report a match
+                # that jsonpath_ng could not produce either
+                continue
+            actual = ("match", found[expression]) if expression in found else ("none",)
+            assert actual == expected, expression
+
+    def test_traversal_stops_at_first_match(self):
+        """Test that a matched path does not walk the rest of the document."""
+        visited = []
+
+        class Item(dict):
+            def get(self, key, default=None):
+                visited.append(self["id"])
+                return super().get(key, default)
+
+        document = {"items": [Item(id=i, ok=True) for i in range(100)]}
+        paths = PathSet(("$.items[*].ok", "$.items[*].id"))
+        assert paths.find_first(document) == {"$.items[*].ok": True, "$.items[*].id": 0}
+        assert visited == [0, 0]
+
+    def test_validate_json_paths_mixes_fast_and_fallback(self):
+        """Test that results are the same whichever evaluator handles a path."""
+        checks = {
+            "$.status": "ok",
+            "$..latency": 3,
+            "$.checks[?(@.name == 'cache')].status": "ok",
+            "$.checks[0].name": "db",
+        }
+        assert validate_json_paths(DOCUMENTS[0], checks) == {
+            "$.status": True,
+            "$..latency": True,
+            "$.checks[?(@.name == 'cache')].status": False,
+            "$.checks[0].name": True,
+        }
@@ -0,0 +1,118 @@
+import asyncio
+import random
+
+import pytest
+
+from healthchecker.config.models import EndpointConfig, LatencyConfig
+from healthchecker.monitoring.endpoint import EndpointChecker, HealthStatus
+from healthchecker.monitoring.latency import (
+    RELATIVE_ACCURACY,
+    LatencySketch,
+    LatencyTracker,
+)
+
+
+class TestLatencySketch:
+    """Test the sliding-window latency histogram."""
+
+    def test_quantiles_within_accuracy(self):
+        """Test that quantiles match the exact values within the relative accuracy."""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(-3, 1) for _ in range(5000)]
+        sketch = LatencySketch(window=60)
+        for value in values:
+            sketch.record(value, now=0.0)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.9, 0.95, 0.99):
+            exact = ordered[int(q * len(ordered)) - 1]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=RELATIVE_ACCURACY * 2)
+
+    def test_window_expires_and_memory_is_constant(self):
+        """Test that old latencies leave the window without growing memory."""
+        sketch = LatencySketch(window=40, slices=4)
+        sizes = (len(sketch.counts), len(sketch.total))
+
+        for second in range(40):
+            sketch.record(2.0, now=float(second))
+        for second in range(40, 80):
+            sketch.record(0.1, now=float(second))
+            for _ in range(100):
+                sketch.record(0.1, now=float(second))
+
+        assert sketch.quantile(1.0) == pytest.approx(0.1, rel=RELATIVE_ACCURACY)
+        assert sketch.count == sum(sketch.total)
+        assert (len(sketch.counts), len(sketch.total)) == sizes
+
+        # Idle for longer than the window
+        sketch.advance(1000.0)
+        assert sketch.quantile(0.5) is None
+
+
+class TestLatencyTracker:
+    """Test percentile and baseline latency checks."""
+
+    def test_percentile_threshold(self):
+        """Test that a single outlier does not fail the p95 threshold."""
+        tracker = LatencyTracker(
+            LatencyConfig(percentile_threshold=1.0, min_samples=5)
+        )
+        for _ in range(19):
+            assert tracker.observe(0.2, now=0.0)[0]
+        valid, reasons, details = tracker.observe(3.0, now=0.0)
+        assert valid
+        assert details["p95"] == pytest.approx(0.2, rel=RELATIVE_ACCURACY)
+
+        for _ in range(5):
+            valid, reasons, _ = tracker.observe(3.0, now=0.0)
+        assert not valid
+        assert "p95 response time" in reasons[0]
+
+    def test_deviation_from_baseline(self):
+        """Test that a response far above the baseline is flagged."""
+        tracker = LatencyTracker(
+            LatencyConfig(deviation_threshold=4, min_samples=10, baseline_alpha=0.1)
+        )
+        for i in range(50):
+            assert tracker.observe(0.1 + (i % 3) * 0.01, now=0.0)[0]
+
+        valid, reasons, details = tracker.observe(0.5, now=0.0)
+        assert not valid
+        assert details["baseline"] == pytest.approx(0.11, abs=0.01)
+        assert "baseline" in reasons[0]
+
+
+class FakeResponse:
+    status = 200
+
+    async def text(self):
+        return ""
+
+
+class SlowSession:
+    def __init__(self, delays):
+        self.delays = iter(delays)
+
+    async def get(self, url, **kwargs):
+        await asyncio.sleep(next(self.delays))
+        return FakeResponse()
+
+
+class TestCheckerLatency:
+    """Test latency statistics in endpoint checks."""
+
+    def test_checker_uses_latency_statistics(self):
+        """Test that a configured endpoint ignores the single-sample threshold."""
+        config = EndpointConfig(
+            url="https://a",
+            response_time_threshold=0.01,
+            latency={"percentile_threshold": 1.0, "min_samples": 1},
+        )
+        checker = EndpointChecker(config, SlowSession([0.02, 0.0]))
+
+        async def run():
+            return [await checker.check(), await checker.check()]
+
+        results = asyncio.run(run())
+        assert [r.status for r in results] == [HealthStatus.OK, HealthStatus.OK]
+        assert "p95" in results[1].details["latency"]
@@ -0,0 +1,572 @@
+import asyncio
+import json
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from healthchecker.cli import format_summary
+
+from healthchecker.alerting.manager import AlertManager
+from healthchecker.config.models import (
+    AppConfig,
+    BodyOffloadConfig,
+    ConcurrencyConfig,
+    EndpointConfig,
+    ProfilingConfig,
+    StateConfig,
+)
+from healthchecker.monitoring.checker import MonitoringManager
+from healthchecker.monitoring.concurrency import AdaptiveLimiter, CheckShed
+from healthchecker.monitoring.endpoint import (
+    CheckResult,
+    EndpointChecker,
+    HealthStatus,
+)
+from healthchecker.monitoring.offload import ValidationPool
+from healthchecker.monitoring.profiling import Profiler, ProfilerBusy
+from healthchecker.monitoring.runtime import EndpointRuntime
+from healthchecker.monitoring.state import EndpointState, StateTracker, classify
+from healthchecker.utils.clock import VirtualClock
+
+
+def make_result(name, status=HealthStatus.OK):
+    return CheckResult(
+        endpoint_name=name,
+        url=f"https://{name}",
+        status=status,
+        response_time=0.1,
+    )
+
+
+def make_manager(endpoints):
+    config = AppConfig(endpoints=endpoints, alerting={"providers": {}})
+    return MonitoringManager(config, AlertManager(config.alerting))
+
+
+class TestDependencies:
+    """Test dependency-aware monitoring."""
+
+    def test_down_ancestor(self):
+        """Test that a failing upstream endpoint is found transitively."""
+        manager = make_manager(
+            [
+                {"url": "https://lb"},
+                {"url": "https://db", "depends_on": ["lb"]},
+                {"url": "https://app", "depends_on": ["db"]},
+            ]
+        )
+        assert manager._down_ancestor("app") is None
+
+        manager.check_results["lb"] = make_result("lb", HealthStatus.CRITICAL)
+        manager.check_results["db"] = make_result("db")
+        assert manager._down_ancestor("app") == "lb"
+        assert manager._down_ancestor("lb") is None
+
+        manager.check_results["db"] = make_result("db", HealthStatus.CRITICAL)
+        assert manager._down_ancestor("app") == "db"
+
+
+class FakeResponse:
+    def __init__(self, status, body=""):
+        self.status = status
+        self.body = body
+
+    async def text(self):
+        return self.body
+
+
+class FakeSession:
+    def __init__(self, status=200, body=""):
+        self.status = status
+        self.body = body
+        self.calls = []
+
+    async def get(self, url, **kwargs):
+        self.calls.append(kwargs)
+        return FakeResponse(self.status, self.body)
+
+
+class TestEndpointChecker:
+    """Test endpoint checks against a fake session."""
+
+    def test_runtime_is_precomputed_and_read_only(self):
+        """Test that request arguments are built once and reused."""
+        runtime = EndpointRuntime(
+            EndpointConfig(url="https://a", expected_status_ranges=["200-299"])
+        )
+        assert runtime.expected_status_ranges == ((200, 299),)
+        assert runtime.method == "get"
+        with pytest.raises(AttributeError):
+            runtime.interval = 1.0
+
+        session = FakeSession(status=204)
+        checker = EndpointChecker(runtime, session)
+        result = asyncio.run(checker.check())
+        asyncio.run(checker.check())
+
+        assert result.status == HealthStatus.OK
+        assert session.calls[0] == runtime.request_kwargs
+        assert session.calls[0]["timeout"] is session.calls[1]["timeout"]
+
+    def test_failures_counted_within_window(self):
+        """Test that an alert is required once the failure threshold is reached."""
+        config = EndpointConfig(url="https://a", failure_threshold=2)
+        checker = EndpointChecker(config, FakeSession(status=500))
+
+        first = asyncio.run(checker.check())
+        second = asyncio.run(checker.check())
+
+        assert first.status == HealthStatus.CRITICAL
+        assert "alert_required" not in first.details
+        assert second.details["alert_required"]
+        assert second.details["failure_count"] == 2
+
+
+class TestConditionalRequests:
+    """Test conditional requests and reuse of body validation results."""
+
+    def test_unchanged_body_not_revalidated(self):
+        """Test that a repeated body reuses the previous validation result."""
+        config = EndpointConfig(url="https://a", json_path_checks={"$.status": "ok"})
+        session = FakeSession(body='{"status": "ok"}')
+        checker = EndpointChecker(config, session)
+
+        async def run():
+            results = [await checker.check() for _ in range(3)]
+            session.body = '{"status": "degraded"}'
+            results.append(await checker.check())
+            return results
+
+        results = asyncio.run(run())
+
+        assert [r.status for r in results] == [HealthStatus.OK] * 3 + [
+            HealthStatus.CRITICAL
+        ]
+        assert results[2].details["body_checks"] == {"json_checks": {"$.status": True}}
+        assert checker.validation_count == 2
+        assert checker.memo_stats() == {"hits": 2, "misses": 2, "not_modified": 0}
+        # Conditional requests are opt-in
+        assert "If-None-Match" not in session.calls[-1]["headers"]
+
+    def test_not_modified(self):
+        """Test that validators are sent back and a 304 repeats the last outcome."""
+        seen = []
+        document = {"status": "ok", "version": 1}
+
+        async def handler(request):
+            seen.append(dict(request.headers))
+            etag = '"v%d"' % document["version"]
+            if request.headers.get("If-None-Match") == etag:
+                return web.Response(status=304, headers={"ETag": etag})
+            return web.json_response(document, headers={"ETag": etag})
+
+        async def run():
+            app = web.Application()
+            app.router.add_get("/health", handler)
+            async with TestServer(app) as server:
+                async with aiohttp.ClientSession() as session:
+                    config = EndpointConfig(
+                        url=str(server.make_url("/health")),
+                        headers={"X-Probe": "1"},
+                        json_path_checks={"$.status": "ok"},
+                        conditional_requests=True,
+                    )
+                    checker = EndpointChecker(config, session)
+                    results = [await checker.check() for _ in range(3)]
+                    document.update(status="degraded", version=2)
+                    results.append(await checker.check())
+                    results.append(await checker.check())
+                    return checker, results
+
+        checker, results = asyncio.run(run())
+
+        assert [r.status_code for r in results] == [200, 304, 304, 200, 304]
+        assert [r.status for r in results] == [HealthStatus.OK] * 3 + [
+            HealthStatus.CRITICAL
+        ] * 2
+        assert results[1].details["not_modified"]
+        assert "If-None-Match" not in seen[0]
+        assert seen[1]["If-None-Match"] == '"v1"'
+        assert seen[1]["X-Probe"] == "1"
+        assert seen[4]["If-None-Match"] == '"v2"'
+        assert checker.validation_count == 2
+        assert checker.memo_stats() == {"hits": 3, "misses": 2, "not_modified": 3}
+        # The endpoint's own headers are left untouched
+        assert "If-None-Match" not in checker.config.request_kwargs["headers"]
+
+
+class TestBodyOffload:
+    """Test validation of large bodies in a worker pool."""
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_large_bodies_offloaded(self, executor):
+        """Test that only bodies over the threshold leave the event loop."""
+        pool = ValidationPool(
+            BodyOffloadConfig(threshold=1000, executor=executor, workers=1)
+        )
+        config = EndpointConfig(
+            url="https://a",
+            json_path_checks={"$.status": "ok"},
+            regex_checks={"padding": "x+"},
+        )
+        small = EndpointChecker(config, FakeSession(body='{"status": "ok"}'), pool)
+        large = EndpointChecker(
+            config,
+            FakeSession(body='{"status": "ok", "padding": "%s"}' % ("x" * 2000)),
+            pool,
+        )
+
+        async def run():
+            await small.check()
+            return await large.check()
+
+        try:
+            result = asyncio.run(run())
+        finally:
+            pool.shutdown()
+
+        assert result.status == HealthStatus.OK
+        assert result.details["body_checks"]["json_checks"] == {"$.status": True}
+        assert pool.stats()["offloaded"] == 1
+        assert pool.stats()["pending"] == 0
+        assert large.validation_count == 1
+
+
+class TestAdaptiveLimiter:
+    """Test the adaptive concurrency limit."""
+
+    def test_limit_enforced_and_resized(self):
+        """Test that waiters get slots in order as the limit allows."""
+        limiter = AdaptiveLimiter(ConcurrencyConfig(min_limit=1), max_limit=2)
+        limiter.limit = 1
+
+        async def run():
+            order = []
+
+            async def worker(i):
+                async with limiter:
+                    order.append(i)
+                    await asyncio.sleep(0.01)
+
+            tasks = [asyncio.create_task(worker(i)) for i in range(3)]
+            await asyncio.sleep(0)
+            assert limiter.in_flight == 1
+            assert limiter.stats()["waiting"] == 2
+
+            # Growing the limit lets a waiter in immediately
+            limiter.adjust(loop_lag=0.0)
+            assert limiter.limit == 2
+            assert limiter.in_flight == 2
+
+            tasks[2].cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            return order
+
+        assert asyncio.run(run()) == [0, 1]
+        assert limiter.in_flight == 0
+
+    def test_aimd_from_lag_and_latency(self):
+        """Test multiplicative decrease on overload and additive increase."""
+        config = ConcurrencyConfig(min_limit=2, decrease_factor=0.5)
+        limiter = AdaptiveLimiter(config, max_limit=16)
+
+        assert limiter.adjust(loop_lag=0.5) == 8
+        assert limiter.adjust(loop_lag=0.5) == 4
+
+        # Latency three times the baseline is overload too
+        limiter.record("a", 0.1)
+        limiter.record("a", 0.3)
+        limiter.record("a", 0.5)
+        assert limiter.adjust(loop_lag=0.0) == 2
+        assert limiter.adjust(loop_lag=0.5) == 2
+
+        # Healthy but unsaturated: hold steady
+        assert limiter.adjust(loop_lag=0.0) == 2
+        limiter._saturated = True
+        assert limiter.adjust(loop_lag=0.0) == 3
+
+    def test_outliers_do_not_shrink_limit(self):
+        """Test that a minority of very slow checks is not taken for overload."""
+        limiter = AdaptiveLimiter(ConcurrencyConfig(), max_limit=100)
+        for i in range(10):
+            limiter.record(f"e{i}", 0.1)
+
+        for _ in range(5):
+            # One in five checks runs into a 10s timeout
+            for i in range(10):
+                limiter.record(f"e{i}", 10.0 if i % 5 == 0 else 0.1)
+            assert limiter.adjust(loop_lag=0.0) == 100
+
+    def test_failing_endpoints_not_recorded(self):
+        """Test that checks without a response don't feed the latency signal."""
+
+        async def ok(request):
+            return web.Response(text="ok")
+
+        async def run():
+            app = web.Application()
+            app.router.add_get("/", ok)
+            async with TestServer(app) as server:
+                manager = make_manager(
+                    [
+                        {"name": "up", "url": str(server.make_url("/"))},
+                        {"name": "down", "url": "http://127.0.0.1:1/"},
+                    ]
+                )
+                manager.running = True
+                monitors = [
+                    asyncio.create_task(manager._monitor_endpoint(name, checker))
+                    for name, checker in manager.checkers.items()
+                ]
+                while len(manager.check_results) < 2:
+                    await asyncio.sleep(0.01)
+                manager.running = False
+                for monitor in monitors:
+                    monitor.cancel()
+                await asyncio.gather(*monitors, return_exceptions=True)
+                await manager.stop()
+                return manager.limiter
+
+        limiter = asyncio.run(run())
+        assert list(limiter._baselines) == ["up"]
+
+    def test_weighted_priority_dispatch(self):
+        """Test that classes share slots by weight and none is starved."""
+        config = ConcurrencyConfig(priority_weights=[4, 2, 1])
+        limiter = AdaptiveLimiter(config, max_limit=1)
+
+        async def run():
+            order = []
+
+            async def worker(priority):
+                async with limiter.slot(priority):
+                    order.append(priority)
+                    await asyncio.sleep(0)
+
+            await limiter.acquire()
+            tasks = [
+                asyncio.create_task(worker(priority))
+                for priority in (2, 1, 0)
+                for _ in range(14)
+            ]
+            await asyncio.sleep(0)
+            assert limiter.stats()["waiting"] == 42
+            limiter.release()
+            await asyncio.gather(*tasks)
+            return order
+
+        order = asyncio.run(run())
+
+        # While all three classes wait, every 7 slots go 4:2:1
+        first = order[:21]
+        assert [first.count(p) for p in (0, 1, 2)] == [12, 6, 3]
+        assert order[:7].count(2) == 1
+        stats = limiter.stats()["priorities"]
+        assert [c["dispatched"] for c in stats] == [15, 14, 14]
+        assert stats[2]["queue_max"] >= stats[0]["queue_max"]
+
+    def test_low_priority_shed_under_overload(self):
+        """Test that only checks below priority 0 are shed after waiting too long."""
+        config = ConcurrencyConfig(shed_after=0.05)
+        limiter = AdaptiveLimiter(config, max_limit=1)
+
+        async def run():
+            await limiter.acquire()
+            waiters = [
+                asyncio.create_task(limiter.acquire(priority))
+                for priority in (0, 1, 2)
+            ]
+            await asyncio.sleep(0.1)
+            limiter.release()
+            return await asyncio.gather(*waiters, return_exceptions=True)
+
+        results = asyncio.run(run())
+
+        assert results[0] is None
+        assert all(isinstance(r, CheckShed) for r in results[1:])
+        stats = limiter.stats()
+        assert [c["shed"] for c in stats["priorities"]] == [0, 1, 1]
+        assert stats["waiting"] == 0
+        assert limiter.in_flight == 1
+
+
+class TestProfiler:
+    """Test on-demand profiling of a running monitor."""
+
+    def test_capture_writes_report(self, tmp_path):
+        """Test that a capture reports tasks, memory, CPU and validation cost."""
+        manager = make_manager(
+            [{"url": "https://a", "json_path_checks": {"$.status": "ok"}}]
+        )
+        session = FakeSession(body='{"status": "ok"}')
+        checker = EndpointChecker(manager.runtimes["a"], session)
+        manager.checkers["a"] = checker
+        profiler = Profiler(
+            ProfilingConfig(enabled=True, output_dir=str(tmp_path)), manager
+        )
+
+        async def run():
+            result = await checker.check()
+            assert result.status == HealthStatus.OK
+            manager.check_results["a"] = result
+            manager.in_flight["a"] = 0.0
+
+            capture = asyncio.create_task(profiler.capture(0.05))
+            await asyncio.sleep(0)
+            with pytest.raises(ProfilerBusy):
+                await profiler.capture(0.05)
+            return await capture
+
+        path = asyncio.run(run())
+
+        report = json.loads((tmp_path / path / "tasks.json").read_text())
+        assert report["tasks"] >= 1
+        assert report["checks_in_flight"][0]["endpoint"] == "a"
+        assert report["slowest_checks"][0]["endpoint"] == "a"
+        assert report["body_validation_cpu"][0]["validations"] == 1
+        for name in ["cpu.prof", "cpu.txt", "memory.txt"]:
+            assert (tmp_path / path / name).exists()
+
+
+class TestStateTracker:
+    """Test the endpoint state machine."""
+
+    def test_hysteresis(self):
+        """Test that a state change needs consecutive confirming results."""
+        tracker = StateTracker(StateConfig(confirm_count=2))
+
+        transition = tracker.observe(make_result("a"))
+        assert transition.previous is None
+        assert transition.current == EndpointState.UP
+
+        assert tracker.observe(make_result("a", HealthStatus.CRITICAL)) is None
+        assert tracker.observe(make_result("a")) is None
+        assert tracker.observe(make_result("a", HealthStatus.CRITICAL)) is None
+        transition = tracker.observe(make_result("a", HealthStatus.CRITICAL))
+        assert transition.current == EndpointState.DOWN
+
+    def test_slow_response_is_degraded(self):
+        """Test that a correct but slow response is classified as degraded."""
+        result = make_result("a", HealthStatus.CRITICAL)
+        result.details = {
+            "status_code_valid": True,
+            "body_valid": True,
+            "response_time_valid": False,
+        }
+        assert classify(result) == EndpointState.DEGRADED
+
+    def test_flapping_detected_and_settles(self):
+        """Test that alternating results are summarized as flapping."""
+        tracker = StateTracker(StateConfig(confirm_count=2, flap_window=6))
+        statuses = [HealthStatus.OK, HealthStatus.CRITICAL] * 3
+
+        transitions = [tracker.observe(make_result("a", s)) for s in statuses]
+        changes = [t for t in transitions if t]
+        assert [t.current for t in changes] == [
+            EndpointState.UP,
+            EndpointState.FLAPPING,
+        ]
+        assert "5 state changes" in changes[-1].summary
+
+        transitions = [tracker.observe(make_result("a")) for _ in range(6)]
+        changes = [t for t in transitions if t]
+        assert [t.current for t in changes] == [EndpointState.UP]
+
+
+class TestStateAlerts:
+    """Test alerting on state transitions."""
+
+    def test_outage_in_cooldown_alerts_once_cooldown_ends(self):
+        """Test that an alert held back by the cooldown is sent later, not lost."""
+        clock = VirtualClock(1_000_000.0)
+        config = AppConfig(
+            endpoints=[{"url": "https://a"}],
+            state={"change_only": True, "confirm_count": 1},
+            alerting={"providers": {}, "cooldown_period": 600},
+        )
+        alert_manager = AlertManager(config.alerting, mock_mode=True, clock=clock)
+        manager = MonitoringManager(config, alert_manager)
+        recoveries = []
+
+        async def send_recovery(result):
+            recoveries.append(result.endpoint_name)
+            return True
+
+        alert_manager.send_recovery = send_recovery
+
+        def down():
+            result = make_result("a", HealthStatus.CRITICAL)
+            result.details["alert_required"] = True
+            return result
+
+        async def scenario():
+            # First outage is alerted and recovers
+            await manager._process_result("a", down())
+            await manager._process_result("a", make_result("a"))
+            assert len(alert_manager.alert_history["a"]) == 1
+            assert recoveries == ["a"]
+
+            # Second outage starts within the cooldown: nothing is sent yet
+            clock.advance(60)
+            await manager._process_result("a", down())
+            assert len(alert_manager.alert_history["a"]) == 1
+            assert not manager.states["a"].alerted
+
+            # Still down once the cooldown is over: the outage is alerted
+            clock.advance(600)
+            await manager._process_result("a", down())
+            assert len(alert_manager.alert_history["a"]) == 2
+            assert manager.states["a"].alerted
+
+            # Third outage recovers within the cooldown: no recovery for it
+            await manager._process_result("a", make_result("a"))
+            clock.advance(60)
+            await manager._process_result("a", down())
+            await manager._process_result("a", make_result("a"))
+            assert recoveries == ["a", "a"]
+
+        asyncio.run(scenario())
+
+
+class TestRunOnce:
+    """Test the one-shot sweep against a local server."""
+
+    def test_run_once_reports_every_endpoint(self):
+        """Test that each endpoint is checked once and slow checks hit the deadline."""
+
+        async def ok(request):
+            return web.Response(text="ok")
+
+        async def error(request):
+            return web.Response(status=500)
+
+        async def slow(request):
+            await asyncio.sleep(5)
+            return web.Response(text="late")
+
+        app = web.Application()
+        app.add_routes(
+            [web.get("/ok", ok), web.get("/error", error), web.get("/slow", slow)]
+        )
+
+        async def run():
+            async with TestServer(app) as server:
+                base = str(server.make_url(""))
+                manager = make_manager(
+                    [
+                        {"url": f"{base}/ok", "name": "ok"},
+                        {"url": f"{base}/error", "name": "error"},
+                        {"url": f"{base}/slow", "name": "slow"},
+                    ]
+                )
+                return await manager.run_once(deadline=0.5)
+
+        results = {r.endpoint_name: r for r in asyncio.run(run())}
+        assert results["ok"].status == HealthStatus.OK
+        assert results["error"].status_code == 500
+        assert results["slow"].details == {"error": "deadline"}
+
+        summary = format_summary(list(results.values()), "table")
+        assert summary.endswith("3 checked, 1 ok, 2 critical")
@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from healthchecker.api.server import StatusAPI
+from healthchecker.config.models import (
+    EndpointConfig,
+    GroupAlertConfig,
+    StatusAPIConfig,
+)
+from healthchecker.monitoring.endpoint import CheckResult, HealthStatus
+from healthchecker.monitoring.rollup import GroupIndex
+from healthchecker.monitoring.status import StatusStore
+
+
+def make_endpoints():
+    endpoints = []
+    for region in ("eu", "us"):
+        for i in range(5):
+            team = "payments" if i < 2 else "web"
+            endpoints.append(
+                EndpointConfig(
+                    url=f"https://{region}-{i}",
+                    name=f"{region}-{i}",
+                    labels={"region": region, "team": team},
+                )
+            )
+    endpoints.append(EndpointConfig(url="https://unlabelled"))
+    return endpoints
+
+
+def make_result(name, status=HealthStatus.OK, response_time=0.1, slow=False):
+    details = {}
+    if slow:
+        details = {
+            "status_code_valid": True,
+            "body_valid": True,
+            "response_time_valid": False,
+        }
+    return CheckResult(
+        endpoint_name=name,
+        url=f"https://{name}",
+        status=status,
+        response_time=response_time,
+        details=details,
+    )
+
+
+class TestGroupIndex:
+    """Test incrementally maintained group rollups."""
+
+    def test_counts_follow_latest_results(self):
+        """Test that each endpoint is counted once, in its latest state."""
+        index = GroupIndex(make_endpoints())
+
+        for i in range(5):
+            index.update(make_result(f"eu-{i}", response_time=0.1 * i + 0.1), now=0.0)
+        index.update(make_result("eu-0", HealthStatus.CRITICAL, 2.0), now=1.0)
+        index.update(
+            make_result("eu-1", HealthStatus.CRITICAL, 3.0, slow=True), now=1.0
+        )
+        index.update(make_result("eu-0", HealthStatus.CRITICAL, 1.0), now=2.0)
+        index.update(make_result("unlabelled"), now=2.0)
+
+        rollup = index.rollup(now=2.0)
+        eu = rollup["region"]["eu"]
+        assert (eu["endpoints"], eu["reported"]) == (5, 5)
+        assert (eu["up"], eu["degraded"], eu["down"]) == (3, 1, 1)
+        assert eu["latency_mean"] == pytest.approx((1.0 + 3.0 + 0.3 + 0.4 + 0.5) / 5)
+        assert eu["latency_p95"] == pytest.approx(3.0, rel=0.05)
+        assert rollup["region"]["us"]["reported"] == 0
+        assert rollup["team"]["payments"]["down"] == 1
+        assert rollup["team"]["payments"]["degraded"] == 1
+        assert set(index.rollup("team")) == {"team"}
+
+        index.remove("eu-0")
+        eu = index.rollup(now=2.0)["region"]["eu"]
+        assert (eu["reported"], eu["down"]) == (4, 0)
+
+    def test_group_alert_fires_once_per_breach(self):
+        """Test that a rule alerts when it starts firing, and again after clearing."""
+        rules = [
+            GroupAlertConfig(label="region", threshold=0.2, min_endpoints=3),
+            GroupAlertConfig(label="team", state="unhealthy", threshold=0.5),
+        ]
+        index = GroupIndex(make_endpoints(), rules)
+        for i in range(5):
+            assert index.update(make_result(f"eu-{i}"), now=0.0) == []
+
+        # 1 of 5 down is not more than 20%
+        assert index.update(make_result("eu-0", HealthStatus.CRITICAL), now=1.0) == []
+        alerts = index.update(make_result("eu-1", HealthStatus.CRITICAL), now=1.0)
+        assert [a.endpoint_name for a in alerts] == ["region=eu", "team=payments"]
+        assert alerts[0].message.startswith("2 of 5 endpoints with region=eu are down")
+        assert alerts[0].details["alert_required"]
+        assert alerts[0].details["group"]["down"] == 2
+
+        # Still breached: no new alert
+        assert index.update(make_result("eu-2", HealthStatus.CRITICAL), now=2.0) == []
+
+        for i in range(3):
+            index.update(make_result(f"eu-{i}"), now=3.0)
+        alerts = index.update(make_result("eu-3", HealthStatus.CRITICAL), now=4.0)
+        assert alerts == []
+        alerts = index.update(make_result("eu-4", HealthStatus.CRITICAL), now=4.0)
+        # Only endpoints that have reported count: 2 of the 3 web endpoints
+        assert [a.endpoint_name for a in alerts] == ["region=eu", "team=web"]
+
+    def test_groups_route(self):
+        """Test that rollups are served by the status API."""
+        index = GroupIndex(make_endpoints())
+        index.update(make_result("us-0", HealthStatus.CRITICAL))
+        api = StatusAPI(StatusAPIConfig(enabled=True), StatusStore(), groups=index)
+
+        async def run():
+            async with TestClient(TestServer(api.app)) as client:
+                response = await client.get("/groups")
+                body = await response.json()
+                assert body["region"]["us"]["down"] == 1
+                assert body["team"]["web"]["endpoints"] == 6
+
+                response = await client.get("/groups/region")
+                assert set(await response.json()) == {"region"}
+
+                response = await client.get("/groups/zone")
+                assert response.status == 404
+
+        asyncio.run(run())
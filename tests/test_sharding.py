@@ -0,0 +1,58 @@
+from healthchecker.config.dependencies import DependencyGraph
+from healthchecker.config.models import ShardingConfig
+from healthchecker.monitoring.sharding import (
+    LeaseCoordinator,
+    assign,
+    shard_keys,
+    static_members,
+)
+
+
+def make_keys(count):
+    graph = DependencyGraph({f"endpoint-{i}": [] for i in range(count)})
+    return shard_keys(graph)
+
+
+class TestSharding:
+    """Test consistent assignment of endpoints to shards."""
+
+    def test_shards_partition_endpoints(self):
+        """Test that every endpoint is owned by exactly one shard."""
+        keys = make_keys(200)
+        members = static_members(4)
+        owned = [assign(keys, members, member) for member in members]
+
+        assert sum(len(o) for o in owned) == 200
+        assert set().union(*owned) == set(keys)
+        assert all(len(o) > 20 for o in owned)
+
+    def test_adding_shard_moves_minimal_set(self):
+        """Test that growing the shard count only moves endpoints to the new shard."""
+        keys = make_keys(500)
+        before = {m: assign(keys, static_members(4), m) for m in static_members(4)}
+        after = {m: assign(keys, static_members(5), m) for m in static_members(5)}
+
+        for member in static_members(4):
+            assert after[member] <= before[member]
+        assert len(after["shard-4"]) < 200
+
+    def test_dependents_follow_their_root(self):
+        """Test that a dependency tree is kept on one shard."""
+        graph = DependencyGraph({"lb": [], "api": ["lb"], "web": ["api"]})
+        keys = shard_keys(graph)
+        assert keys == {"lb": "lb", "api": "lb", "web": "lb"}
+
+
+class TestLeaseCoordinator:
+    """Test SQLite lease-based membership."""
+
+    def test_membership(self):
+        """Test that members appear on heartbeat and leave on release."""
+        a = LeaseCoordinator(ShardingConfig(lease_path="leases.db", instance_id="a"))
+        b = LeaseCoordinator(ShardingConfig(lease_path="leases.db", instance_id="b"))
+
+        assert a.heartbeat() == ["a"]
+        assert b.heartbeat() == ["a", "b"]
+
+        b.release()
+        assert a.heartbeat() == ["a"]
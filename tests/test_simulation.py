@@ -0,0 +1,152 @@
+import asyncio
+import json
+import time
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from healthchecker.cli import format_simulation
+from healthchecker.config.models import AppConfig, EndpointConfig
+from healthchecker.monitoring.endpoint import EndpointChecker, HealthStatus
+from healthchecker.monitoring.runtime import EndpointRuntime
+from healthchecker.monitoring.simulation import simulate
+from healthchecker.monitoring.trace import RecordingSession, TraceWriter, read_trace
+from healthchecker.utils.clock import VirtualClock
+
+
+def make_config(**alerting):
+    return AppConfig(
+        endpoints=[
+            {
+                "url": "https://api",
+                "name": "api",
+                "interval": 60,
+                "failure_threshold": 2,
+                "failure_window": 300,
+                "json_path_checks": {"$.status": "ok"},
+            }
+        ],
+        alerting={"providers": {}, **alerting},
+    )
+
+
+def write_trace(path, outcomes, start=1_700_000_000.0, interval=60.0):
+    """Write a trace of one check per interval, each a (status, body) pair."""
+    with open(path, "w") as f:
+        for i, (status, body) in enumerate(outcomes):
+            record = {"t": start + i * interval, "e": "api", "s": status, "d": 0.05}
+            if status is None:
+                record.update({"x": "timeout", "m": "timeout"})
+            else:
+                f.write(json.dumps({"body": f"b{i}", "text": body}) + "\n")
+                record["b"] = f"b{i}"
+            f.write(json.dumps(record) + "\n")
+
+
+class TestVirtualClock:
+    """Test the virtual clock."""
+
+    def test_sleep_advances(self):
+        """Test that sleeping moves the clock without waiting."""
+        clock = VirtualClock(start=100.0)
+        started = time.monotonic()
+        asyncio.run(clock.sleep(3600))
+        assert clock.monotonic() == 3700.0
+        assert time.monotonic() - started < 1
+
+        clock.set(50.0)
+        assert clock.time == 3700.0
+
+
+class TestRecording:
+    """Test recording response traces."""
+
+    def test_record_and_read(self, tmp_path):
+        """Test that recorded checks round-trip with their bodies stored once."""
+        path = str(tmp_path / "trace.jsonl")
+
+        async def handler(request):
+            return web.json_response({"status": "ok"})
+
+        async def run():
+            app = web.Application()
+            app.router.add_get("/health", handler)
+            async with TestServer(app) as server:
+                async with aiohttp.ClientSession() as session:
+                    recording = RecordingSession(session)
+                    checker = EndpointChecker(
+                        EndpointRuntime(
+                            EndpointConfig(
+                                url=str(server.make_url("/health")),
+                                name="api",
+                                json_path_checks={"$.status": "ok"},
+                            )
+                        ),
+                        recording,
+                    )
+                    writer = TraceWriter(path)
+                    for i in range(3):
+                        result = await checker.check()
+                        assert result.status == HealthStatus.OK
+                        writer.record(result, recording.take_body(), 1000.0 + i)
+                    writer.close()
+
+        asyncio.run(run())
+
+        with open(path) as f:
+            lines = [json.loads(line) for line in f]
+        assert sum(1 for line in lines if "body" in line) == 1
+
+        records = list(read_trace(path))
+        assert [r.timestamp for r in records] == [1000.0, 1001.0, 1002.0]
+        assert all(r.status_code == 200 for r in records)
+        assert json.loads(records[2].body) == {"status": "ok"}
+
+
+class TestSimulation:
+    """Test replaying traces under a virtual clock."""
+
+    def test_alerts_and_rate_limiting(self, tmp_path):
+        """Test that a replayed outage alerts once per cooldown period."""
+        path = str(tmp_path / "trace.jsonl")
+        healthy = (200, '{"status": "ok"}')
+        degraded = (200, '{"status": "degraded"}')
+        # Three hours of checks with a 30 minute outage in the middle
+        outcomes = (
+            [healthy] * 60 + [degraded] * 20 + [(None, None)] * 10 + [healthy] * 90
+        )
+        write_trace(path, outcomes)
+
+        started = time.monotonic()
+        report = asyncio.run(simulate(make_config(cooldown_period=900), path))
+        assert time.monotonic() - started < 5
+
+        assert report["checks"] == 180
+        assert report["failures"] == 30
+        assert report["duration"] == pytest.approx(179 * 60, abs=1)
+        # Alerts from the second failure on, at most once per 15 minutes
+        assert len(report["alerts"]) == 2
+        assert report["alerts"][0]["endpoint"] == "api"
+        assert report["alerts"][0]["time"].startswith("2023-11-14T23:14:20")
+        assert report["rate_limited"] == 27
+        assert report["endpoints"]["api"]["alerts"] == 2
+
+        # The same outage under a stricter configuration
+        config = make_config(max_alerts_per_hour=1, cooldown_period=0)
+        report = asyncio.run(simulate(config, path))
+        assert len(report["alerts"]) == 1
+        assert report["rate_limited"] == 28
+
+    def test_unknown_endpoints_skipped(self, tmp_path):
+        """Test that records of endpoints not in the configuration are ignored."""
+        path = str(tmp_path / "trace.jsonl")
+        with open(path, "w") as f:
+            f.write(json.dumps({"t": 10.0, "e": "gone", "s": 500, "d": 0.1}) + "\n")
+            f.write("not json\n")
+
+        report = asyncio.run(simulate(make_config(), path))
+        assert report["checks"] == 0
+        assert report["endpoints"] == {}
+        assert "0 checks replayed" in format_simulation(report, "table")
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import os
+
+from healthchecker.config.models import SinkConfig
+from healthchecker.monitoring.endpoint import CheckResult, HealthStatus
+from healthchecker.sinks.file import FileSink
+from healthchecker.sinks.manager import SinkManager
+
+
+def make_result(name="api"):
+    return CheckResult(
+        endpoint_name=name,
+        url="https://example.com/health",
+        status=HealthStatus.OK,
+        response_time=0.1,
+        status_code=200,
+    )
+
+
+class TestFileSink:
+    """Test the NDJSON file sink."""
+
+    def test_rotation(self):
+        """Test that the file is rotated once it would exceed max_bytes."""
+        sink = FileSink({"path": "results.ndjson", "max_bytes": 10, "backup_count": 2})
+
+        async def run():
+            for _ in range(4):
+                await sink.write_batch([b"123456\n"])
+            await sink.close()
+
+        asyncio.run(run())
+
+        assert os.path.exists("results.ndjson.1")
+        assert os.path.exists("results.ndjson.2")
+        assert not os.path.exists("results.ndjson.3")
+        with open("results.ndjson", "rb") as f:
+            assert f.read() == b"123456\n"
+
+
+class TestSinkManager:
+    """Test batching and backpressure in the sink pipeline."""
+
+    def test_results_flushed_on_stop(self):
+        """Test that buffered results are written when the manager stops."""
+        manager = SinkManager(
+            {"file": SinkConfig(type="file", config={"path": "out.ndjson"})}
+        )
+
+        async def run():
+            await manager.start()
+            for name in ["a", "b", "c"]:
+                manager.publish(make_result(name))
+            await manager.stop()
+
+        asyncio.run(run())
+
+        with open("out.ndjson") as f:
+            records = [json.loads(line) for line in f]
+        assert [r["endpoint_name"] for r in records] == ["a", "b", "c"]
+
+    def test_full_buffer_drops_records(self):
+        """Test that publishing never blocks and overflow is counted."""
+        manager = SinkManager(
+            {
+                "file": SinkConfig(
+                    type="file", buffer_size=2, config={"path": "out.ndjson"}
+                )
+            }
+        )
+
+        async def run():
+            manager._initialize_sinks()
+            for _ in range(5):
+                manager.publish(make_result())
+            return manager.stats()["file"]
+
+        stats = asyncio.run(run())
+        assert stats == {"written": 0, "dropped": 3, "buffered": 2}
@@ -0,0 +1,73 @@
+import pytest
+
+from healthchecker.config.models import BurnRateWindow, EndpointConfig, SLOConfig
+from healthchecker.monitoring.endpoint import CheckResult, HealthStatus
+from healthchecker.monitoring.slo import SLOEngine
+
+
+def make_result(name, status):
+    return CheckResult(
+        endpoint_name=name,
+        url=f"https://{name}.example.com",
+        status=status,
+        response_time=0.1,
+    )
+
+
+def make_endpoint(name, objective=0.99):
+    return EndpointConfig(
+        url=f"https://{name}.example.com",
+        name=name,
+        slo=SLOConfig(
+            objective=objective,
+            windows=[
+                BurnRateWindow(long_window=600, short_window=120, burn_rate=10)
+            ],
+        ),
+    )
+
+
+class TestSLOEngine:
+    """Test multi-window burn-rate evaluation."""
+
+    def test_burn_rate_alert_fires_once(self):
+        """Test that an alert fires when both windows burn and is not repeated."""
+        engine = SLOEngine(
+            [make_endpoint("a"), make_endpoint("b"), EndpointConfig(url="https://c")],
+            resolution=60,
+        )
+        assert list(engine.index) == ["a", "b"]
+
+        engine.advance(now=0)
+        for _ in range(8):
+            engine.record(make_result("a", HealthStatus.OK))
+            engine.record(make_result("b", HealthStatus.OK))
+        for _ in range(2):
+            engine.record(make_result("a", HealthStatus.CRITICAL))
+            engine.record(make_result("b", HealthStatus.OK))
+
+        # 20% errors against a 1% budget is a 20x burn rate
+        alerts = engine.evaluate(now=30)
+        assert [a.endpoint_name for a in alerts] == ["a"]
+        assert alerts[0].details["long_burn_rate"] == 20.0
+        assert alerts[0].details["alert_required"]
+
+        assert engine.evaluate(now=45) == []
+
+    def test_buckets_expire_from_windows(self):
+        """Test that old buckets leave the short window but not the long one."""
+        engine = SLOEngine([make_endpoint("a")], resolution=60)
+        engine.advance(now=0)
+        engine.record(make_result("a", HealthStatus.CRITICAL))
+
+        engine.advance(now=180)
+        assert engine.total[2][0] == 0
+        assert engine.total[10][0] == 1
+
+        engine.advance(now=600)
+        assert engine.total[10][0] == 0
+
+    def test_short_window_must_fit_long_window(self):
+        """Test burn rate window validation."""
+        with pytest.raises(ValueError):
+            BurnRateWindow(long_window=60, short_window=300, burn_rate=2)
@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from healthchecker.api.server import StatusAPI
+from healthchecker.config.models import StatusAPIConfig
+from healthchecker.monitoring.endpoint import CheckResult, HealthStatus
+from healthchecker.monitoring.status import StatusStore
+
+
+def make_result(name, status=HealthStatus.OK):
+    return CheckResult(
+        endpoint_name=name,
+        url=f"https://{name}.example.com/health",
+        status=status,
+        response_time=0.1,
+        status_code=200,
+    )
+
+
+class TestStatusStore:
+    """Test the cached status snapshot and change feed."""
+
+    def test_snapshot_cached_until_update(self):
+        """Test that the snapshot is reused until a new result arrives."""
+        store = StatusStore()
+        store.update(make_result("a"))
+        store.update(make_result("b"))
+
+        body, etag = store.snapshot()
+        assert store.snapshot()[0] is body
+        assert set(json.loads(body)["endpoints"]) == {"a", "b"}
+
+        store.update(make_result("a", HealthStatus.CRITICAL))
+        new_body, new_etag = store.snapshot()
+        assert new_etag != etag
+        assert json.loads(new_body)["endpoints"]["a"]["status"] == "critical"
+
+    def test_changes_only_include_state_transitions(self):
+        """Test that repeated results with the same status are not in the feed."""
+        store = StatusStore()
+        store.update(make_result("a"))
+        changed, cursor, truncated = store.changes(0)
+        assert [r.endpoint_name for r in changed] == ["a"]
+
+        store.update(make_result("a"))
+        store.update(make_result("a"))
+        assert store.changes(cursor)[0] == []
+
+        store.update(make_result("a", HealthStatus.CRITICAL))
+        changed, _, truncated = store.changes(cursor)
+        assert [r.status for r in changed] == [HealthStatus.CRITICAL]
+        assert not truncated
+
+    def test_changes_truncated_when_cursor_evicted(self):
+        """Test that a stale cursor is reported as truncated."""
+        store = StatusStore(max_changes=2)
+        for name in ["a", "b", "c"]:
+            store.update(make_result(name))
+
+        changed, _, truncated = store.changes(0)
+        assert truncated
+        assert [r.endpoint_name for r in changed] == ["b", "c"]
+
+
+class TestStatusAPI:
+    """Test the HTTP status API."""
+
+    def test_etag_and_endpoints(self):
+        """Test conditional snapshot requests and per-endpoint detail."""
+        store = StatusStore()
+        store.update(make_result("a"))
+        api = StatusAPI(StatusAPIConfig(enabled=True), store)
+
+        async def run():
+            async with TestClient(TestServer(api.app)) as client:
+                response = await client.get("/status")
+                assert response.status == 200
+                etag = response.headers["ETag"]
+
+                response = await client.get(
+                    "/status", headers={"If-None-Match": etag}
+                )
+                assert response.status == 304
+
+                response = await client.get("/status/a")
+                assert (await response.json())["endpoint_name"] == "a"
+
+                response = await client.get("/status/missing")
+                assert response.status == 404
+
+                response = await client.get("/changes?since=0")
+                data = await response.json()
+                assert data["cursor"] == 1
+                assert len(data["changes"]) == 1
+
+                response = await client.get("/changes?since=abc")
+                assert response.status == 400
+
+        asyncio.run(run())
+
+    def test_metrics_route(self):
+        """Test that internal metrics are served when provided."""
+        api = StatusAPI(
+            StatusAPIConfig(enabled=True),
+            StatusStore(),
+            metrics=lambda: {"concurrency": {"limit": 7}},
+        )
+
+        async def run():
+            async with TestClient(TestServer(api.app)) as client:
+                response = await client.get("/metrics")
+                assert (await response.json())["concurrency"]["limit"] == 7
+
+        asyncio.run(run())
@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from healthchecker.config.models import EndpointConfig
+from healthchecker.monitoring.endpoint import EndpointChecker, HealthStatus
+from healthchecker.monitoring.transport import (
+    TRANSPORTS,
+    StreamTransport,
+    TransportError,
+)
+
+
+def make_app():
+    async def health(request):
+        return web.json_response(
+            {"status": "ok", "probe": request.headers.get("X-Probe")},
+            headers={"ETag": '"v1"'},
+        )
+
+    async def chunked(request):
+        response = web.StreamResponse()
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        for part in (b'{"status": ', b'"ok"}'):
+            await response.write(part)
+        await response.write_eof()
+        return response
+
+    async def echo(request):
+        return web.Response(text=await request.text())
+
+    async def slow(request):
+        await asyncio.sleep(1)
+        return web.Response(text="late")
+
+    app = web.Application()
+    app.router.add_get("/health", health)
+    app.router.add_get("/chunked", chunked)
+    app.router.add_post("/echo", echo)
+    app.router.add_get("/slow", slow)
+    return app
+
+
+class TestStreamTransport:
+    """Test the lean HTTP/1.1 client."""
+
+    def test_requests_and_keep_alive(self):
+        """Test bodies of each framing, and reuse of the connection."""
+
+        async def run():
+            transport = StreamTransport()
+            async with TestServer(make_app()) as server:
+                try:
+                    url = str(server.make_url("/health"))
+                    responses = [
+                        await transport.get(url, headers={"X-Probe": "1"})
+                        for _ in range(3)
+                    ]
+                    chunked = await transport.get(str(server.make_url("/chunked")))
+                    echo = await transport.post(
+                        str(server.make_url("/echo")), json={"ping": 1}
+                    )
+                    head = await transport.head(url)
+                    return responses, chunked, echo, head, transport.stats()
+                finally:
+                    await transport.close()
+
+        responses, chunked, echo, head, stats = asyncio.run(run())
+
+        assert [r.status for r in responses] == [200, 200, 200]
+        assert asyncio.run(responses[0].text()) == '{"status": "ok", "probe": "1"}'
+        assert responses[0].headers.get("ETag") == '"v1"'
+        assert "Content-Type" in responses[0].headers
+        assert asyncio.run(chunked.text()) == '{"status": "ok"}'
+        assert asyncio.run(echo.text()) == '{"ping": 1}'
+        assert head.status == 200 and head.body == b""
+        assert stats["opened"] == 1
+        assert stats["reused"] == 5
+
+    def test_stale_connection_replaced(self):
+        """Test that a kept-alive connection closed by the server is not an error."""
+        connections = []
+
+        async def handle(reader, writer):
+            connections.append(writer)
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+            await writer.drain()
+            # Close without announcing it, as an idle timeout would
+            writer.close()
+
+        async def run():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            transport = StreamTransport()
+            try:
+                first = await transport.get(f"http://127.0.0.1:{port}/")
+                await asyncio.sleep(0.05)
+                second = await transport.get(f"http://127.0.0.1:{port}/")
+                return first, second
+            finally:
+                await transport.close()
+                server.close()
+                await server.wait_closed()
+
+        first, second = asyncio.run(run())
+        assert first.status == second.status == 200
+        assert len(connections) == 2
+
+    def test_errors(self):
+        """Test that timeouts and connection failures raise the expected errors."""
+
+        async def run():
+            transport = StreamTransport()
+            async with TestServer(make_app()) as server:
+                with pytest.raises(asyncio.TimeoutError):
+                    await transport.get(str(server.make_url("/slow")), timeout=0.1)
+                assert transport.stats()["idle"] == 0
+            with pytest.raises(TransportError):
+                await transport.get("http://127.0.0.1:1/")
+            with pytest.raises(TransportError):
+                await transport.get("ftp://example.com/")
+
+        asyncio.run(run())
+
+
+class TestTransportSelection:
+    """Test checks through either transport."""
+
+    @pytest.mark.parametrize("kind", ["aiohttp", "stream"])
+    def test_endpoint_check(self, kind):
+        """Test that checks behave the same on every transport."""
+
+        async def run():
+            transport = TRANSPORTS[kind]()
+            async with TestServer(make_app()) as server:
+                try:
+                    config = EndpointConfig(
+                        url=str(server.make_url("/health")),
+                        transport=kind,
+                        json_path_checks={"$.status": "ok"},
+                        conditional_requests=True,
+                    )
+                    checker = EndpointChecker(config, transport)
+                    results = [await checker.check() for _ in range(2)]
+                    return checker, results
+                finally:
+                    await transport.close()
+
+        checker, results = asyncio.run(run())
+
+        assert [r.status for r in results] == [HealthStatus.OK] * 2
+        assert checker.validators == ('"v1"', None)